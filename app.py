@@ -1,17 +1,24 @@
 import streamlit as st
 import os
+import re
+import secrets
 import time
-import json
-from PIL import Image
-import pandas as pd
-import plotly.express as px
-import streamlit.components.v1 as components
 from streamlit_option_menu import option_menu
 
 # Import custom modules
 from utils.ai_helper import AIHelper
+from utils.blobstore import BlobStore
+from utils.catalog import ProjectCatalog
+from utils.export import EXPORT_FORMATS, ExportJob
+from utils.layout import layout_engine
+from utils.prefetch import DetailPrefetcher
+from utils.repository import create_repository
+from utils.search import SearchIndex
 from utils.visualization import (create_project_timeline, 
-                              create_skills_graph)
+                              display_skills_graph,
+                              skills_graph_cache,
+                              timeline_figure_cache,
+                              display_mind_map)
 
 # Page configuration
 st.set_page_config(
@@ -29,29 +36,339 @@ def load_css():
 # Initialize AI helper
 @st.cache_resource
 def get_ai_helper():
-    return AIHelper()
+    helper = AIHelper()
+    helper.metrics.register_gauges("render_cache", skills_graph_cache.stats)
+    helper.metrics.register_gauges("layout_cache", layout_engine.stats)
+    helper.metrics.register_gauges("timeline_cache", timeline_figure_cache.stats)
+    return helper
+
+# Generated results shared by every session, deduplicated by content
+@st.cache_resource
+def get_blob_store():
+    store = BlobStore.from_env()
+    get_ai_helper().metrics.register_gauges("blob_store", store.stats)
+    return store
+
+# Load the Explore catalog once and share it between sessions
+@st.cache_resource
+def get_catalog():
+    return ProjectCatalog.from_env()
+
+# Fields of a saved project that search covers
+def saved_project_fields(project):
+    return {
+        "title": project["title"],
+        "tools": project["tools"],
+        "description": f"{project['job_title']} in {project['industry']}",
+        "details": project.get("details") or "",
+    }
+
+# Saved projects store, shared by all sessions
+@st.cache_resource
+def get_repository():
+    return create_repository()
+
+# Search index over a user's saved projects, kept up to date on save and delete
+@st.cache_resource(max_entries=100)
+def get_saved_index(user):
+    index = SearchIndex()
+    for project in get_repository().iter_all(user):
+        index.add(project["title"], saved_project_fields(project))
+    return index
+
+# Emails st.experimental_user reports when no sign-in is configured
+PLACEHOLDER_EMAILS = {"test@example.com", "test@test.com"}
+
+# Anonymous libraries belong to "anon-<token>", with the token kept in the page URL as ?owner=
+ANONYMOUS_PREFIX = "anon-"
+ANONYMOUS_TOKEN_PATTERN = re.compile(r"[A-Za-z0-9_-]{16,64}")
+# Per-session owners from before the token moved to the URL, which nobody can open any more
+LEGACY_ANONYMOUS_PREFIX = "session-"
+DEFAULT_ANONYMOUS_PROJECT_TTL_DAYS = 90
+
+# How often a session records its owner's visit and the app deletes abandoned anonymous libraries
+OWNER_ACTIVITY_INTERVAL = 60 * 60
+
+# Saved projects belong to the signed-in user, or to the anonymous library named in the URL
+def current_user():
+    try:
+        email = st.experimental_user.get("email")
+    except Exception:
+        email = None
+    if email and email not in PLACEHOLDER_EMAILS:
+        return email
+    token = st.query_params.get("owner", "")
+    if not ANONYMOUS_TOKEN_PATTERN.fullmatch(token):
+        # Keep the library this session already has, or start a new one
+        token = st.session_state.get("anonymous_token") or secrets.token_urlsafe(16)
+        st.query_params["owner"] = token
+    st.session_state.anonymous_token = token
+    return f"{ANONYMOUS_PREFIX}{token}"
+
+# Delete anonymous libraries nobody opened for ANONYMOUS_PROJECT_TTL_DAYS; runs at most once an hour
+@st.cache_resource(ttl=OWNER_ACTIVITY_INTERVAL, show_spinner=False)
+def expire_anonymous_projects():
+    ttl_days = float(os.getenv("ANONYMOUS_PROJECT_TTL_DAYS", DEFAULT_ANONYMOUS_PROJECT_TTL_DAYS))
+    before = time.time() - ttl_days * 24 * 60 * 60
+    deleted = 0
+    try:
+        for prefix in (ANONYMOUS_PREFIX, LEGACY_ANONYMOUS_PREFIX):
+            deleted += get_repository().delete_inactive(prefix, before)
+    except Exception as e:
+        print(f"Error deleting inactive anonymous projects: {e}")
+    return deleted
+
+# Page sizes offered on the Saved Projects page
+SAVED_PAGE_SIZES = [10, 25, 50]
+
+# One row of the Saved Projects list, with the full details only when expanded
+def show_saved_project(title, key, caption):
+    expanded = st.session_state.saved_expanded == title
+    col1, col2, col3 = st.columns([6, 1, 1])
+    with col1:
+        st.markdown(f"**{title}**")
+        st.caption(caption)
+    with col2:
+        if st.button("Hide" if expanded else "View", key=f"view_{key}"):
+            st.session_state.saved_expanded = None if expanded else title
+            st.rerun()
+    with col3:
+        if st.button("Delete", key=f"delete_{key}"):
+            repository.delete(user, title)
+            get_saved_index(user).remove(title)
+            if expanded:
+                st.session_state.saved_expanded = None
+            st.rerun()
+    
+    if expanded:
+        project = repository.get(user, title)
+        if project is None:
+            st.session_state.saved_expanded = None
+            return
+        with st.container(border=True):
+            st.markdown(f"### {project['title']}")
+            st.markdown(f"**Job Role:** {project['job_title']}")
+            st.markdown(f"**Industry:** {project['industry']}")
+            st.markdown(f"**Tools:** {project['tools']}")
+            st.markdown(f"**Saved on:** {project['date_saved']}")
+            
+            # Edit project button
+            if st.button("Continue Working", key=f"edit_{key}"):
+                st.session_state.selected_project = project['title']
+                st.session_state.active_tab = "Generate"
+                st.rerun()
+            
+            # Project details
+            st.markdown("### Project Details")
+            st.markdown(project['details'])
+
+# Fragments rerun on their own when a widget inside them changes, instead of the whole page
+fragment = getattr(st, "fragment", None) or st.experimental_fragment
+
+# Grid of generated ideas with their Select buttons
+@fragment
+def idea_grid_panel():
+    st.markdown("## Project Ideas")
+    
+    # Create a grid layout for project cards
+    cols = st.columns(2)
+    for i, idea in enumerate(st.session_state.project_ideas):
+        with cols[i % 2]:
+            # Removed div with project-card class that was causing the styling issue
+            st.markdown(f"### {i+1}. {idea}")
+            if st.session_state.prefetcher.is_ready(idea):
+                st.caption("Details ready")
+            if st.button("Select", key=f"select_{i}"):
+                st.session_state.selected_project = idea
+                # Clear previous project details
+                workspace.clear("project_details", "timeline_data", "skills_data", "mind_map_data")
+                st.session_state.asset_errors = {}
+                # The project tabs below belong to the page, so show them with a full rerun
+                st.rerun()
+    
+    # Clear button for project ideas
+    if st.button("Clear Ideas"):
+        st.session_state.prefetcher.cancel()
+        st.session_state.project_ideas = []
+        st.session_state.selected_project = None
+        workspace.clear("project_details", "timeline_data", "skills_data", "mind_map_data")
+        st.session_state.asset_errors = {}
+        st.rerun()
+
+# Error left by "Generate Everything" for one asset, shown in its tab until it is generated
+def show_asset_error(asset):
+    error = st.session_state.asset_errors.get(asset)
+    if error:
+        st.error(f"Error generating {asset.replace('_', ' ')}: {error}")
+
+# Details tab of the selected project
+@fragment
+def details_panel(job_title, tools, industry):
+    # Display project description
+    project_details = workspace["project_details"]
+    if project_details:
+        st.markdown(f"### {st.session_state.selected_project}")
+        st.markdown(project_details)
+        return
+    
+    show_asset_error("details")
+    # The button sits in a placeholder so it can be removed once clicked
+    button_slot = st.empty()
+    if button_slot.button("Generate Project Details"):
+        button_slot.empty()
+        # Render the markdown as it streams in
+        st.markdown(f"### {st.session_state.selected_project}")
+        workspace["project_details"] = st.write_stream(
+            ai_helper.stream_project_details(
+                st.session_state.selected_project,
+                job_title,
+                tools,
+                industry
+            )
+        )
+        st.session_state.asset_errors.pop("details", None)
+        st.success("Project details generated!")
+
+# Timeline tab of the selected project
+@fragment
+def timeline_panel(job_title, tools, industry):
+    if "timeline_data" not in workspace:
+        show_asset_error("timeline")
+        button_slot = st.empty()
+        if button_slot.button("Generate Timeline"):
+            # Only generate timeline if we have project details
+            if "project_details" in workspace:
+                button_slot.empty()
+                with st.spinner("Generating project timeline..."):
+                    try:
+                        workspace["timeline_data"] = ai_helper.generate_timeline(
+                            project_title=st.session_state.selected_project,
+                            job_title=job_title,
+                            tools=tools,
+                            industry=industry
+                        )
+                        st.session_state.asset_errors.pop("timeline", None)
+                        st.success("Timeline generated!")
+                    except Exception as e:
+                        st.error(f"Error generating timeline: {e}")
+            else:
+                st.error("Please generate project details first.")
+    
+    timeline_data = workspace["timeline_data"]
+    if timeline_data:
+        # Create and display timeline
+        timeline_fig = create_project_timeline(timeline_data)
+        if timeline_fig:
+            st.plotly_chart(timeline_fig, use_container_width=True)
+        else:
+            st.error("Could not create timeline visualization.")
+
+# Skills Graph tab of the selected project
+@fragment
+def skills_panel(job_title, tools, industry):
+    if "skills_data" not in workspace:
+        show_asset_error("skills")
+        button_slot = st.empty()
+        if button_slot.button("Generate Skills Graph"):
+            # Only generate skills graph if we have project details
+            if "project_details" in workspace:
+                button_slot.empty()
+                with st.spinner("Generating skills graph..."):
+                    try:
+                        workspace["skills_data"] = ai_helper.generate_skills_graph(
+                            project_title=st.session_state.selected_project,
+                            job_title=job_title,
+                            tools=tools,
+                            industry=industry
+                        )
+                        st.session_state.asset_errors.pop("skills", None)
+                        st.success("Skills graph generated!")
+                    except Exception as e:
+                        st.error(f"Error generating skills graph: {e}")
+            else:
+                st.error("Please generate project details first.")
+    
+    skills_data = workspace["skills_data"]
+    if skills_data:
+        # Static image for small graphs, interactive WebGL chart for large ones
+        st.radio("View:", ["Auto", "Static", "Interactive"], key="skills_graph_mode", horizontal=True,
+                 help="Auto switches to the interactive chart for large graphs.")
+        if not display_skills_graph(skills_data, st.session_state.skills_graph_mode):
+            st.error("Could not create skills graph visualization.")
+
+# Mind Map tab of the selected project
+@fragment
+def mind_map_panel(job_title, tools, industry):
+    if "mind_map_data" not in workspace:
+        show_asset_error("mind_map")
+        button_slot = st.empty()
+        if button_slot.button("Generate Mind Map"):
+            button_slot.empty()
+            with st.spinner("Generating mind map..."):
+                try:
+                    workspace["mind_map_data"] = ai_helper.generate_mind_map(
+                        project_title=st.session_state.selected_project,
+                        job_title=job_title,
+                        tools=tools,
+                        industry=industry
+                    )
+                    st.session_state.asset_errors.pop("mind_map", None)
+                    st.success("Mind map generated!")
+                except Exception as e:
+                    st.error(f"Error generating mind map: {e}")
+    
+    mind_map_data = workspace["mind_map_data"]
+    if mind_map_data:
+        display_mind_map(mind_map_data)
+
+# Save button of the selected project
+@fragment
+def save_panel(job_title, tools, industry):
+    if st.button("Save Project"):
+        project_info = {
+            "title": st.session_state.selected_project,
+            "job_title": job_title,
+            "tools": tools,
+            "industry": industry,
+            "details": workspace["project_details"],
+            "date_saved": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        
+        # Add to saved projects if not already saved
+        if repository.save(user, project_info):
+            get_saved_index(user).add(project_info["title"], saved_project_fields(project_info))
+            st.success("Project saved!")
+        else:
+            st.info("This project is already saved.")
 
 # Session state initialization
 if 'project_ideas' not in st.session_state:
     st.session_state.project_ideas = []
 if 'selected_project' not in st.session_state:
     st.session_state.selected_project = None
-if 'project_details' not in st.session_state:
-    st.session_state.project_details = None
-if 'timeline_data' not in st.session_state:
-    st.session_state.timeline_data = None
-if 'skills_data' not in st.session_state:
-    st.session_state.skills_data = None
+# Generated results are kept as handles into the shared blob store
+if 'workspace' not in st.session_state:
+    st.session_state.workspace = get_blob_store().workspace()
+if 'asset_errors' not in st.session_state:
+    st.session_state.asset_errors = {}
 if 'active_tab' not in st.session_state:
     st.session_state.active_tab = "Generate"
-if 'saved_projects' not in st.session_state:
-    st.session_state.saved_projects = []
+if 'saved_cursors' not in st.session_state:
+    st.session_state.saved_cursors = [None]
+if 'export_job' not in st.session_state:
+    st.session_state.export_job = None
+if 'saved_expanded' not in st.session_state:
+    st.session_state.saved_expanded = None
 if 'job_title' not in st.session_state:
     st.session_state.job_title = ""
 if 'tools' not in st.session_state:
     st.session_state.tools = ""
 if 'industry' not in st.session_state:
     st.session_state.industry = ""
+if 'skills_graph_mode' not in st.session_state:
+    st.session_state.skills_graph_mode = "Auto"
+if 'prefetch_enabled' not in st.session_state:
+    st.session_state.prefetch_enabled = False
 
 # Try to load custom CSS
 try:
@@ -61,6 +378,29 @@ except:
 
 # Initialize AI Helper
 ai_helper = get_ai_helper()
+repository = get_repository()
+user = current_user()
+
+# Keep this owner's library from expiring, and expire the ones nobody came back to
+if time.time() - st.session_state.get("owner_seen", 0) > OWNER_ACTIVITY_INTERVAL:
+    repository.touch(user)
+    st.session_state.owner_seen = time.time()
+expire_anonymous_projects()
+
+# Per-session prefetcher with its own budget
+if 'prefetcher' not in st.session_state:
+    st.session_state.prefetcher = DetailPrefetcher(ai_helper)
+
+# Release the results of sessions left idle, including this one
+workspace = st.session_state.workspace
+get_blob_store().evict_idle()
+if workspace.touch():
+    st.session_state.prefetcher.cancel()
+    st.toast("This session was idle for a while, so its generated results were cleared.")
+
+# Hidden operator page, opened with ?admin=<ADMIN_TOKEN>; disabled while ADMIN_TOKEN is unset
+admin_token = os.getenv("ADMIN_TOKEN", "")
+show_admin = bool(admin_token) and st.query_params.get("admin") == admin_token
 
 # Create sidebar
 with st.sidebar:
@@ -70,8 +410,8 @@ with st.sidebar:
     # Sidebar navigation
     selected = option_menu(
         "Main Menu", 
-        ["Home", "Generate", "Explore", "Saved Projects", "About"], 
-        icons=['house', 'magic', 'search', 'bookmark', 'info-circle'], 
+        ["Home", "Generate", "Explore", "Saved Projects", "About"] + (["Metrics"] if show_admin else []), 
+        icons=['house', 'magic', 'search', 'bookmark', 'info-circle'] + (['speedometer2'] if show_admin else []), 
         menu_icon="cast", 
         default_index=0
     )
@@ -197,240 +537,168 @@ elif selected == "Generate":
         st.warning("Please fill in your job title, tools, and industry to generate project ideas.")
     else:
         # Button to generate project ideas
-        if st.button("Generate Project Ideas"):
-            with st.spinner("Generating project ideas..."):
-                try:
-                    # Generate project ideas
-                    st.session_state.project_ideas = ai_helper.generate_project_ideas(
-                        job_title, tools, industry
-                    )
-                    st.success(f"Generated {len(st.session_state.project_ideas)} project ideas!")
-                except Exception as e:
-                    st.error(f"Error generating project ideas: {e}")
+        st.checkbox(
+            "Prefetch details for the top ideas",
+            key="prefetch_enabled",
+            help="Start generating details for the first few ideas in the background."
+        )
         
-        # Display project ideas
-        if st.session_state.project_ideas:
+        if st.button("Generate Project Ideas"):
+            # Drop prefetches queued for the previous ideas
+            st.session_state.prefetcher.cancel()
             st.markdown("## Project Ideas")
-            
-            # Create a grid layout for project cards
             cols = st.columns(2)
-            for i, idea in enumerate(st.session_state.project_ideas):
-                with cols[i % 2]:
-                    # Removed div with project-card class that was causing the styling issue
-                    st.markdown(f"### {i+1}. {idea}")
-                    if st.button("Select", key=f"select_{i}"):
-                        st.session_state.selected_project = idea
-                        # Clear previous project details
-                        st.session_state.project_details = None
-                        st.session_state.timeline_data = None
-                        st.session_state.skills_data = None
-                
-            # Clear button for project ideas
-            if st.button("Clear Ideas"):
-                st.session_state.project_ideas = []
-                st.session_state.selected_project = None
-                st.session_state.project_details = None
-                st.session_state.timeline_data = None
-                st.session_state.skills_data = None
+            ideas = []
+            try:
+                # Stream project ideas and add a card as each one arrives
+                for idea in ai_helper.stream_project_ideas(job_title, tools, industry):
+                    with cols[len(ideas) % 2]:
+                        st.markdown(f"### {len(ideas) + 1}. {idea}")
+                    ideas.append(idea)
+                st.session_state.project_ideas = ideas
+                if st.session_state.prefetch_enabled:
+                    st.session_state.prefetcher.start(ideas, job_title, tools, industry)
+                st.toast(f"Generated {len(ideas)} project ideas!")
+                # Rerun to show the full idea grid with its buttons
                 st.rerun()
+            except Exception as e:
+                st.error(f"Error generating project ideas: {e}")
+        
+        # Display project ideas
+        if st.session_state.project_ideas:
+            idea_grid_panel()
         
         # If a project is selected, provide detailed explanation
         if st.session_state.selected_project:
             st.markdown("---")
             st.markdown(f"## Selected Project: {st.session_state.selected_project}")
             
+            # Button to generate every tab at once
+            generate_col, bundle_col = st.columns([1, 3])
+            with generate_col:
+                generate_all = st.button("Generate Everything")
+            with bundle_col:
+                use_bundle = st.checkbox(
+                    "Use a single combined request",
+                    help="Ask for details, timeline, skills and mind map in one round trip."
+                )
+            
             # Create tabs for different visualizations
             project_tabs = st.tabs([
                 "1. Details", 
                 "2. Timeline", 
-                "3. Skills Graph"
+                "3. Skills Graph",
+                "4. Mind Map"
             ])
             
-            # Details tab
-            with project_tabs[0]:
-                # Display project description
-                if st.session_state.project_details:
-                    st.markdown(f"### {st.session_state.selected_project}")
-                    st.markdown(st.session_state.project_details)
-                else:
-                    if st.button("Generate Project Details"):
-                        with st.spinner("Generating project details..."):
-                            st.session_state.project_details = ai_helper.generate_project_details(
-                                st.session_state.selected_project,
-                                job_title,
-                                tools,
-                                industry
-                            )
-                            st.success("Project details generated!")
-                            st.rerun()
+            # Placeholders that show each result as soon as it arrives
+            asset_slots = {}
+            for asset, tab in zip(("details", "timeline", "skills", "mind_map"), project_tabs):
+                with tab:
+                    asset_slots[asset] = st.empty()
             
-            # Timeline tab
-            with project_tabs[1]:
-                if st.session_state.timeline_data is None:
-                    if st.button("Generate Timeline"):
-                        # Only generate timeline if we have project details
-                        if st.session_state.project_details:
-                            with st.spinner("Generating project timeline..."):
-                                try:
-                                    st.session_state.timeline_data = ai_helper.generate_timeline(
-                                        project_title=st.session_state.selected_project,
-                                        job_title=job_title,
-                                        tools=tools,
-                                        industry=industry
-                                    )
-                                    st.success("Timeline generated!")
-                                except Exception as e:
-                                    st.error(f"Error generating timeline: {e}")
-                        else:
-                            st.error("Please generate project details first.")
+            if generate_all:
+                asset_state = {
+                    "details": "project_details",
+                    "timeline": "timeline_data",
+                    "skills": "skills_data",
+                    "mind_map": "mind_map_data",
+                }
+                if use_bundle:
+                    # One request that returns every asset together
+                    with st.spinner("Generating project bundle..."):
+                        try:
+                            bundle = ai_helper.generate_project_bundle(
+                                st.session_state.selected_project, job_title, tools, industry
+                            )
+                            asset_results = [(asset, result, None) for asset, result in bundle.items()]
+                        except Exception as e:
+                            asset_results = [(asset, None, e) for asset in asset_slots]
+                else:
+                    # Fire all requests at once and render them in completion order
+                    asset_results = ai_helper.iter_project_assets(
+                        st.session_state.selected_project, job_title, tools, industry
+                    )
                 
-                if st.session_state.timeline_data:
-                    # Create and display timeline
-                    timeline_fig = create_project_timeline(st.session_state.timeline_data)
-                    if timeline_fig:
-                        st.plotly_chart(timeline_fig, use_container_width=True)
+                # Errors are kept so the tabs can still show them after the rerun below
+                st.session_state.asset_errors = {}
+                for asset, result, error in asset_results:
+                    slot = asset_slots[asset]
+                    if error is not None:
+                        st.session_state.asset_errors[asset] = str(error)
+                        slot.error(f"Error generating {asset.replace('_', ' ')}: {error}")
+                        continue
+                    
+                    workspace[asset_state[asset]] = result
+                    if asset == "details":
+                        slot.markdown(result)
+                    elif asset == "timeline":
+                        slot.plotly_chart(create_project_timeline(result), use_container_width=True)
+                    elif asset == "skills":
+                        with slot.container():
+                            display_skills_graph(result, st.session_state.skills_graph_mode)
                     else:
-                        st.error("Could not create timeline visualization.")
+                        with slot.container():
+                            display_mind_map(result)
+                st.rerun()
             
-            # Skills Graph tab
+            # Each tab is a fragment, so its buttons rerun only that tab
+            with project_tabs[0]:
+                details_panel(job_title, tools, industry)
+            with project_tabs[1]:
+                timeline_panel(job_title, tools, industry)
             with project_tabs[2]:
-                if st.session_state.skills_data is None:
-                    if st.button("Generate Skills Graph"):
-                        # Only generate skills graph if we have project details
-                        if st.session_state.project_details:
-                            with st.spinner("Generating skills graph..."):
-                                try:
-                                    st.session_state.skills_data = ai_helper.generate_skills_graph(
-                                        project_title=st.session_state.selected_project,
-                                        job_title=job_title,
-                                        tools=tools,
-                                        industry=industry
-                                    )
-                                    st.success("Skills graph generated!")
-                                except Exception as e:
-                                    st.error(f"Error generating skills graph: {e}")
-                        else:
-                            st.error("Please generate project details first.")
-                
-                if st.session_state.skills_data:
-                    # Create and display skills graph
-                    skills_fig = create_skills_graph(st.session_state.skills_data)
-                    if skills_fig:
-                        st.pyplot(skills_fig)
-                    else:
-                        st.error("Could not create skills graph visualization.")
+                skills_panel(job_title, tools, industry)
+            with project_tabs[3]:
+                mind_map_panel(job_title, tools, industry)
             
-            # Save project button
-            if st.button("Save Project"):
-                project_info = {
-                    "title": st.session_state.selected_project,
-                    "job_title": job_title,
-                    "tools": tools,
-                    "industry": industry,
-                    "details": st.session_state.project_details,
-                    "date_saved": time.strftime("%Y-%m-%d %H:%M:%S"),
-                }
-                
-                # Add to saved projects if not already saved
-                titles = [p.get("title") for p in st.session_state.saved_projects]
-                if st.session_state.selected_project not in titles:
-                    st.session_state.saved_projects.append(project_info)
-                    st.success("Project saved!")
-                else:
-                    st.info("This project is already saved.")
+            save_panel(job_title, tools, industry)
 
 elif selected == "Explore":
     # Header
     st.markdown("<header><h1>Explore Project Ideas</h1><p>Browse through a collection of pre-generated project ideas</p></header>", unsafe_allow_html=True)
     
+    catalog = get_catalog()
+    
     # Filter options
     st.markdown("## Filter Projects")
     col1, col2, col3 = st.columns(3)
     with col1:
-        explore_role = st.selectbox("Role", 
-            ["All Roles", "Data Analyst", "Data Scientist", "Data Engineer", "BI Developer", "ML Engineer"])
+        explore_role = st.selectbox("Role", ["All Roles"] + catalog.options("role"))
     with col2:
-        explore_industry = st.selectbox("Industry", 
-            ["All Industries", "Healthcare", "Finance", "Retail", "Technology", "Manufacturing"])
+        explore_industry = st.selectbox("Industry", ["All Industries"] + catalog.options("industry"))
     with col3:
-        explore_tool = st.selectbox("Primary Tool", 
-            ["All Tools", "Python", "R", "SQL", "Excel", "PowerBI", "Tableau"])
-    
-    # Preset project examples
-    explore_projects = [
-        {
-            "title": "Customer Segmentation Analysis", 
-            "role": "Data Analyst", 
-            "industry": "Retail", 
-            "tools": "Python, Scikit-learn",
-            "description": "Use clustering algorithms to segment customers based on purchasing behavior."
-        },
-        {
-            "title": "Fraud Detection System", 
-            "role": "Data Scientist", 
-            "industry": "Finance", 
-            "tools": "Python, TensorFlow",
-            "description": "Build a machine learning model to detect fraudulent transactions."
-        },
-        {
-            "title": "Patient Readmission Prediction", 
-            "role": "Data Scientist", 
-            "industry": "Healthcare", 
-            "tools": "R, SQL",
-            "description": "Predict which patients are likely to be readmitted to hospitals within 30 days."
-        },
-        {
-            "title": "Data Warehouse ETL Pipeline", 
-            "role": "Data Engineer", 
-            "industry": "Technology", 
-            "tools": "Python, SQL, Airflow",
-            "description": "Design and implement an ETL pipeline for a data warehouse."
-        },
-        {
-            "title": "Sales Performance Dashboard", 
-            "role": "BI Developer", 
-            "industry": "Retail", 
-            "tools": "PowerBI, SQL",
-            "description": "Create an interactive dashboard to track sales performance across regions."
-        },
-        {
-            "title": "Predictive Maintenance System", 
-            "role": "ML Engineer", 
-            "industry": "Manufacturing", 
-            "tools": "Python, scikit-learn",
-            "description": "Build a model to predict equipment failures before they occur."
-        },
-        {
-            "title": "HR Analytics Dashboard", 
-            "role": "Data Analyst", 
-            "industry": "Technology", 
-            "tools": "Tableau, Excel",
-            "description": "Analyze employee data to discover patterns in retention and productivity."
-        },
-        {
-            "title": "Credit Scoring Model", 
-            "role": "Data Scientist", 
-            "industry": "Finance", 
-            "tools": "Python, XGBoost",
-            "description": "Develop a machine learning model to assess customer creditworthiness."
-        }
-    ]
+        explore_tools = st.multiselect("Tools", catalog.options("tool"), placeholder="All Tools")
     
-    # Apply filters
-    filtered_projects = explore_projects
-    if explore_role != "All Roles":
-        filtered_projects = [p for p in filtered_projects if p["role"] == explore_role]
-    if explore_industry != "All Industries":
-        filtered_projects = [p for p in filtered_projects if p["industry"] == explore_industry]
-    if explore_tool != "All Tools":
-        filtered_projects = [p for p in filtered_projects if explore_tool.lower() in p["tools"].lower()]
+    explore_query = st.text_input("Search", placeholder="e.g., fraud detection with Python")
+    
+    # Apply filters through the catalog indexes
+    filtered_ids = catalog.filter(
+        role=None if explore_role == "All Roles" else explore_role,
+        industry=None if explore_industry == "All Industries" else explore_industry,
+        tools=explore_tools,
+    )
+    
+    # Rank the filtered projects by relevance to the search
+    snippets = {}
+    if explore_query.strip():
+        results = catalog.search(explore_query, k=100, ids=filtered_ids)
+        filtered_ids = [result.doc_id for result in results]
+        snippets = {result.doc_id: result.snippet for result in results}
+    
+    # Go back to the first page whenever the filters change
+    explore_filters = (explore_role, explore_industry, tuple(explore_tools), explore_query)
+    if st.session_state.get("explore_filters") != explore_filters:
+        st.session_state.explore_filters = explore_filters
+        st.session_state.explore_page = 0
     
     # Display filtered projects
-    if filtered_projects:
-        st.markdown(f"## Found {len(filtered_projects)} Projects")
+    if filtered_ids:
+        page_projects, page_count = catalog.page(filtered_ids, st.session_state.get("explore_page", 0))
+        st.markdown(f"## Found {len(filtered_ids)} Projects")
         
         cols = st.columns(2)
-        for i, project in enumerate(filtered_projects):
+        for i, (project_id, project) in enumerate(page_projects):
             with cols[i % 2]:
                 st.markdown(f'<div class="card">', unsafe_allow_html=True)
                 st.markdown(f"### {project['title']}")
@@ -438,18 +706,34 @@ elif selected == "Explore":
                 st.markdown(f"**Industry:** {project['industry']}")
                 st.markdown(f"**Tools:** {project['tools']}")
                 st.markdown(f"**Description:** {project['description']}")
+                if snippets.get(project_id):
+                    st.caption(snippets[project_id])
                 
                 # Button to use this project as a template
-                if st.button("Use as Template", key=f"use_{i}"):
+                if st.button("Use as Template", key=f"use_{project_id}"):
                     st.session_state.selected_project = project['title']
                     st.session_state.active_tab = "Generate"
-                    # Set sidebar values
-                    job_title = project['role']
-                    industry = project['industry']
-                    tools = project['tools']
+                    # Carry the project's profile over to the Generate page
+                    st.session_state.job_title = project['role']
+                    st.session_state.industry = project['industry']
+                    st.session_state.tools = project['tools']
                     st.rerun()
                 
                 st.markdown('</div>', unsafe_allow_html=True)
+        
+        # Page navigation
+        if page_count > 1:
+            prev_col, page_col, next_col = st.columns([1, 2, 1])
+            with prev_col:
+                if st.button("Previous", disabled=st.session_state.explore_page == 0):
+                    st.session_state.explore_page -= 1
+                    st.rerun()
+            with page_col:
+                st.markdown(f"Page {st.session_state.explore_page + 1} of {page_count}")
+            with next_col:
+                if st.button("Next", disabled=st.session_state.explore_page >= page_count - 1):
+                    st.session_state.explore_page += 1
+                    st.rerun()
     else:
         st.info("No projects match your filter criteria. Try adjusting your filters.")
 
@@ -457,74 +741,88 @@ elif selected == "Saved Projects":
     # Header
     st.markdown("<header><h1>Saved Projects</h1><p>View and manage your saved project ideas</p></header>", unsafe_allow_html=True)
     
-    if not st.session_state.saved_projects:
+    saved_count = repository.count(user)
+    if user.startswith(ANONYMOUS_PREFIX):
+        st.caption("You are not signed in, so your saved projects are tied to this page's link. "
+                   "Bookmark it to come back to them.")
+    if not saved_count:
         st.info("You haven't saved any projects yet. Generate and save projects to see them here.")
     else:
-        # Create tabs for each saved project
-        project_tabs = st.tabs([project["title"] for project in st.session_state.saved_projects])
+        # Projects per page; changing it starts again from the first page
+        page_size = st.selectbox("Projects per page:", SAVED_PAGE_SIZES, key="saved_page_size",
+                                 on_change=lambda: st.session_state.update(saved_cursors=[None]))
         
-        for i, tab in enumerate(project_tabs):
-            with tab:
-                project = st.session_state.saved_projects[i]
-                
-                # Project metadata
-                col1, col2 = st.columns([3, 1])
-                with col1:
-                    st.markdown(f"### {project['title']}")
-                    st.markdown(f"**Job Role:** {project['job_title']}")
-                    st.markdown(f"**Industry:** {project['industry']}")
-                    st.markdown(f"**Tools:** {project['tools']}")
-                    st.markdown(f"**Saved on:** {project['date_saved']}")
-                
-                with col2:
-                    # Delete project button
-                    if st.button("Delete", key=f"delete_{i}"):
-                        st.session_state.saved_projects.pop(i)
-                        st.rerun()
-                    
-                    # Edit project button
-                    if st.button("Continue Working", key=f"edit_{i}"):
-                        st.session_state.selected_project = project['title']
-                        st.session_state.active_tab = "Generate"
-                        st.rerun()
-                
-                # Project details
-                st.markdown("### Project Details")
-                st.markdown(project['details'])
+        # Ranked search over titles, tools and generated details
+        saved_query = st.text_input("Search saved projects:", placeholder="e.g., forecasting, XGBoost")
+        if saved_query.strip():
+            results = get_saved_index(user).search(saved_query, k=page_size)
+            if results:
+                st.markdown(f"### {len(results)} Matching Projects")
+                for result in results:
+                    show_saved_project(result.doc_id, f"search_{result.doc_id}", result.snippet)
+            else:
+                st.info("No saved projects match your search.")
+            st.markdown("---")
+        
+        # Read only the summary records of the current page through the repository cursor
+        saved_page, next_cursor = repository.page(user, st.session_state.saved_cursors[-1], limit=page_size)
+        if not saved_page and len(st.session_state.saved_cursors) > 1:
+            # The last project on this page was deleted, so step back a page
+            st.session_state.saved_cursors.pop()
+            st.rerun()
+        
+        # One row per project; details are loaded only for the expanded one
+        for project in saved_page:
+            show_saved_project(project["title"], f"page_{project['title']}",
+                               f"{project['job_title']} · {project['industry']} · {project['tools']} · saved {project['date_saved']}")
+        
+        # Page navigation
+        page_number = len(st.session_state.saved_cursors)
+        # Deleting projects on earlier pages can leave the cursor past the last full page
+        page_count = max(page_number, -(-saved_count // page_size))
+        prev_col, page_col, next_col = st.columns([1, 2, 1])
+        with prev_col:
+            if st.button("Previous", disabled=page_number == 1):
+                st.session_state.saved_cursors.pop()
+                st.rerun()
+        with page_col:
+            st.markdown(f"Page {page_number} of {page_count} · {saved_count} saved projects")
+        with next_col:
+            if st.button("Next", disabled=next_cursor is None):
+                st.session_state.saved_cursors.append(next_cursor)
+                st.rerun()
         
         # Export functionality
         st.markdown("---")
         st.markdown("### Export Projects")
-        export_format = st.selectbox("Select export format:", ["JSON", "Markdown"])
+        export_format = st.selectbox("Select export format:", list(EXPORT_FORMATS))
         
         if st.button("Export All Projects"):
-            if export_format == "JSON":
-                # Export as JSON
-                json_data = json.dumps(st.session_state.saved_projects, indent=4)
-                st.download_button(
-                    label="Download JSON",
-                    data=json_data,
-                    file_name="data_projects.json",
-                    mime="application/json"
-                )
+            # Replace any earlier export, which also deletes its file
+            if st.session_state.export_job is not None:
+                st.session_state.export_job.cancel()
+            st.session_state.export_job = ExportJob(repository, user, export_format)
+        
+        export_job = st.session_state.export_job
+        if export_job is not None:
+            if not export_job.finished:
+                # The export is written on a background thread; follow its progress here
+                progress_bar = st.progress(0.0, text="Exporting projects...")
+                while not export_job.wait(0.2):
+                    progress_bar.progress(export_job.progress,
+                                          text=f"Exported {export_job.done} of {export_job.total} projects")
+                progress_bar.empty()
+            
+            if export_job.error is not None:
+                st.error(f"Error exporting projects: {export_job.error}")
             else:
-                # Export as Markdown
-                markdown_text = ""
-                for project in st.session_state.saved_projects:
-                    markdown_text += f"# {project['title']}\n\n"
-                    markdown_text += f"**Job Role:** {project['job_title']}\n\n"
-                    markdown_text += f"**Industry:** {project['industry']}\n\n"
-                    markdown_text += f"**Tools:** {project['tools']}\n\n"
-                    markdown_text += f"**Saved on:** {project['date_saved']}\n\n"
-                    markdown_text += f"## Project Details\n\n{project['details']}\n\n"
-                    markdown_text += "---\n\n"
-                
-                st.download_button(
-                    label="Download Markdown",
-                    data=markdown_text,
-                    file_name="data_projects.md",
-                    mime="text/markdown"
-                )
+                with export_job.open() as export_file:
+                    st.download_button(
+                        label=f"Download {export_job.export_format}",
+                        data=export_file,
+                        file_name=export_job.file_name,
+                        mime=export_job.mime
+                    )
 
 elif selected == "About":
     # Header
@@ -585,6 +883,55 @@ elif selected == "About":
             else:
                 st.error("Please enter some feedback before submitting.")
 
+elif selected == "Metrics" and show_admin:
+    # Header
+    st.markdown("<header><h1>Metrics</h1><p>Latency, tokens and cache use of every model call</p></header>", unsafe_allow_html=True)
+    
+    import pandas as pd
+    
+    metrics = ai_helper.metrics
+    snapshot = metrics.snapshot()
+    
+    st.markdown(f"Collecting for {snapshot['uptime_s']:.0f} seconds.")
+    if st.button("Refresh"):
+        st.rerun()
+    
+    # Per-method latency percentiles and counters
+    st.markdown("## Model Calls")
+    if snapshot["calls"]:
+        st.dataframe(pd.DataFrame(snapshot["calls"]).fillna(0), use_container_width=True, hide_index=True)
+    else:
+        st.info("No model calls recorded yet.")
+    
+    # Cache, rate limiter and request coalescing gauges
+    st.markdown("## Components")
+    gauge_cols = st.columns(max(1, len(snapshot["gauges"])))
+    for col, (source, values) in zip(gauge_cols, sorted(snapshot["gauges"].items())):
+        with col:
+            st.markdown(f"### {source.title()}")
+            st.json(values)
+    
+    # Exports
+    st.markdown("## Export")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.download_button(
+            label="Download Prometheus Text",
+            data=metrics.to_prometheus(),
+            file_name="metrics.prom",
+            mime="text/plain"
+        )
+    with col2:
+        st.download_button(
+            label="Download JSON",
+            data=metrics.to_json(),
+            file_name="metrics.json",
+            mime="application/json"
+        )
+    with col3:
+        if st.button("Write Metrics File"):
+            st.success(f"Metrics written to {metrics.dump()}")
+
 # Check if the session state active tab needs to override the selected sidebar menu
 if st.session_state.active_tab != selected:
     st.session_state.active_tab = selected
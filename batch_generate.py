@@ -0,0 +1,205 @@
+"""
+Batch generation of project ideas and details from a file of job profiles.
+
+Reads profiles (job_title, tools, industry) from a CSV or JSONL file, runs the
+generations through a bounded worker pool and appends every finished result to
+a JSONL file. Re-running with the same output file resumes where it stopped.
+
+Example:
+    python batch_generate.py profiles.csv -o catalog.jsonl --workers 8 --details 3
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from utils.ai_helper import AIHelper
+from utils.profile import canonicalize_profile
+
+PROFILE_FIELDS = ("job_title", "tools", "industry")
+
+
+def read_profiles(path):
+    """Read job profiles from a CSV or JSONL file."""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if path.lower().endswith((".jsonl", ".ndjson")):
+            rows = [json.loads(line) for line in f if line.strip()]
+        else:
+            rows = list(csv.DictReader(f))
+
+    profiles = []
+    for line_number, row in enumerate(rows, start=1):
+        missing = [field for field in PROFILE_FIELDS if not str(row.get(field) or "").strip()]
+        if missing:
+            raise ValueError(f"Profile {line_number} in {path} is missing {', '.join(missing)}")
+        profiles.append({field: str(row[field]).strip() for field in PROFILE_FIELDS})
+    return profiles
+
+
+def profile_key(profile):
+    """Return a stable key identifying a profile in the checkpoint."""
+    return canonicalize_profile(*(profile[field] for field in PROFILE_FIELDS)).key
+
+
+def load_checkpoint(path):
+    """Read finished results from an earlier run of the output file.
+
+    Returns the ideas generated per profile and the set of (profile, title)
+    pairs whose details are already written.
+    """
+    ideas = {}
+    details = set()
+    if not os.path.exists(path):
+        return ideas, details
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A run killed mid-write can leave a partial last line
+                continue
+            key = profile_key(record)
+            if record.get("type") == "ideas":
+                ideas[key] = record["ideas"]
+            elif record.get("type") == "details":
+                details.add((key, record["title"]))
+    return ideas, details
+
+
+class Progress:
+    """Periodic progress and throughput report on stderr."""
+
+    def __init__(self, interval=5.0):
+        """Start the clock."""
+        self.interval = interval
+        self.started = time.monotonic()
+        self.last_report = 0.0
+        self.done = 0
+        self.failed = 0
+        self.pending = 0
+
+    def report(self, force=False):
+        """Print a progress line if the interval has passed (or when forced)."""
+        now = time.monotonic()
+        if not force and now - self.last_report < self.interval:
+            return
+        self.last_report = now
+        elapsed = now - self.started
+        rate = self.done / elapsed if elapsed else 0.0
+        eta = self.pending / rate if rate else float("inf")
+        print(
+            f"[{elapsed:7.1f}s] done {self.done}, failed {self.failed}, pending {self.pending}, "
+            f"{rate:.2f} results/s, eta {eta:.0f}s",
+            file=sys.stderr,
+        )
+
+
+def run(ai_helper, profiles, output_path, workers=4, count=10, details=0):
+    """Generate ideas (and details for the top ideas) for every profile.
+
+    Results are appended to output_path as soon as they finish; work already
+    present in the file is skipped. Returns the Progress of the run.
+    """
+    done_ideas, done_details = load_checkpoint(output_path)
+    progress = Progress()
+    queued = deque()
+
+    def queue_details(profile, ideas):
+        key = profile_key(profile)
+        for title in ideas[:details]:
+            if (key, title) not in done_details:
+                queued.append(("details", profile, title))
+
+    # Build the initial work list, reusing ideas from the checkpoint
+    seen = set()
+    for profile in profiles:
+        key = profile_key(profile)
+        if key in seen:
+            continue
+        seen.add(key)
+        if key in done_ideas:
+            queue_details(profile, done_ideas[key])
+        else:
+            queued.append(("ideas", profile, None))
+
+    def work(task):
+        kind, profile, title = task
+        if kind == "ideas":
+            return ai_helper.generate_project_ideas(
+                profile["job_title"], profile["tools"], profile["industry"], count=count
+            )
+        return ai_helper.generate_project_details(
+            title, profile["job_title"], profile["tools"], profile["industry"]
+        )
+
+    with open(output_path, "a", encoding="utf-8") as out, ThreadPoolExecutor(max_workers=workers) as pool:
+        running = {}
+        while queued or running:
+            # Keep at most two tasks per worker submitted at any time
+            while queued and len(running) < workers * 2:
+                task = queued.popleft()
+                running[pool.submit(work, task)] = task
+            progress.pending = len(queued) + len(running)
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                kind, profile, title = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    progress.failed += 1
+                    print(f"Error generating {kind} for {profile}: {e}", file=sys.stderr)
+                    continue
+
+                record = {"type": kind, **profile}
+                if kind == "ideas":
+                    record["ideas"] = result
+                    queue_details(profile, result)
+                else:
+                    record["title"] = title
+                    record["details"] = result
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+                progress.done += 1
+
+            progress.pending = len(queued) + len(running)
+            progress.report()
+
+    progress.report(force=True)
+    return progress
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Generate project ideas and details for many job profiles.")
+    parser.add_argument("profiles", help="CSV or JSONL file with job_title, tools and industry columns")
+    parser.add_argument("-o", "--output", default="projects.jsonl", help="JSONL file to append results to")
+    parser.add_argument("-w", "--workers", type=int, default=4, help="number of concurrent generations")
+    parser.add_argument("-n", "--count", type=int, default=10, help="project ideas per profile")
+    parser.add_argument("-d", "--details", type=int, default=0, metavar="N",
+                        help="also generate details for the first N ideas of each profile")
+    parser.add_argument("--model", default="gemini-2.0-flash", help="model name")
+    args = parser.parse_args(argv)
+
+    profiles = read_profiles(args.profiles)
+    print(f"Loaded {len(profiles)} profiles from {args.profiles}", file=sys.stderr)
+
+    progress = run(
+        AIHelper(model_name=args.model),
+        profiles,
+        args.output,
+        workers=args.workers,
+        count=args.count,
+        details=args.details,
+    )
+    return 1 if progress.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
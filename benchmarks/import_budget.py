@@ -0,0 +1,112 @@
+"""
+Startup import-time report and budget check.
+
+Imports everything app.py imports at the top level in a fresh interpreter with
+`python -X importtime`, reports the slowest modules and fails when the total
+goes over budget or when a heavy library is loaded before it is needed.
+Modules the interpreter loads on its own are left out, and heavy libraries that
+Streamlit itself imports are not counted against the app.
+
+Examples:
+    python -m benchmarks.import_budget                  # check against the default budget
+    python -m benchmarks.import_budget --budget-ms 600  # tighter budget
+    python -m benchmarks.import_budget --top 30         # show more modules
+"""
+
+import argparse
+import ast
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, "app.py")
+
+# Cumulative import time allowed for app.py's top-level imports
+DEFAULT_BUDGET_MS = 750
+
+# Libraries that must only be imported where they are used
+LAZY_MODULES = (
+    "pandas",
+    "numpy",
+    "matplotlib",
+    "networkx",
+    "scipy",
+    "PIL",
+    "plotly.express",
+    "plotly.graph_objects",
+    "plotly.figure_factory",
+    "google.generativeai",
+)
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def top_level_imports(path):
+    """Return the import statements at the top level of a script."""
+    with open(path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+    return [ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+
+
+def profile_imports(statements):
+    """Run the imports with -X importtime in a fresh interpreter.
+
+    Returns a list of (module, self_us, cumulative_us, depth) tuples.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "\n".join(statements) or "pass"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing failed:\n{result.stderr[-2000:]}")
+
+    modules = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            modules.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return modules
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Check the startup import time of app.py.")
+    parser.add_argument("--budget-ms", type=float,
+                        default=float(os.getenv("IMPORT_BUDGET_MS", DEFAULT_BUDGET_MS)),
+                        help="maximum cumulative import time in milliseconds")
+    parser.add_argument("--top", type=int, default=15, help="number of slowest modules to list")
+    args = parser.parse_args(argv)
+
+    statements = top_level_imports(APP_PATH)
+    startup = {module for module, *_ in profile_imports([])}
+    modules = [entry for entry in profile_imports(statements) if entry[0] not in startup]
+    streamlit_modules = {module for module, *_ in profile_imports(["import streamlit"])}
+
+    # Only modules imported directly by the script count towards the total
+    total_ms = sum(cumulative for _, _, cumulative, depth in modules if depth == 0) / 1000
+    print(f"Top-level imports of app.py: {len(statements)} statements, {len(modules)} modules loaded")
+    print(f"\n{'module':<50} {'self':>10} {'cumulative':>12}")
+    for module, self_us, cumulative_us, depth in sorted(modules, key=lambda m: m[2], reverse=True)[:args.top]:
+        print(f"{'  ' * depth + module:<50} {self_us / 1000:>8.1f}ms {cumulative_us / 1000:>10.1f}ms")
+
+    loaded = {module for module, *_ in modules}
+    eager = [module for module in LAZY_MODULES if module in loaded and module not in streamlit_modules]
+
+    print(f"\nTotal: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    failed = False
+    if total_ms > args.budget_ms:
+        print(f"FAIL: startup imports take {total_ms - args.budget_ms:.1f} ms more than the budget")
+        failed = True
+    if eager:
+        print(f"FAIL: heavy modules imported at startup: {', '.join(eager)}")
+        failed = True
+    if not failed:
+        print("OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
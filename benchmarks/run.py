@@ -0,0 +1,540 @@
+"""
+Offline benchmarks for the AI helper, the visualizations and full page reruns.
+
+Every case runs against the stub model backend, so no API key or network is
+needed. Results are compared with a saved baseline so regressions show up as
+numbers.
+
+Examples:
+    python -m benchmarks.run                    # run everything and compare with the baseline
+    python -m benchmarks.run --quick            # small sizes only
+    python -m benchmarks.run -k skills          # only cases whose name contains "skills"
+    python -m benchmarks.run --save-baseline    # record the results as the new baseline
+"""
+
+import os
+import tempfile
+
+# Configure the environment before the app modules read it
+os.environ["MODEL_BACKEND"] = "stub"
+os.environ["RESPONSE_CACHE_PATH"] = ":memory:"
+os.environ["GEMINI_REQUESTS_PER_MINUTE"] = "1000000000"
+os.environ["GEMINI_TOKENS_PER_MINUTE"] = "1000000000000"
+os.environ["PREFETCH_BUDGET"] = "0"
+os.environ.pop("METRICS_DUMP_PATH", None)
+os.environ.pop("MONGODB_URI", None)
+os.environ["SAVED_PROJECTS_PATH"] = os.path.join(tempfile.mkdtemp(prefix="bench-"), "saved_projects.sqlite3")
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import platform
+import random
+import re
+import statistics
+import sys
+import time
+
+from utils.backends import StubBackend, StubClient
+from utils.structured import STRUCTURED_SPECS, repair_json_text
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE_PATH = os.path.join(ROOT, "benchmarks", "baseline.json")
+APP_PATH = os.path.join(ROOT, "app.py")
+
+SKILL_SIZES = (10, 100, 1000, 5000)
+TIMELINE_SIZES = (5, 50, 200, 1000)
+QUICK_SKILL_SIZES = (10, 100)
+QUICK_TIMELINE_SIZES = (5, 50)
+CATALOG_SIZES = (1000, 100000)
+QUICK_CATALOG_SIZES = (1000,)
+SEARCH_SIZES = (1000, 5000)
+QUICK_SEARCH_SIZES = (1000,)
+EXPORT_SIZE = 5000
+QUICK_EXPORT_SIZE = 500
+SESSION_COUNT = 1000
+QUICK_SESSION_COUNT = 100
+
+# Results slower than baseline * threshold count as regressions
+DEFAULT_THRESHOLD = 1.25
+
+PROFILE = ("Data Scientist", "Python, SQL", "Healthcare")
+PROJECT_TITLE = "Patient Readmission Prediction"
+
+# Anonymous libraries the Saved Projects cases open, as the ?owner= URL token
+BENCHMARK_OWNER_TOKEN = "benchmark-library-{count:06d}"
+
+
+def repeats_for(size):
+    """Run small cases several times and large ones once."""
+    if size <= 100:
+        return 5
+    if size <= 1000:
+        return 3
+    return 1
+
+
+def skills_text(nodes):
+    """Return skills graph JSON with the given number of nodes, as the model writes it."""
+    return StubClient(skill_nodes=nodes).respond('Create a network of skills required for the project: "Bench"')
+
+
+def timeline_text(phases):
+    """Return timeline JSON with the given number of phases, as the model writes it."""
+    return StubClient(timeline_phases=phases).respond('Create a project timeline for the project: "Bench"')
+
+
+def fenced(text):
+    """Wrap JSON in a markdown code fence with surrounding chatter."""
+    return f"Here is the JSON you asked for:\n```json\n{text}\n```\nLet me know if you need changes."
+
+
+def damaged(text):
+    """Add trailing commas and smart quotes that strict JSON parsing rejects."""
+    text = re.sub(r"(\d)}", r"\1,}", text)
+    return text.replace('"Skill 1"', "“Skill 1”", 1)
+
+
+class Case:
+    """One benchmark: a named callable, an optional setup and a repeat count."""
+
+    def __init__(self, name, fn, repeat=5, setup=None):
+        """Store the case; setup() runs once and returns the argument passed to fn."""
+        self.name = name
+        self.fn = fn
+        self.repeat = repeat
+        self.setup = setup
+
+
+def measure(case):
+    """Time a case; return the timings and any error the code printed or raised."""
+    argument = case.setup() if case.setup else None
+    timings = []
+    error = None
+    for _ in range(case.repeat):
+        output = io.StringIO()
+        started = time.perf_counter()
+        try:
+            with contextlib.redirect_stdout(output):
+                case.fn(argument)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        timings.append(time.perf_counter() - started)
+        # The visualization functions report failures by printing them
+        printed = output.getvalue()
+        if error is None and "Error" in printed:
+            error = printed.strip().splitlines()[0]
+    return {
+        "median_s": statistics.median(timings),
+        "min_s": min(timings),
+        "runs": len(timings),
+        "error": error,
+    }
+
+
+def json_cases(sizes):
+    """Cases for JSON cleanup, parsing and validation of model responses."""
+    cases = []
+    spec = STRUCTURED_SPECS["skills"]
+    for size in sizes:
+        text = skills_text(size)
+        variants = {"clean": text, "fenced": fenced(text), "damaged": damaged(text)}
+        for variant, payload in variants.items():
+            cases.append(Case(f"json/repair/{variant}/{size}",
+                              lambda _, payload=payload: repair_json_text(payload), repeats_for(size) * 4))
+        cases.append(Case(f"json/parse_validate/{size}",
+                          lambda _, payload=variants["damaged"]: spec.parse(payload), repeats_for(size) * 4))
+    return cases
+
+
+def ai_helper_cases(skill_sizes, timeline_sizes):
+    """Cases for full structured generations through AIHelper with the cache disabled."""
+    from utils.ai_helper import AIHelper
+
+    def helper(**client_options):
+        return lambda: AIHelper(cache=False, backend=StubBackend("bench", **client_options))
+
+    cases = []
+    for size in skill_sizes:
+        cases.append(Case(f"ai_helper/generate_skills_graph/{size}",
+                          lambda ai: ai.generate_skills_graph(PROJECT_TITLE, *PROFILE),
+                          repeats_for(size), helper(skill_nodes=size)))
+    for size in timeline_sizes:
+        cases.append(Case(f"ai_helper/generate_timeline/{size}",
+                          lambda ai: ai.generate_timeline(PROJECT_TITLE, *PROFILE),
+                          repeats_for(size), helper(timeline_phases=size)))
+    return cases
+
+
+def catalog_entries(count):
+    """Return synthetic Explore catalog entries with realistic role, industry and tool spreads."""
+    rng = random.Random(42)
+    roles = ["Data Analyst", "Data Scientist", "Data Engineer", "BI Developer", "ML Engineer", "Business Analyst"]
+    industries = ["Healthcare", "Finance", "Retail", "Technology", "Manufacturing", "Logistics", "Energy"]
+    tools = ["Python", "SQL", "R", "Excel", "PowerBI", "Tableau", "scikit-learn", "TensorFlow", "Spark", "Airflow"]
+    return [
+        {
+            "title": f"Project {i}",
+            "role": rng.choice(roles),
+            "industry": rng.choice(industries),
+            "tools": ", ".join(rng.sample(tools, rng.randint(1, 4))),
+            "description": f"Curated project idea number {i}.",
+        }
+        for i in range(count)
+    ]
+
+
+def catalog_cases(sizes):
+    """Cases for building, filtering and paging the Explore catalog."""
+    from utils.catalog import ProjectCatalog
+
+    cases = []
+    for size in sizes:
+        entries = catalog_entries(size)
+        build = lambda entries=entries: ProjectCatalog(entries)
+        cases.append(Case(f"catalog/build/{size}", lambda _, build=build: build(), 1 if size > 10000 else 3))
+        cases.append(Case(f"catalog/filter/role/{size}",
+                          lambda catalog: catalog.filter(role="Data Scientist"), 20, build))
+        cases.append(Case(f"catalog/filter/role_industry_tools/{size}",
+                          lambda catalog: catalog.filter("Data Scientist", "Finance", ["Python", "SQL"]), 20, build))
+        cases.append(Case(f"catalog/filter_and_page/{size}",
+                          lambda catalog: catalog.page(catalog.filter(industry="Retail", tools=["Python"]), 3),
+                          20, build))
+
+        def indexed(build=build):
+            catalog = build()
+            catalog.search("warm up")
+            return catalog
+
+        cases.append(Case(f"catalog/search_index_build/{size}",
+                          lambda _, build=build: build().search("warm up"), 1 if size > 10000 else 3))
+        cases.append(Case(f"catalog/search/{size}",
+                          lambda catalog: catalog.search("curated project python", k=20), 10, indexed))
+        cases.append(Case(f"catalog/search_filtered/{size}",
+                          lambda catalog: catalog.search("curated project", k=20,
+                                                         ids=catalog.filter("Data Scientist", "Finance")),
+                          10, indexed))
+    return cases
+
+
+def search_cases(sizes):
+    """Cases for keeping the saved-projects search index up to date."""
+    from utils.search import SearchIndex
+
+    details = StubClient().respond('Provide a detailed explanation for the project: "Bench"')
+    cases = []
+    for size in sizes:
+        def setup(size=size):
+            index = SearchIndex()
+            for i in range(size):
+                index.add(i, {"title": f"Project {i}", "tools": "Python, SQL", "details": details})
+            return index
+
+        def update(index, size=size):
+            index.remove(size // 2)
+            index.add(size // 2, {"title": "Replacement", "tools": "Python", "details": details})
+
+        cases.append(Case(f"search/update_one/{size}", update, 20, setup))
+        cases.append(Case(f"search/query_details/{size}",
+                          lambda index: index.search("problem statement data requirements", k=10), 10, setup))
+    return cases
+
+
+def export_cases(size):
+    """Cases for exporting a library of saved projects in each format."""
+    from utils.export import EXPORT_FORMATS, ExportJob
+    from utils.repository import SQLiteProjectRepository
+
+    details = StubClient().respond('Provide a detailed explanation for the project: "Bench"')
+    user = f"export-{size}"
+
+    def setup():
+        repository = SQLiteProjectRepository(os.environ["SAVED_PROJECTS_PATH"])
+        repository.save_many(user, (
+            {"title": f"Project {i}", "job_title": PROFILE[0], "tools": PROFILE[1], "industry": PROFILE[2],
+             "details": details, "date_saved": "2025-01-01 00:00:00"}
+            for i in range(size)
+        ))
+        return repository
+
+    def export(repository, export_format):
+        job = ExportJob(repository, user, export_format)
+        job.wait()
+        if job.error is not None:
+            raise RuntimeError(job.error)
+        job.cancel()
+
+    return [Case(f"export/{export_format.lower()}/{size}",
+                 lambda repository, export_format=export_format: export(repository, export_format), 3, setup)
+            for export_format in EXPORT_FORMATS]
+
+
+def blobstore_cases(sessions):
+    """Cases for many sessions storing and reading the same generated results."""
+    from utils.blobstore import BlobStore
+
+    client = StubClient()
+    results = {
+        "project_details": client.respond('Provide a detailed explanation for the project: "Bench"'),
+        "timeline_data": json.loads(timeline_text(50)),
+        "skills_data": json.loads(skills_text(100)),
+    }
+
+    def shared_sessions(_):
+        store = BlobStore()
+        workspaces = [store.workspace() for _ in range(sessions)]
+        for workspace in workspaces:
+            for name, value in results.items():
+                workspace[name] = value
+        for workspace in workspaces:
+            for name in results:
+                workspace[name]
+        if len(store) != len(results):
+            raise RuntimeError(f"Expected {len(results)} shared blobs, found {len(store)}")
+
+    return [Case(f"blobstore/shared_sessions/{sessions}", shared_sessions, 3)]
+
+
+def layout_cases(sizes):
+    """Cases for laying out skills graphs from scratch and after adding a few skills."""
+    from utils.layout import LayoutEngine
+
+    cases = []
+    for size in sizes:
+        graph = json.loads(skills_text(size))
+        nodes = [node["id"] for node in graph["nodes"]]
+        edges = [(link["source"], link["target"], link.get("value", 1)) for link in graph["links"]]
+        added = [f"Added skill {i}" for i in range(max(1, size // 20))]
+        extended_nodes = nodes + added
+        extended_edges = edges + [(skill, nodes[i % len(nodes)], 1) for i, skill in enumerate(added)]
+
+        def extend(engine, nodes, edges, seed):
+            warm_starts = engine.warm_starts
+            engine.layout(nodes, edges, seed=seed)
+            if engine.warm_starts == warm_starts:
+                raise RuntimeError("Extended graph was laid out from scratch")
+
+        def warm(nodes=nodes, edges=edges):
+            engine = LayoutEngine()
+            engine.layout(nodes, edges)
+            return engine
+
+        cases.append(Case(f"layout/from_scratch/{size}",
+                          lambda _, nodes=nodes, edges=edges: LayoutEngine().layout(nodes, edges), repeats_for(size)))
+        # A new seed per run misses the cache, so every run is a real warm start
+        seeds = itertools.count(1)
+        cases.append(Case(f"layout/extended/{size}",
+                          lambda engine, nodes=extended_nodes, edges=extended_edges, seeds=seeds:
+                          extend(engine, nodes, edges, next(seeds)),
+                          repeats_for(size), warm))
+    return cases
+
+
+def visualization_cases(skill_sizes, timeline_sizes):
+    """Cases for the skills graphs and the project timeline."""
+    from utils import visualization
+    from utils.layout import layout_engine
+
+    cases = []
+    for size in skill_sizes:
+        text = skills_text(size)
+
+        def render(_, text=text):
+            visualization.skills_graph_cache.clear()
+            layout_engine.clear()
+            visualization.render_skills_graph(text)
+
+        def interactive(_, text=text):
+            layout_engine.clear()
+            visualization.create_interactive_skills_graph(text).to_json()
+
+        cases.append(Case(f"visualization/render_skills_graph/{size}", render, repeats_for(size)))
+        cases.append(Case(f"visualization/render_skills_graph_cached/{size}",
+                          lambda _, text=text: visualization.render_skills_graph(text), 20))
+        cases.append(Case(f"visualization/create_interactive_skills_graph/{size}", interactive, repeats_for(size)))
+        cases.append(Case(f"visualization/create_interactive_skills_graph_cached_layout/{size}",
+                          lambda _, text=text: visualization.create_interactive_skills_graph(text).to_json(),
+                          repeats_for(size), lambda text=text: visualization.create_interactive_skills_graph(text)))
+    for size in timeline_sizes:
+        text = timeline_text(size)
+
+        def timeline(_, text=text):
+            visualization.timeline_figure_cache.clear()
+            visualization.create_project_timeline(text).to_json()
+
+        cases.append(Case(f"visualization/create_project_timeline/{size}", timeline, repeats_for(size)))
+        cases.append(Case(f"visualization/create_project_timeline_cached/{size}",
+                          lambda _, text=text: visualization.create_project_timeline(text).to_json(), 20,
+                          lambda text=text: visualization.create_project_timeline(text)))
+    return cases
+
+
+def app_cases():
+    """Cases for full app.py script runs through Streamlit's AppTest."""
+    import streamlit_option_menu
+    from streamlit.testing.v1 import AppTest
+
+    from utils.ai_helper import AIHelper
+    from utils.repository import SQLiteProjectRepository
+
+    page = {"name": "Home"}
+    # The sidebar menu is a custom component that AppTest cannot click
+    streamlit_option_menu.option_menu = lambda *args, **kwargs: page["name"]
+
+    def fresh(name):
+        page["name"] = name
+        at = AppTest.from_file(APP_PATH, default_timeout=120)
+        at.run()
+        return at
+
+    def generate_page():
+        at = fresh("Generate")
+        for widget, value in zip(at.text_input, PROFILE):
+            widget.input(value)
+        at.run()
+        # Fill in a selected project with every asset, as after "Generate Everything"
+        helper = AIHelper()
+        at.session_state.project_ideas = helper.generate_project_ideas(*PROFILE)
+        at.session_state.selected_project = PROJECT_TITLE
+        workspace = at.session_state.workspace
+        workspace["project_details"] = helper.generate_project_details(PROJECT_TITLE, *PROFILE)
+        workspace["timeline_data"] = helper.generate_timeline(PROJECT_TITLE, *PROFILE)
+        workspace["skills_data"] = helper.generate_skills_graph(PROJECT_TITLE, *PROFILE)
+        workspace["mind_map_data"] = helper.generate_mind_map(PROJECT_TITLE, *PROFILE)
+        at.run()
+        # Fail loudly if the page stops reading the seeded results
+        tab_buttons = {"Generate Project Details", "Generate Timeline", "Generate Skills Graph", "Generate Mind Map"}
+        if any(button.label in tab_buttons for button in at.button):
+            raise RuntimeError("The Generate page did not render the seeded project results")
+        return at
+
+    def saved_page(count=50):
+        def setup():
+            details = AIHelper().generate_project_details(PROJECT_TITLE, *PROFILE)
+            repository = SQLiteProjectRepository(os.environ["SAVED_PROJECTS_PATH"])
+            # Nobody is signed in under AppTest, so projects belong to the anonymous library in the URL
+            page["name"] = "Saved Projects"
+            at = AppTest.from_file(APP_PATH, default_timeout=120)
+            token = BENCHMARK_OWNER_TOKEN.format(count=count)
+            at.query_params["owner"] = token
+            repository.save_many(f"anon-{token}", (
+                {"title": f"{PROJECT_TITLE} {i + 1}", "job_title": PROFILE[0], "tools": PROFILE[1],
+                 "industry": PROFILE[2], "details": details, "date_saved": "2025-01-01 00:00:00"}
+                for i in range(count)
+            ))
+            at.run()
+            return at
+        return setup
+
+    def rerun(at, name):
+        page["name"] = name
+        at.run()
+        if at.exception:
+            raise RuntimeError(at.exception[0].value)
+
+    return [
+        Case("app/first_run/home", lambda _: fresh("Home"), 3),
+        Case("app/rerun/home", lambda at: rerun(at, "Home"), 5, lambda: fresh("Home")),
+        Case("app/rerun/explore", lambda at: rerun(at, "Explore"), 5, lambda: fresh("Explore")),
+        Case("app/rerun/generate_selected", lambda at: rerun(at, "Generate"), 5, generate_page),
+        Case("app/rerun/saved_projects_50", lambda at: rerun(at, "Saved Projects"), 3, saved_page()),
+        Case("app/rerun/saved_projects_500", lambda at: rerun(at, "Saved Projects"), 3, saved_page(500)),
+    ]
+
+
+def build_cases(quick=False):
+    """Collect every benchmark case."""
+    skill_sizes = QUICK_SKILL_SIZES if quick else SKILL_SIZES
+    timeline_sizes = QUICK_TIMELINE_SIZES if quick else TIMELINE_SIZES
+    catalog_sizes = QUICK_CATALOG_SIZES if quick else CATALOG_SIZES
+    return (
+        json_cases(skill_sizes)
+        + ai_helper_cases(skill_sizes, timeline_sizes)
+        + catalog_cases(catalog_sizes)
+        + search_cases(QUICK_SEARCH_SIZES if quick else SEARCH_SIZES)
+        + export_cases(QUICK_EXPORT_SIZE if quick else EXPORT_SIZE)
+        + blobstore_cases(QUICK_SESSION_COUNT if quick else SESSION_COUNT)
+        + layout_cases(skill_sizes)
+        + visualization_cases(skill_sizes, timeline_sizes)
+        + app_cases()
+    )
+
+
+def load_baseline(path):
+    """Read saved results, or an empty dict if there is no baseline yet."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f).get("results", {})
+
+
+def save_baseline(path, results, existing):
+    """Write results as the baseline, keeping cases that were not run this time."""
+    merged = {**existing, **results}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "saved_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "results": dict(sorted(merged.items())),
+        }, f, indent=2)
+        f.write("\n")
+
+
+def compare(name, result, baseline, threshold):
+    """Format one result line against its baseline; return (line, regressed)."""
+    line = f"{name:<58} {result['median_s'] * 1000:>11.2f} ms"
+    regressed = False
+    previous = baseline.get(name)
+    if previous and previous["min_s"] > 0:
+        # The fastest run is the least affected by noise from other processes
+        ratio = result["min_s"] / previous["min_s"]
+        regressed = ratio > threshold
+        line += f"  {previous['median_s'] * 1000:>11.2f} ms  {ratio:5.2f}x"
+        if regressed:
+            line += "  REGRESSION"
+    if result["error"]:
+        line += f"  [{result['error'][:60]}]"
+    return line, regressed
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Run the offline benchmarks.")
+    parser.add_argument("-k", "--filter", default="", help="only run cases whose name contains this text")
+    parser.add_argument("--quick", action="store_true", help="skip the large graph and timeline sizes")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH, help="baseline results file")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="slowdown ratio that counts as a regression")
+    parser.add_argument("--output", help="also write this run's results to a JSON file")
+    args = parser.parse_args(argv)
+
+    baseline = load_baseline(args.baseline)
+    cases = [case for case in build_cases(args.quick) if args.filter in case.name]
+
+    print(f"{'case':<58} {'median':>14}  {'baseline':>14}  ratio (of fastest runs)")
+    results = {}
+    regressions = 0
+    for case in cases:
+        results[case.name] = measure(case)
+        line, regressed = compare(case.name, results[case.name], baseline, args.threshold)
+        regressions += regressed
+        print(line, flush=True)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        save_baseline(args.baseline, results, baseline)
+        print(f"Saved baseline for {len(results)} cases to {args.baseline}")
+
+    print(f"{len(results)} cases, {regressions} regressions", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
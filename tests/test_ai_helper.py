@@ -0,0 +1,62 @@
+import threading
+import time
+
+from utils.ai_helper import AIHelper
+from utils.backends import StubBackend
+from utils.cache import ResponseCache
+from utils.singleflight import Abandoned, SingleFlight
+
+PROFILE = ("Data Scientist", "Python, SQL", "Healthcare")
+TITLE = "Patient Readmission Prediction"
+
+
+def close_with_joiner(ai):
+    """Start streaming details, let a second caller join, then stop reading; return what the joiner got."""
+    stream = ai.stream_project_details(TITLE, *PROFILE)
+    next(stream)
+
+    result = {}
+
+    def join():
+        try:
+            result["text"] = "".join(ai.stream_project_details(TITLE, *PROFILE))
+        except RuntimeError as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=join)
+    thread.start()
+    deadline = time.monotonic() + 5
+    while ai._inflight.stats()["shared"] == 0 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    stream.close()
+    thread.join(5)
+    return result
+
+
+def test_stream_closed_after_cache_replay_publishes_to_joiners():
+    ai = AIHelper(cache=ResponseCache(":memory:"), backend=StubBackend("test"))
+    expected = ai.generate_project_details(TITLE, *PROFILE)
+
+    assert close_with_joiner(ai) == {"text": expected}
+
+
+def test_stream_closed_partway_lets_joiners_generate():
+    ai = AIHelper(cache=False, backend=StubBackend("test"))
+    expected = "".join(ai.stream_project_details(TITLE, *PROFILE))
+
+    assert close_with_joiner(ai) == {"text": expected}
+
+
+def test_abandoned_call_is_retried_by_a_joiner():
+    flight = SingleFlight()
+    future, leader = flight.begin("key")
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(value=flight.do("key", lambda: "fresh")))
+    thread.start()
+    deadline = time.monotonic() + 5
+    while flight.stats()["shared"] == 0 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    flight.finish("key", future, error=Abandoned("gave up"))
+    thread.join(5)
+
+    assert result == {"value": "fresh"}
@@ -0,0 +1,27 @@
+from utils import ai_helper
+from utils.ai_helper import AIHelper
+from utils.backends import StubBackend
+from utils.cache import ResponseCache, make_cache_key
+
+PROFILE = ("Data Scientist", "Python, SQL", "Healthcare")
+TITLE = "Patient Readmission Prediction"
+
+
+def test_cache_key_depends_on_version():
+    inputs = {"profile": "data-scientist", "project_title": TITLE}
+    assert make_cache_key("generate_timeline", "stub", inputs, 1) == make_cache_key("generate_timeline", "stub", inputs, 1)
+    assert make_cache_key("generate_timeline", "stub", inputs, 1) != make_cache_key("generate_timeline", "stub", inputs, 2)
+
+
+def test_prompt_version_bump_misses_cache(monkeypatch):
+    cache = ResponseCache(":memory:")
+    ai = AIHelper(cache=cache, backend=StubBackend("test"))
+    ai.generate_project_details(TITLE, *PROFILE)
+    ai.generate_project_details(TITLE, *PROFILE)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    versions = dict(ai_helper.PROMPT_VERSIONS)
+    versions["generate_project_details"] += 1
+    monkeypatch.setattr(ai_helper, "PROMPT_VERSIONS", versions)
+    ai.generate_project_details(TITLE, *PROFILE)
+    assert (cache.hits, cache.misses) == (1, 2)
@@ -0,0 +1,16 @@
+from utils.catalog import ProjectCatalog
+
+
+def entry(title, description):
+    return {"title": title, "role": "Data Analyst", "industry": "Retail", "tools": "Python",
+            "description": description}
+
+
+def test_search_uses_index_built_in_background():
+    catalog = ProjectCatalog(entry(f"Project {i}", "Curated idea") for i in range(200))
+    catalog.add(entry("Churn Forecast", "Predict customer churn"))
+    catalog.build_search_index()
+    catalog.add(entry("Basket Analysis", "Find products bought together"))
+
+    assert [result.doc_id for result in catalog.search("churn")] == [200]
+    assert [result.doc_id for result in catalog.search("basket")] == [201]
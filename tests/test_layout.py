@@ -0,0 +1,22 @@
+from utils.layout import LayoutEngine
+
+NODES = [f"Skill {i}" for i in range(20)]
+RING = [(NODES[i], NODES[(i + 1) % 20], 1) for i in range(20)]
+STAR = [(NODES[0], NODES[i], 1) for i in range(1, 20)]
+
+
+def test_same_nodes_with_different_edges_lay_out_independently():
+    engine = LayoutEngine()
+    engine.layout(NODES, RING)
+    star = engine.layout(NODES, STAR)
+
+    assert engine.warm_starts == 0
+    assert star == LayoutEngine().layout(NODES, STAR)
+
+
+def test_extended_graph_warm_starts():
+    engine = LayoutEngine()
+    engine.layout(NODES, RING)
+    engine.layout(NODES + ["Added skill"], RING + [("Added skill", NODES[0], 1)])
+
+    assert engine.warm_starts == 1
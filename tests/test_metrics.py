@@ -0,0 +1,15 @@
+from utils.metrics import percentile
+
+
+def test_percentile_nearest_rank_on_100_samples():
+    values = list(range(1, 101))
+    assert percentile(values, 0.5) == 50
+    assert percentile(values, 0.95) == 95
+    assert percentile(values, 0.99) == 99
+
+
+def test_percentile_edges():
+    assert percentile([], 0.5) == 0.0
+    assert percentile([7], 0.99) == 7
+    assert percentile([1, 2, 3], 0.0) == 1
+    assert percentile([1, 2, 3], 1.0) == 3
@@ -0,0 +1,34 @@
+import pytest
+
+from utils.repository import SQLiteProjectRepository
+
+
+def project(title):
+    return {"title": title, "job_title": "Data Analyst", "tools": "Python", "industry": "Retail",
+            "details": "Details", "date_saved": "2025-01-01 00:00:00"}
+
+
+@pytest.fixture
+def repository():
+    return SQLiteProjectRepository(":memory:")
+
+
+def test_delete_inactive_removes_only_stale_owners_with_the_prefix(repository):
+    for user in ("anon-active", "anon-stale", "anon-never-seen", "someone@example.com"):
+        repository.save(user, project("Churn Forecast"))
+    repository.touch("anon-active", now=2000)
+    repository.touch("anon-stale", now=500)
+    repository.touch("someone@example.com", now=500)
+
+    assert repository.delete_inactive("anon-", before=1000) == 2
+    assert repository.count("anon-active") == 1
+    assert repository.count("anon-stale") == 0
+    assert repository.count("anon-never-seen") == 0
+    assert repository.count("someone@example.com") == 1
+
+
+def test_delete_inactive_treats_like_wildcards_literally(repository):
+    repository.save("anonXstale", project("Churn Forecast"))
+
+    assert repository.delete_inactive("anon_", before=1000) == 0
+    assert repository.count("anonXstale") == 1
@@ -4,39 +4,354 @@ This module provides functions to interact with the Gemini API.
 """
 
 import os
-import google.generativeai as genai
-from dotenv import load_dotenv
+import json
+import time
+import atexit
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-# Load environment variables
-load_dotenv()
+from utils.backends import create_backend
+from utils.cache import ResponseCache, make_cache_key
+from utils.metrics import MetricsRegistry
+from utils.profile import canonical_title, canonicalize_profile
+from utils.rate_limit import ModelGovernor, estimate_tokens
+from utils.singleflight import Abandoned, SingleFlight
+from utils.structured import (BUNDLE_SCHEMA, JSON_MIME_TYPE, STRUCTURED_SPECS,
+                              StructuredOutputError, repair_json_text)
 
-# Configure the genai library
-genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+# Assets that can be generated together for a selected project
+PROJECT_ASSETS = ("details", "timeline", "skills", "mind_map")
+
+# AIHelper method that generates each project asset
+ASSET_METHODS = {
+    "details": "generate_project_details",
+    "timeline": "generate_timeline",
+    "skills": "generate_skills_graph",
+    "mind_map": "generate_mind_map",
+}
+
+# Prompt and output schema version of each cached method, part of its cache keys.
+# Bump a method's version whenever its prompt or schema changes.
+PROMPT_VERSIONS = {
+    "generate_project_ideas": 1,
+    "generate_project_details": 1,
+    "generate_sample_data": 1,
+    # Schema-constrained JSON output
+    "generate_mind_map": 2,
+    "generate_skills_graph": 2,
+    # Schema-constrained JSON output, then milestones and dependencies
+    "generate_timeline": 3,
+    "generate_project_bundle": 3,
+}
+
+# Name of the AIHelper method a model call is made for, used to label metrics
+_current_method = contextvars.ContextVar("ai_helper_method", default="unknown")
 
 class AIHelper:
     """Class to handle interactions with the AI model."""
     
-    def __init__(self, model_name='gemini-2.0-flash'):
-        """Initialize the AI helper with the specified model."""
-        self.model = genai.GenerativeModel(model_name)
+    def __init__(self, model_name='gemini-2.0-flash', cache=None, max_workers=8, backend=None, prefetch_workers=2,
+                 metrics=None):
+        """Initialize the AI helper with the specified model.
+
+        Pass a ResponseCache to share cached responses, or False to disable caching.
+        The backend defaults to the one named by the MODEL_BACKEND environment variable.
+        Metrics for every model call are recorded in metrics, a MetricsRegistry.
+        """
+        # Load environment variables from .env before any settings are read
+        from dotenv import load_dotenv
+        load_dotenv()
+        
+        self.model_name = model_name
+        self.backend = backend if backend is not None else create_backend(model_name)
+        # Cache keys include the backend so stub answers never mix with real ones
+        self.model_id = self.backend.model_id
+        # Pooled model clients behind the process-wide rate limits
+        self.governor = ModelGovernor.from_env(self.backend.create_client)
+        self.cache = ResponseCache.from_env() if cache is None else cache
+        # Shared worker pool for concurrent generations
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ai-helper")
+        # Separate small pool so speculative work never delays requests users asked for
+        self._prefetch_executor = ThreadPoolExecutor(max_workers=prefetch_workers, thread_name_prefix="ai-prefetch")
+        # Identical requests in flight from any session share one model call
+        self._inflight = SingleFlight()
+        
+        self.metrics = metrics if metrics is not None else MetricsRegistry()
+        self.metrics.register_gauges("governor", self.governor.stats)
+        self.metrics.register_gauges("singleflight", self._inflight.stats)
+        if self.cache:
+            self.metrics.register_gauges("cache", self.cache.stats)
+        if os.getenv("METRICS_DUMP_PATH"):
+            # Leave a final snapshot behind when the process exits
+            atexit.register(self.metrics.dump)
+    
+    def _cache_key(self, method, inputs):
+        """Return the cache key of a request to a method."""
+        return make_cache_key(method, self.model_id, inputs, PROMPT_VERSIONS.get(method, 1))
     
-    def generate_project_ideas(self, job_title, tools, industry, count=10):
-        """Generate project ideas based on the given parameters."""
-        prompt = f"""Generate exactly {count} project titles for a {job_title} using {tools} 
+    def _cache_lookup(self, method, inputs):
+        """Return the cached result for a request, or None."""
+        if not self.cache:
+            return None
+        return self.cache.get(self._cache_key(method, inputs))
+    
+    def _cache_store(self, method, inputs, value):
+        """Store a result for a request in the cache."""
+        if self.cache:
+            self.cache.set(self._cache_key(method, inputs), value, method=method)
+    
+    def _cached(self, method, inputs, produce):
+        """Return a cached result for the request, or produce and cache it.
+
+        Concurrent callers with the same request wait for a single call.
+        """
+        led = []
+        
+        def load():
+            led.append(True)
+            value = self._cache_lookup(method, inputs)
+            if value is not None:
+                self.metrics.record_cache(method, "hit")
+                return value
+            
+            self.metrics.record_cache(method, "miss")
+            token = _current_method.set(method)
+            try:
+                value = produce()
+            finally:
+                _current_method.reset(token)
+            self._cache_store(method, inputs, value)
+            return value
+        
+        try:
+            return self._inflight.do(self._cache_key(method, inputs), load)
+        finally:
+            if not led:
+                # Joined an identical request that was already in flight
+                self.metrics.record_cache(method, "shared")
+    
+    def _cached_stream(self, method, inputs, produce_stream, combine):
+        """Yield a streamed result, sharing it with identical concurrent requests.
+
+        produce_stream yields (chunk, item) pairs: chunks are passed to the
+        caller and items are combined into the value that is cached.
+        """
+        key = self._cache_key(method, inputs)
+        future, leader = self._inflight.begin(key)
+        if not leader:
+            # Another session is already generating this answer
+            self.metrics.record_cache(method, "shared")
+            try:
+                value = future.result()
+            except Abandoned:
+                # Its reader stopped partway, so take over as the leader or join whoever did
+                yield from self._cached_stream(method, inputs, produce_stream, combine)
+                return
+            yield from self._as_chunks(value)
+            return
+        
+        value = None
+        try:
+            value = self._cache_lookup(method, inputs)
+            self.metrics.record_cache(method, "miss" if value is None else "hit")
+            if value is None:
+                items = []
+                for chunk, item in produce_stream():
+                    if item is not None:
+                        items.append(item)
+                    yield chunk
+                value = combine(items)
+                self._cache_store(method, inputs, value)
+            else:
+                yield from self._as_chunks(value)
+        except GeneratorExit:
+            if value is not None:
+                # The whole answer exists (cached or fully generated), so waiting callers still get it
+                self._inflight.finish(key, future, result=value)
+            else:
+                # The caller stopped reading partway; waiting callers retry and one of them generates
+                self._inflight.finish(key, future, error=Abandoned("Streaming request was abandoned"))
+            raise
+        except BaseException as e:
+            self._inflight.finish(key, future, error=e)
+            raise
+        self._inflight.finish(key, future, result=value)
+    
+    @staticmethod
+    def _as_chunks(value):
+        """Turn a finished result back into stream chunks."""
+        return list(value) if isinstance(value, list) else [value]
+    
+    @staticmethod
+    def _request(job_title, tools, industry, project_title=None, **extra):
+        """Canonicalize a request's profile.
+
+        Returns the job title, tools and industry as written in prompts, and
+        the cache inputs keyed on the stable profile key.
+        """
+        profile = canonicalize_profile(job_title, tools, industry)
+        inputs = {"profile": profile.key, **extra}
+        if project_title is not None:
+            inputs["project_title"] = canonical_title(project_title)
+        return profile.prompt_fields(), inputs
+    
+    def _generate(self, prompt, generation_config=None):
+        """Send a prompt to the model under the rate limits and return the response text."""
+        estimated = estimate_tokens(prompt)
+        options = {"generation_config": generation_config} if generation_config else {}
+        retries = []
+        started = time.perf_counter()
+        try:
+            response = self.governor.call(
+                lambda model: model.generate_content(prompt, **options), tokens=estimated, on_retry=retries.append
+            )
+        except Exception as e:
+            self.metrics.record_call(_current_method.get(), self.model_id, time.perf_counter() - started,
+                                     retries=len(retries), error=e)
+            raise
+        self.metrics.record_call(_current_method.get(), self.model_id, time.perf_counter() - started,
+                                 usage=getattr(response, "usage_metadata", None), retries=len(retries))
+        self._settle_usage(estimated, response)
+        return response.text
+    
+    def _stream(self, prompt, method):
+        """Yield the text of each chunk as the model streams its answer."""
+        estimated = estimate_tokens(prompt)
+        chunk = None
+        retries = []
+        started = time.perf_counter()
+        first_chunk = None
+        try:
+            for chunk in self.governor.stream(
+                lambda model: model.generate_content(prompt, stream=True), tokens=estimated, on_retry=retries.append
+            ):
+                if first_chunk is None:
+                    first_chunk = time.perf_counter() - started
+                if chunk.text:
+                    yield chunk.text
+        except Exception as e:
+            self.metrics.record_call(method, self.model_id, time.perf_counter() - started,
+                                     retries=len(retries), error=e, first_chunk_latency=first_chunk)
+            raise
+        # Streams report their usage on the last chunk
+        self.metrics.record_call(method, self.model_id, time.perf_counter() - started,
+                                 usage=getattr(chunk, "usage_metadata", None), retries=len(retries),
+                                 first_chunk_latency=first_chunk)
+        self._settle_usage(estimated, chunk)
+    
+    def _settle_usage(self, estimated, response):
+        """Charge the token quota with the real usage reported by the response."""
+        usage = getattr(response, "usage_metadata", None)
+        actual = getattr(usage, "total_token_count", 0) if usage is not None else 0
+        if actual:
+            self.governor.limiter.settle(estimated, actual)
+    
+    def _generate_structured(self, kind, prompt, context=None):
+        """Request schema-constrained JSON and return it validated, as a JSON string.
+
+        Defects are repaired locally where possible; only fields that stay
+        broken are asked for again.
+        """
+        spec = STRUCTURED_SPECS[kind]
+        data, broken = spec.parse(self._generate(prompt, spec.generation_config()), context)
+        
+        if set(broken) == set(spec.schema["required"]):
+            # Nothing usable came back, so ask once more for the whole answer
+            self.metrics.record_event(_current_method.get(), "reask")
+            data, broken = spec.parse(self._generate(prompt, spec.generation_config()), context)
+        elif broken:
+            # Ask again only for the broken fields and merge them in
+            self.metrics.record_event(_current_method.get(), "repair")
+            fix_text = self._generate(spec.repair_prompt(data, broken), spec.generation_config(broken))
+            try:
+                fix = repair_json_text(fix_text)
+            except ValueError:
+                fix = {}
+            if isinstance(fix, dict):
+                data = {**data, **{field: fix[field] for field in broken if field in fix}}
+            data, broken = spec.validator(data, context)
+        
+        if broken:
+            self.metrics.record_event(_current_method.get(), "invalid")
+            raise StructuredOutputError(kind, broken)
+        return json.dumps(data)
+    
+    @staticmethod
+    def _is_idea_line(line):
+        """Check whether a response line is a project idea rather than a header."""
+        line = line.strip()
+        return bool(line) and not line.lower().startswith(("project", "here", "title"))
+    
+    def _asset_methods(self):
+        """Map each project asset name to the method that generates it."""
+        return {name: getattr(self, method) for name, method in ASSET_METHODS.items()}
+    
+    def submit_project_assets(self, project_title, job_title, tools, industry, assets=PROJECT_ASSETS):
+        """Start generating the given project assets concurrently.
+
+        Returns a dict mapping each asset name to its Future.
+        """
+        methods = self._asset_methods()
+        return {
+            name: self._executor.submit(methods[name], project_title, job_title, tools, industry)
+            for name in assets
+        }
+    
+    def iter_project_assets(self, project_title, job_title, tools, industry, assets=PROJECT_ASSETS):
+        """Yield (asset, result, error) tuples in the order the generations finish."""
+        futures = self.submit_project_assets(project_title, job_title, tools, industry, assets)
+        names = {future: name for name, future in futures.items()}
+        for future in as_completed(names):
+            try:
+                yield names[future], future.result(), None
+            except Exception as e:
+                yield names[future], None, e
+    
+    def prefetch_project_details(self, project_title, job_title, tools, industry):
+        """Generate project details in the background so a later request hits the cache.
+
+        Returns the Future of the generation, which can be cancelled until it starts.
+        """
+        return self._prefetch_executor.submit(
+            self.generate_project_details, project_title, job_title, tools, industry
+        )
+    
+    async def agenerate_project_assets(self, project_title, job_title, tools, industry, assets=PROJECT_ASSETS):
+        """Generate the given project assets concurrently from asyncio code.
+
+        Returns a dict mapping each asset name to its result or raised exception.
+        """
+        loop = asyncio.get_running_loop()
+        methods = self._asset_methods()
+        names = list(assets)
+        
+        async def gather():
+            results = await asyncio.gather(
+                *(loop.run_in_executor(self._executor, methods[name], project_title, job_title, tools, industry)
+                  for name in names),
+                return_exceptions=True
+            )
+            return dict(zip(names, results))
+        
+        # Identical fan-outs awaited at the same time share one set of requests
+        _, inputs = self._request(job_title, tools, industry, project_title, assets=names)
+        key = self._cache_key("agenerate_project_assets", inputs)
+        return await self._inflight.do_async(key, gather)
+    
+    @staticmethod
+    def _project_ideas_prompt(job_title, tools, industry, count):
+        """Build the prompt for generating project ideas."""
+        return f"""Generate exactly {count} project titles for a {job_title} using {tools} 
         with a focus in the {industry} industry. 
         Format the response as a numbered list (1., 2., etc.).
         Make these projects realistic, implementable, and tailored to the job role.
         """
-        response = self.model.generate_content(prompt)
-        # Process the response to extract project ideas
-        project_list = response.text.split("\n")
-        # Clean up the list (remove empty items and headers)
-        clean_list = [item.strip() for item in project_list if item.strip() and not item.strip().lower().startswith(("project", "here", "title"))]
-        return clean_list
     
-    def generate_project_details(self, project_title, job_title, tools, industry):
-        """Generate detailed explanation for a selected project."""
-        prompt = f"""Provide a detailed explanation for the project: "{project_title}"
+    @staticmethod
+    def _project_details_prompt(project_title, job_title, tools, industry):
+        """Build the prompt for generating project details."""
+        return f"""Provide a detailed explanation for the project: "{project_title}"
         This is for a {job_title} using {tools} with a focus in the {industry} industry.
         
         Structure your response with the following sections:
@@ -51,11 +366,64 @@ class AIHelper:
         
         Use markdown formatting for headers and sections.
         """
-        response = self.model.generate_content(prompt)
-        return response.text
+    
+    def generate_project_ideas(self, job_title, tools, industry, count=10):
+        """Generate project ideas based on the given parameters."""
+        (job_title, tools, industry), inputs = self._request(job_title, tools, industry, count=count)
+        prompt = self._project_ideas_prompt(job_title, tools, industry, count)
+        
+        def produce():
+            # Process the response to extract project ideas
+            project_list = self._generate(prompt).split("\n")
+            # Clean up the list (remove empty items and headers)
+            clean_list = [item.strip() for item in project_list if self._is_idea_line(item)]
+            return clean_list
+        
+        return self._cached("generate_project_ideas", inputs, produce)
+    
+    def stream_project_ideas(self, job_title, tools, industry, count=10):
+        """Yield project ideas one at a time as soon as each line is complete."""
+        (job_title, tools, industry), inputs = self._request(job_title, tools, industry, count=count)
+        prompt = self._project_ideas_prompt(job_title, tools, industry, count)
+        
+        def produce_stream():
+            pending = ""
+            for text in self._stream(prompt, "generate_project_ideas"):
+                pending += text
+                # Emit every finished line, keep the partial last line for the next chunk
+                *lines, pending = pending.split("\n")
+                for line in lines:
+                    if self._is_idea_line(line):
+                        yield line.strip(), line.strip()
+            
+            if self._is_idea_line(pending):
+                yield pending.strip(), pending.strip()
+        
+        yield from self._cached_stream("generate_project_ideas", inputs, produce_stream, list)
+    
+    def generate_project_details(self, project_title, job_title, tools, industry):
+        """Generate detailed explanation for a selected project."""
+        (job_title, tools, industry), inputs = self._request(job_title, tools, industry, project_title)
+        prompt = self._project_details_prompt(project_title, job_title, tools, industry)
+        return self._cached("generate_project_details", inputs, lambda: self._generate(prompt))
+    
+    def stream_project_details(self, project_title, job_title, tools, industry):
+        """Yield the project details markdown in chunks as the model produces it."""
+        (job_title, tools, industry), inputs = self._request(job_title, tools, industry, project_title)
+        prompt = self._project_details_prompt(project_title, job_title, tools, industry)
+        
+        def produce_stream():
+            for text in self._stream(prompt, "generate_project_details"):
+                yield text, text
+        
+        yield from self._cached_stream("generate_project_details", inputs, produce_stream, "".join)
     
     def generate_mind_map(self, project_title, job_title, tools, industry):
-        """Generate data for a mind map visualization of the project."""
+        """Generate data for a mind map visualization of the project.
+
+        Raises StructuredOutputError if no valid data could be obtained.
+        """
+        (job_title, tools, industry), inputs = self._request(job_title, tools, industry, project_title)
         prompt = f"""Create a mind map for the project: "{project_title}"
         This is for a {job_title} using {tools} with a focus in the {industry} industry.
         
@@ -80,58 +448,14 @@ class AIHelper:
         Ensure the response is ONLY valid JSON with no additional text before or after.
         Use double quotes for all keys and string values.
         """
-        try:
-            response = self.model.generate_content(prompt)
-            
-            # Clean the response to ensure it's valid JSON
-            text = response.text.strip()
-            # Remove any markdown code block indicators
-            if text.startswith("```json"):
-                text = text.replace("```json", "", 1)
-            if text.startswith("```"):
-                text = text.replace("```", "", 1)
-            if text.endswith("```"):
-                text = text[:-3]
-            
-            text = text.strip()
-            
-            # Validate the JSON by parsing it
-            import json
-            json.loads(text)
-            
-            return text
-        except Exception as e:
-            print(f"Error generating mind map: {e}")
-            # Return a fallback mind map structure
-            fallback = {
-                "center": project_title,
-                "main_branches": [
-                    {
-                        "name": "Project Goals",
-                        "sub_branches": ["Improve accuracy", "Increase efficiency", "Enhance user experience"]
-                    },
-                    {
-                        "name": "Technologies",
-                        "sub_branches": ["Python", "Data Science", "Machine Learning"]
-                    },
-                    {
-                        "name": "Deliverables",
-                        "sub_branches": ["Technical documentation", "Interactive dashboard", "Final report"]
-                    },
-                    {
-                        "name": "Timeline",
-                        "sub_branches": ["Planning phase", "Development phase", "Testing phase", "Deployment"]
-                    },
-                    {
-                        "name": "Resources",
-                        "sub_branches": ["Team members", "Computing resources", "Data sources"]
-                    }
-                ]
-            }
-            return json.dumps(fallback)
+        return self._cached(
+            "generate_mind_map", inputs,
+            lambda: self._generate_structured("mind_map", prompt, {"project_title": project_title})
+        )
     
     def generate_sample_data(self, project_title, job_title, tools, industry):
         """Generate sample data structure for the project."""
+        (job_title, tools, industry), inputs = self._request(job_title, tools, industry, project_title)
         prompt = f"""For the project "{project_title}" in the {industry} industry,
         suggest a realistic data structure that might be used.
         
@@ -140,11 +464,14 @@ class AIHelper:
         
         Focus on data that would be relevant for a {job_title} using {tools}.
         """
-        response = self.model.generate_content(prompt)
-        return response.text
+        return self._cached("generate_sample_data", inputs, lambda: self._generate(prompt))
     
     def generate_timeline(self, project_title, job_title, tools, industry):
-        """Generate data for a project timeline visualization."""
+        """Generate data for a project timeline visualization.
+
+        Raises StructuredOutputError if no valid data could be obtained.
+        """
+        (job_title, tools, industry), inputs = self._request(job_title, tools, industry, project_title)
         prompt = f"""Create a project timeline for the project: "{project_title}"
         This is for a {job_title} using {tools} with a focus in the {industry} industry.
         
@@ -153,70 +480,29 @@ class AIHelper:
             "phases": ["Phase 1", "Phase 2", "Phase 3"],
             "start_dates": ["2025-01-01", "2025-02-01", "2025-03-01"],
             "end_dates": ["2025-01-31", "2025-02-28", "2025-03-31"],
-            "descriptions": ["Description 1", "Description 2", "Description 3"]
+            "descriptions": ["Description 1", "Description 2", "Description 3"],
+            "milestones": [{{"name": "Milestone 1", "date": "2025-02-28"}}],
+            "dependencies": [{{"from": "Phase 1", "to": "Phase 2"}}]
         }}
         
         Include 4-6 realistic project phases with appropriate start and end dates.
+        Milestones and dependencies between phases are optional; dependencies name phases exactly.
         Make sure all dates are in YYYY-MM-DD format and make sense chronologically.
         Ensure the response is ONLY valid JSON with no additional text before or after.
         Each description should be 1-2 sentences explaining the phase activities.
         Use double quotes for all keys and string values.
         """
-        try:
-            response = self.model.generate_content(prompt)
-            
-            # Clean the response to ensure it's valid JSON
-            text = response.text.strip()
-            # Remove any markdown code block indicators
-            if text.startswith("```json"):
-                text = text.replace("```json", "", 1)
-            if text.startswith("```"):
-                text = text.replace("```", "", 1)
-            if text.endswith("```"):
-                text = text[:-3]
-            
-            text = text.strip()
-            
-            # Validate the JSON by parsing it
-            import json
-            json.loads(text)
-            
-            return text
-        except Exception as e:
-            print(f"Error generating timeline: {e}")
-            # Return a fallback timeline structure
-            import datetime
-            
-            start_date = datetime.datetime.now()
-            phases = ["Requirements Gathering", "Data Collection", "Model Development", "Testing", "Deployment"]
-            durations = [15, 30, 45, 15, 15]  # days
-            
-            start_dates = []
-            end_dates = []
-            current_date = start_date
-            
-            for duration in durations:
-                start_dates.append(current_date.strftime("%Y-%m-%d"))
-                current_date = current_date + datetime.timedelta(days=duration)
-                end_dates.append(current_date.strftime("%Y-%m-%d"))
-                current_date = current_date + datetime.timedelta(days=1)  # 1 day gap
-            
-            fallback = {
-                "phases": phases,
-                "start_dates": start_dates,
-                "end_dates": end_dates,
-                "descriptions": [
-                    "Define project requirements and gather necessary resources.",
-                    "Collect and preprocess relevant data from healthcare systems.",
-                    "Develop and train machine learning models on the collected data.",
-                    "Thoroughly test models and validate results against requirements.",
-                    "Deploy the solution to production environment and monitor performance."
-                ]
-            }
-            return json.dumps(fallback)
+        return self._cached(
+            "generate_timeline", inputs,
+            lambda: self._generate_structured("timeline", prompt, {"project_title": project_title})
+        )
     
     def generate_skills_graph(self, project_title, job_title, tools, industry):
-        """Generate data for a skills network visualization."""
+        """Generate data for a skills network visualization.
+
+        Raises StructuredOutputError if no valid data could be obtained.
+        """
+        (job_title, tools, industry), inputs = self._request(job_title, tools, industry, project_title)
         prompt = f"""Create a network of skills required for the project: "{project_title}"
         This is for a {job_title} using {tools} with a focus in the {industry} industry.
         
@@ -240,48 +526,90 @@ class AIHelper:
         Ensure the response is ONLY valid JSON with no additional text before or after.
         Use double quotes for all keys and string values.
         """
-        try:
-            response = self.model.generate_content(prompt)
-            
-            # Clean the response to ensure it's valid JSON
-            text = response.text.strip()
-            # Remove any markdown code block indicators
-            if text.startswith("```json"):
-                text = text.replace("```json", "", 1)
-            if text.startswith("```"):
-                text = text.replace("```", "", 1)
-            if text.endswith("```"):
-                text = text[:-3]
+        return self._cached(
+            "generate_skills_graph", inputs,
+            lambda: self._generate_structured("skills", prompt, {"project_title": project_title})
+        )
+    
+    def generate_project_bundle(self, project_title, job_title, tools, industry):
+        """Generate details, timeline, skills graph and mind map in a single request.
+
+        Returns a dict keyed by asset name holding the same strings the
+        individual generate_* methods return. Parts of the combined answer
+        that are missing or invalid are requested separately.
+        """
+        (job_title, tools, industry), inputs = self._request(job_title, tools, industry, project_title)
+        prompt = f"""For the project: "{project_title}"
+        This is for a {job_title} using {tools} with a focus in the {industry} industry.
+        
+        Return ONE properly formatted JSON object with exactly these keys:
+        {{
+            "details": "Markdown text",
+            "timeline": {{
+                "phases": ["Phase 1", "Phase 2"],
+                "start_dates": ["2025-01-01", "2025-02-01"],
+                "end_dates": ["2025-01-31", "2025-02-28"],
+                "descriptions": ["Description 1", "Description 2"],
+                "milestones": [{{"name": "Milestone 1", "date": "2025-02-28"}}],
+                "dependencies": [{{"from": "Phase 1", "to": "Phase 2"}}]
+            }},
+            "skills": {{
+                "nodes": [{{"id": "Skill 1", "group": 1}}, {{"id": "Skill 2", "group": 2}}],
+                "links": [{{"source": "Skill 1", "target": "Skill 2", "value": 1}}]
+            }},
+            "mind_map": {{
+                "center": "{project_title}",
+                "main_branches": [{{"name": "Branch 1", "sub_branches": ["Sub-branch 1.1", "Sub-branch 1.2"]}}]
+            }}
+        }}
+        
+        "details" is a detailed markdown explanation with these sections: Problem Statement,
+        Project Goals (3-5 bullet points), Data Requirements, Technical Approach,
+        Implementation Guide, Deliverables, Skills Developed and Extensions.
+        "timeline" has 4-6 realistic phases with YYYY-MM-DD dates in chronological order
+        and 1-2 sentence descriptions; milestones and dependencies are optional.
+        "skills" has 8-12 technical and soft skill nodes, with similar skills in the same group.
+        "mind_map" has 4-6 main branches with 2-4 sub-branches each.
+        Ensure the response is ONLY valid JSON with no additional text before or after.
+        Use double quotes for all keys and string values and escape newlines inside strings.
+        """
+        
+        def produce():
+            text = self._generate(prompt, {"response_mime_type": JSON_MIME_TYPE, "response_schema": BUNDLE_SCHEMA})
+            data = repair_json_text(text)
+            if not isinstance(data, dict):
+                raise ValueError("Bundle response is not a JSON object")
             
-            text = text.strip()
+            # Split the combined answer into the formats the individual methods return
+            bundle = {}
+            details = data.get("details")
+            if isinstance(details, str) and details.strip():
+                bundle["details"] = details
+            for asset, spec in STRUCTURED_SPECS.items():
+                if isinstance(data.get(asset), dict):
+                    part, broken = spec.validator(data[asset], {"project_title": project_title})
+                    if not broken:
+                        bundle[asset] = json.dumps(part)
             
-            # Validate the JSON by parsing it
-            import json
-            json.loads(text)
+            # Seed the per-asset cache entries so later single requests are hits too
+            for asset, value in bundle.items():
+                self._cache_store(ASSET_METHODS[asset], inputs, value)
             
-            return text
+            # Ask separately only for the parts the combined answer got wrong
+            missing = [asset for asset in PROJECT_ASSETS if asset not in bundle]
+            if missing:
+                self.metrics.record_event("generate_project_bundle", "partial_fallback")
+                futures = self.submit_project_assets(project_title, job_title, tools, industry, missing)
+                bundle.update({asset: future.result() for asset, future in futures.items()})
+            return bundle
+        
+        try:
+            bundle = self._cached("generate_project_bundle", inputs, produce)
         except Exception as e:
-            print(f"Error generating skills graph: {e}")
-            # Return a fallback simple skills graph structure
-            fallback = {
-                "nodes": [
-                    {"id": "Python", "group": 1},
-                    {"id": "Data Analysis", "group": 1},
-                    {"id": "Machine Learning", "group": 1},
-                    {"id": "Healthcare Domain", "group": 2},
-                    {"id": "Data Visualization", "group": 1},
-                    {"id": "Project Management", "group": 3},
-                    {"id": "Communication", "group": 3},
-                    {"id": "Problem Solving", "group": 3}
-                ],
-                "links": [
-                    {"source": "Python", "target": "Data Analysis", "value": 3},
-                    {"source": "Python", "target": "Machine Learning", "value": 3},
-                    {"source": "Machine Learning", "target": "Healthcare Domain", "value": 2},
-                    {"source": "Data Analysis", "target": "Data Visualization", "value": 2},
-                    {"source": "Data Analysis", "target": "Healthcare Domain", "value": 2},
-                    {"source": "Project Management", "target": "Communication", "value": 1},
-                    {"source": "Problem Solving", "target": "Machine Learning", "value": 1}
-                ]
-            }
-            return json.dumps(fallback)
+            print(f"Error generating project bundle: {e}")
+            self.metrics.record_event("generate_project_bundle", "fallback")
+            # Fall back to one request per asset, still fired concurrently
+            futures = self.submit_project_assets(project_title, job_title, tools, industry)
+            return {name: future.result() for name, future in futures.items()}
+        
+        return bundle
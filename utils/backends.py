@@ -0,0 +1,332 @@
+"""
+Model backends for the AI helper.
+This module provides the Gemini backend, a deterministic offline stub and a record/replay backend.
+
+A backend creates clients that follow the google.generativeai GenerativeModel
+interface: generate_content(prompt, stream=False, **kwargs) returns a response
+with a .text attribute and usage_metadata, or an iterable of such chunks when
+streaming.
+"""
+
+import datetime
+import hashlib
+import json
+import os
+import random
+import re
+import time
+from types import SimpleNamespace
+
+# Default backend settings, overridable through environment variables
+DEFAULT_RECORDINGS_DIR = "recordings"
+DEFAULT_STUB_RESPONSE_CHARS = 3000
+DEFAULT_STUB_CHUNK_CHARS = 80
+
+
+def _usage(prompt_text, response_text):
+    """Build usage metadata shaped like the Gemini SDK's, estimated from text length."""
+    prompt_tokens = len(prompt_text) // 4
+    response_tokens = len(response_text) // 4
+    return SimpleNamespace(
+        prompt_token_count=prompt_tokens,
+        candidates_token_count=response_tokens,
+        total_token_count=prompt_tokens + response_tokens,
+    )
+
+
+class LocalResponse:
+    """Response object with the attributes AIHelper reads from Gemini responses."""
+
+    def __init__(self, text, usage_metadata=None):
+        """Wrap response text and optional usage metadata."""
+        self.text = text
+        self.usage_metadata = usage_metadata
+
+
+class ModelBackend:
+    """Base class for model backends."""
+
+    name = "base"
+
+    def __init__(self, model_name):
+        """Remember the model the backend serves."""
+        self.model_name = model_name
+
+    @property
+    def model_id(self):
+        """Identifier used to keep cached responses from different backends apart."""
+        return f"{self.name}/{self.model_name}"
+
+    def create_client(self):
+        """Create a client with a generate_content method."""
+        raise NotImplementedError
+
+
+class GeminiBackend(ModelBackend):
+    """Backend that calls Google's Gemini API."""
+
+    name = "gemini"
+
+    def __init__(self, model_name, api_key=None):
+        """Configure the Gemini SDK with the API key."""
+        super().__init__(model_name)
+        import google.generativeai as genai
+
+        self._genai = genai
+        genai.configure(api_key=api_key or os.getenv("GOOGLE_API_KEY"))
+
+    @property
+    def model_id(self):
+        """Gemini responses are cached under the plain model name."""
+        return self.model_name
+
+    def create_client(self):
+        """Create a GenerativeModel client."""
+        return self._genai.GenerativeModel(self.model_name)
+
+
+class StubClient:
+    """Deterministic offline stand-in for a GenerativeModel."""
+
+    def __init__(self, latency=0.0, chunk_latency=0.0, response_chars=DEFAULT_STUB_RESPONSE_CHARS,
+                 chunk_chars=DEFAULT_STUB_CHUNK_CHARS, skill_nodes=10, timeline_phases=5):
+        """Configure simulated latency and response sizes."""
+        self.latency = latency
+        self.chunk_latency = chunk_latency
+        self.response_chars = response_chars
+        self.chunk_chars = chunk_chars
+        self.skill_nodes = skill_nodes
+        self.timeline_phases = timeline_phases
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        """Return a deterministic response for the prompt."""
+        time.sleep(self.latency)
+        text = self.respond(prompt)
+        if not stream:
+            return LocalResponse(text, _usage(prompt, text))
+        return self._chunks(prompt, text)
+
+    def _chunks(self, prompt, text):
+        """Yield the response in fixed-size chunks; the last one carries the usage."""
+        pieces = [text[i:i + self.chunk_chars] for i in range(0, len(text), self.chunk_chars)] or [""]
+        for i, piece in enumerate(pieces):
+            time.sleep(self.chunk_latency)
+            usage = _usage(prompt, text) if i == len(pieces) - 1 else None
+            yield LocalResponse(piece, usage)
+
+    def respond(self, prompt):
+        """Build the response text for the kind of request the prompt makes."""
+        rng = random.Random(hashlib.sha256(prompt.encode("utf-8")).hexdigest())
+        match = re.search(r'project:? "(.*?)"', prompt)
+        title = match.group(1) if match else "Sample Project"
+
+        if "Return ONE properly formatted JSON object" in prompt:
+            return json.dumps({
+                "details": self._details(title, rng),
+                "timeline": self._timeline(rng),
+                "skills": self._skills(rng),
+                "mind_map": self._mind_map(title, rng),
+            })
+        if "project titles" in prompt:
+            match = re.search(r"exactly (\d+)", prompt)
+            count = int(match.group(1)) if match else 10
+            return self._ideas(count, rng)
+        if "project timeline" in prompt:
+            return json.dumps(self._timeline(rng))
+        if "network of skills" in prompt:
+            return json.dumps(self._skills(rng))
+        if "mind map" in prompt:
+            return json.dumps(self._mind_map(title, rng))
+        return self._details(title, rng)
+
+    def _words(self, rng, count):
+        """Return a deterministic run of filler words."""
+        vocabulary = ["data", "model", "pipeline", "insight", "metric", "feature", "dashboard",
+                      "stakeholder", "quality", "forecast", "segment", "report", "analysis"]
+        return " ".join(rng.choice(vocabulary) for _ in range(count))
+
+    def _ideas(self, count, rng):
+        """Return a numbered list of project titles."""
+        lines = ["Here are some project ideas:"]
+        for i in range(count):
+            lines.append(f"{i + 1}. {self._words(rng, 3).title()} Project {i + 1}")
+        return "\n".join(lines)
+
+    def _details(self, title, rng):
+        """Return an eight-section markdown explanation of about response_chars characters."""
+        sections = ["Problem Statement", "Project Goals", "Data Requirements", "Technical Approach",
+                    "Implementation Guide", "Deliverables", "Skills Developed", "Extensions"]
+        words_per_section = max(5, self.response_chars // (len(sections) * 8))
+        parts = [f"# {title}\n"]
+        for section in sections:
+            parts.append(f"## {section}\n\n{self._words(rng, words_per_section)}.\n")
+        return "\n".join(parts)
+
+    def _timeline(self, rng):
+        """Return timeline data with consecutive phases."""
+        start = datetime.date(2025, 1, 1)
+        data = {"phases": [], "start_dates": [], "end_dates": [], "descriptions": []}
+        for i in range(self.timeline_phases):
+            end = start + datetime.timedelta(days=rng.randint(7, 30))
+            data["phases"].append(f"Phase {i + 1}: {self._words(rng, 2).title()}")
+            data["start_dates"].append(start.isoformat())
+            data["end_dates"].append(end.isoformat())
+            data["descriptions"].append(f"{self._words(rng, 8).capitalize()}.")
+            start = end + datetime.timedelta(days=1)
+        # A milestone at the end of every third phase, and each phase waits for the one before
+        data["milestones"] = [{"name": f"Milestone {i // 3 + 1}", "date": data["end_dates"][i]}
+                              for i in range(2, self.timeline_phases, 3)]
+        data["dependencies"] = [{"from": data["phases"][i - 1], "to": data["phases"][i]}
+                                for i in range(1, self.timeline_phases)]
+        return data
+
+    def _skills(self, rng):
+        """Return a connected skills graph."""
+        nodes = [{"id": f"Skill {i + 1}", "group": rng.randint(1, 4)} for i in range(self.skill_nodes)]
+        links = []
+        for i in range(1, len(nodes)):
+            links.append({"source": nodes[rng.randrange(i)]["id"], "target": nodes[i]["id"],
+                          "value": rng.randint(1, 3)})
+        return {"nodes": nodes, "links": links}
+
+    def _mind_map(self, title, rng):
+        """Return a mind map with five branches."""
+        return {
+            "center": title,
+            "main_branches": [
+                {"name": self._words(rng, 2).title(),
+                 "sub_branches": [self._words(rng, 3).capitalize() for _ in range(3)]}
+                for _ in range(5)
+            ],
+        }
+
+
+class StubBackend(ModelBackend):
+    """Deterministic offline backend with configurable latency and response sizes."""
+
+    name = "stub"
+
+    def __init__(self, model_name, **client_options):
+        """Store the options passed to every StubClient."""
+        super().__init__(model_name)
+        self.client_options = client_options
+
+    @classmethod
+    def from_env(cls, model_name):
+        """Create a stub backend configured from environment variables."""
+        return cls(
+            model_name,
+            latency=float(os.getenv("STUB_LATENCY", 0.0)),
+            chunk_latency=float(os.getenv("STUB_CHUNK_LATENCY", 0.0)),
+            response_chars=int(os.getenv("STUB_RESPONSE_CHARS", DEFAULT_STUB_RESPONSE_CHARS)),
+        )
+
+    def create_client(self):
+        """Create a StubClient."""
+        return StubClient(**self.client_options)
+
+
+class RecordingClient:
+    """Client that records responses from an inner client, or replays them from files."""
+
+    def __init__(self, backend, inner=None):
+        """Wrap an inner client; without one, every call is replayed."""
+        self.backend = backend
+        self.inner = inner
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        """Record or replay the response for a prompt."""
+        path = self.backend.path_for(prompt, kwargs)
+        if self.inner is None:
+            return self._replay(path, stream)
+
+        response = self.inner.generate_content(prompt, stream=stream, **kwargs)
+        if not stream:
+            self.backend.save(path, prompt, [response.text], response.usage_metadata)
+            return response
+        return self._record_stream(path, prompt, response)
+
+    def _record_stream(self, path, prompt, response):
+        """Pass streamed chunks through and save them once the stream is finished."""
+        chunks = []
+        chunk = None
+        for chunk in response:
+            chunks.append(chunk.text)
+            yield chunk
+        self.backend.save(path, prompt, chunks, getattr(chunk, "usage_metadata", None))
+
+    def _replay(self, path, stream):
+        """Load a recorded response."""
+        if not os.path.exists(path):
+            raise LookupError(f"No recorded response at {path}")
+        with open(path, "r", encoding="utf-8") as f:
+            record = json.load(f)
+
+        usage = SimpleNamespace(**record["usage"]) if record.get("usage") else None
+        if not stream:
+            return LocalResponse("".join(record["chunks"]), usage)
+        last = len(record["chunks"]) - 1
+        return [LocalResponse(text, usage if i == last else None) for i, text in enumerate(record["chunks"])]
+
+
+class RecordReplayBackend(ModelBackend):
+    """Backend that saves real responses to files and can replay them offline."""
+
+    name = "replay"
+
+    def __init__(self, model_name, directory=DEFAULT_RECORDINGS_DIR, inner=None):
+        """Record through the inner backend, or replay only when inner is None."""
+        super().__init__(model_name)
+        self.directory = directory
+        self.inner = inner
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def model_id(self):
+        """Recorded responses are real responses, so they share the inner model's cache entries."""
+        return self.model_name
+
+    def create_client(self):
+        """Create a recording client, or a replay-only client."""
+        inner = self.inner.create_client() if self.inner is not None else None
+        return RecordingClient(self, inner)
+
+    def path_for(self, prompt, options):
+        """Return the recording file for a prompt and its generation options."""
+        payload = json.dumps([self.model_name, prompt, options], sort_keys=True, default=str)
+        digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def save(self, path, prompt, chunks, usage_metadata):
+        """Write a response to its recording file."""
+        usage = None
+        if usage_metadata is not None:
+            usage = {
+                "prompt_token_count": getattr(usage_metadata, "prompt_token_count", 0),
+                "candidates_token_count": getattr(usage_metadata, "candidates_token_count", 0),
+                "total_token_count": getattr(usage_metadata, "total_token_count", 0),
+            }
+        record = {"model": self.model_name, "prompt": prompt, "chunks": chunks, "usage": usage}
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(record, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+
+def create_backend(model_name, kind=None):
+    """Create the backend named by kind or the MODEL_BACKEND environment variable.
+
+    Supported kinds are gemini (default), stub, record and replay.
+    """
+    kind = (kind or os.getenv("MODEL_BACKEND", "gemini")).lower()
+    directory = os.getenv("MODEL_RECORDINGS_DIR", DEFAULT_RECORDINGS_DIR)
+
+    if kind == "gemini":
+        return GeminiBackend(model_name)
+    if kind == "stub":
+        return StubBackend.from_env(model_name)
+    if kind == "record":
+        return RecordReplayBackend(model_name, directory, inner=GeminiBackend(model_name))
+    if kind == "replay":
+        return RecordReplayBackend(model_name, directory)
+    raise ValueError(f"Unknown model backend: {kind}")
@@ -0,0 +1,272 @@
+"""
+Shared store for generated results.
+This module keeps generated text and JSON once per process, addressed by content
+hash and reference counted, so sessions holding the same result share one copy.
+Sessions keep small handles in a workspace, and the least recently used blobs
+spill to disk when the store grows past its memory budget.
+"""
+
+import collections
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+# Default settings, overridable through environment variables
+DEFAULT_BLOB_MEMORY_BYTES = 64 * 1024 * 1024
+DEFAULT_SESSION_IDLE_TIMEOUT = 30 * 60
+
+# Blob payloads start with one byte giving how to decode them
+TEXT_PREFIX = b"s"
+JSON_PREFIX = b"j"
+
+
+def encode_blob(value):
+    """Serialize a string or JSON-compatible value to blob bytes."""
+    if isinstance(value, str):
+        return TEXT_PREFIX + value.encode("utf-8")
+    return JSON_PREFIX + json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def decode_blob(payload):
+    """Turn blob bytes back into the value they were made from."""
+    if payload[:1] == TEXT_PREFIX:
+        return payload[1:].decode("utf-8")
+    return json.loads(payload[1:].decode("utf-8"))
+
+
+class BlobRef:
+    """Handle to one blob; the store drops the blob when its last handle is garbage collected."""
+
+    __slots__ = ("key", "size", "__weakref__")
+
+    def __init__(self, store, key, size):
+        self.key = key
+        self.size = size
+        weakref.finalize(self, store._pending.append, key)
+
+    def __repr__(self):
+        return f"BlobRef({self.key[:12]}, {self.size} bytes)"
+
+
+class BlobStore:
+    """Thread-safe, content-addressed store of immutable blobs with reference counts.
+
+    Blobs live in memory up to max_bytes; beyond that the least recently used
+    ones are written to a private spill directory and read back on demand.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_BLOB_MEMORY_BYTES, spill_dir=None,
+                 idle_timeout=DEFAULT_SESSION_IDLE_TIMEOUT):
+        """Create an empty store; spill files go in a new directory under spill_dir.
+
+        Workspaces unused for idle_timeout seconds are cleared by evict_idle().
+        """
+        self.max_bytes = max_bytes
+        self.idle_timeout = idle_timeout
+        self.memory_bytes = 0
+        self.spilled_bytes = 0
+        self.hits = 0
+        self.spills = 0
+        self.loads = 0
+        self.evicted_sessions = 0
+        self._memory = OrderedDict()
+        self._spilled = {}
+        self._refs = collections.Counter()
+        # Released keys are queued by handle finalizers, which may run on any thread during
+        # garbage collection, and applied under the lock by the next store operation
+        self._pending = collections.deque()
+        self._lock = threading.Lock()
+        self._workspaces = weakref.WeakSet()
+        self._last_sweep = 0.0
+
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+        self.spill_dir = tempfile.mkdtemp(prefix="blobs-", dir=spill_dir or None)
+        weakref.finalize(self, shutil.rmtree, self.spill_dir, ignore_errors=True)
+
+    @classmethod
+    def from_env(cls):
+        """Create a store configured from environment variables."""
+        return cls(
+            max_bytes=int(os.getenv("BLOB_MEMORY_BYTES", DEFAULT_BLOB_MEMORY_BYTES)),
+            spill_dir=os.getenv("BLOB_SPILL_DIR") or None,
+            idle_timeout=float(os.getenv("SESSION_IDLE_TIMEOUT", DEFAULT_SESSION_IDLE_TIMEOUT)),
+        )
+
+    def __len__(self):
+        return len(self._refs)
+
+    def put(self, value):
+        """Store a value and return a new handle to it; identical values share one blob."""
+        payload = encode_blob(value)
+        key = hashlib.sha256(payload).hexdigest()
+        with self._lock:
+            self._release_pending()
+            if self._refs[key] == 0:
+                self._memory[key] = payload
+                self.memory_bytes += len(payload)
+                self._spill()
+            else:
+                self.hits += 1
+            self._refs[key] += 1
+        return BlobRef(self, key, len(payload))
+
+    def get(self, ref):
+        """Return the value a handle points to."""
+        with self._lock:
+            self._release_pending()
+            payload = self._memory.get(ref.key)
+            if payload is not None:
+                self._memory.move_to_end(ref.key)
+            else:
+                payload = self._load(ref.key)
+        return decode_blob(payload)
+
+    def _path(self, key):
+        """Path of the spill file for a key."""
+        return os.path.join(self.spill_dir, key)
+
+    def _spill(self):
+        """Write the least recently used blobs to disk until memory is within budget."""
+        while self.memory_bytes > self.max_bytes and len(self._memory) > 1:
+            key, payload = self._memory.popitem(last=False)
+            self.memory_bytes -= len(payload)
+            try:
+                with open(self._path(key), "wb") as f:
+                    f.write(payload)
+            except OSError as e:
+                # Keep the blob in memory rather than lose it
+                print(f"Error spilling blob to disk: {e}")
+                self._memory[key] = payload
+                self._memory.move_to_end(key, last=False)
+                self.memory_bytes += len(payload)
+                return
+            self._spilled[key] = len(payload)
+            self.spilled_bytes += len(payload)
+            self.spills += 1
+
+    def _load(self, key):
+        """Read a spilled blob back into memory."""
+        with open(self._path(key), "rb") as f:
+            payload = f.read()
+        self._remove_spilled(key)
+        self._memory[key] = payload
+        self.memory_bytes += len(payload)
+        self.loads += 1
+        self._spill()
+        return payload
+
+    def _remove_spilled(self, key):
+        """Delete a blob's spill file."""
+        self.spilled_bytes -= self._spilled.pop(key)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _release_pending(self):
+        """Drop one reference for every handle collected since the last operation."""
+        while self._pending:
+            key = self._pending.popleft()
+            self._refs[key] -= 1
+            if self._refs[key] > 0:
+                continue
+            del self._refs[key]
+            payload = self._memory.pop(key, None)
+            if payload is not None:
+                self.memory_bytes -= len(payload)
+            elif key in self._spilled:
+                self._remove_spilled(key)
+
+    def workspace(self):
+        """Create a session workspace backed by this store."""
+        workspace = Workspace(self)
+        with self._lock:
+            self._workspaces.add(workspace)
+        return workspace
+
+    def evict_idle(self):
+        """Clear workspaces unused for idle_timeout seconds; return how many were cleared.
+
+        Sweeps run at most once every tenth of idle_timeout, so calling this on
+        every script run is cheap.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_sweep < self.idle_timeout / 10:
+                return 0
+            self._last_sweep = now
+            idle = [workspace for workspace in self._workspaces
+                    if not workspace.evicted and now - workspace.last_used > self.idle_timeout]
+        for workspace in idle:
+            workspace.evict()
+        with self._lock:
+            self.evicted_sessions += len(idle)
+        return len(idle)
+
+    def stats(self):
+        """Return blob counts, sizes and reuse counts."""
+        with self._lock:
+            self._release_pending()
+            return {
+                "blobs": len(self._refs),
+                "references": sum(self._refs.values()),
+                "memory_bytes": self.memory_bytes,
+                "spilled_blobs": len(self._spilled),
+                "spilled_bytes": self.spilled_bytes,
+                "hits": self.hits,
+                "spills": self.spills,
+                "loads": self.loads,
+                "workspaces": len(self._workspaces),
+                "evicted_sessions": self.evicted_sessions,
+            }
+
+
+class Workspace:
+    """One session's named results, kept as handles into a shared BlobStore.
+
+    Read and assign results like a dict; assigning None removes a result.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.last_used = time.monotonic()
+        self.evicted = False
+        self._refs = {}
+
+    def __getitem__(self, name):
+        self.last_used = time.monotonic()
+        ref = self._refs.get(name)
+        return None if ref is None else self.store.get(ref)
+
+    def __setitem__(self, name, value):
+        self.last_used = time.monotonic()
+        if value is None:
+            self._refs.pop(name, None)
+        else:
+            self._refs[name] = self.store.put(value)
+
+    def __contains__(self, name):
+        return name in self._refs
+
+    def touch(self):
+        """Mark the workspace as used now; return whether it was evicted since the last touch."""
+        self.last_used = time.monotonic()
+        evicted, self.evicted = self.evicted, False
+        return evicted
+
+    def evict(self):
+        """Drop every result, releasing their blobs."""
+        self.evicted = True
+        self._refs = {}
+
+    def clear(self, *names):
+        """Drop the named results."""
+        for name in names:
+            self._refs.pop(name, None)
@@ -0,0 +1,191 @@
+"""
+Explore catalog of curated project ideas.
+This module loads the catalog from a JSONL data file once and indexes it by role,
+industry and tool, so filtering large catalogs is a few set intersections.
+"""
+
+import json
+import os
+import threading
+from functools import lru_cache
+
+from utils.profile import TOOL_DISPLAY_NAMES, canonical_industry, canonical_role, canonical_tools
+from utils.search import DEFAULT_TOP_K, SearchIndex
+
+# Default settings, overridable through environment variables
+DEFAULT_CATALOG_PATH = os.path.join("data", "catalog.jsonl")
+DEFAULT_PAGE_SIZE = 20
+
+CATALOG_FIELDS = ("title", "role", "industry", "tools", "description")
+
+# Catalogs repeat the same few spellings many times, so canonicalize each once
+_canonical_role = lru_cache(maxsize=4096)(canonical_role)
+_canonical_industry = lru_cache(maxsize=4096)(canonical_industry)
+_canonical_tools = lru_cache(maxsize=16384)(canonical_tools)
+
+
+class ProjectCatalog:
+    """Project catalog with inverted indexes for filtering.
+
+    Entries are dicts with title, role, industry, tools and description,
+    identified by their position in the catalog. The app loads it once and
+    shares it read-only between sessions.
+    """
+
+    def __init__(self, entries=()):
+        """Index the given entries."""
+        self.entries = []
+        # Canonical value -> ids of the entries that have it, in catalog order
+        self.by_role = {}
+        self.by_industry = {}
+        self.by_tool = {}
+        self._indexes = {"role": self.by_role, "industry": self.by_industry, "tool": self.by_tool}
+        self._sets = {}
+        # Canonical value -> the spelling shown in the filters
+        self.labels = {"role": {}, "industry": {}, "tool": {}}
+        # Full-text index, built on a background thread; search() waits until it is ready
+        self._search_index = None
+        self._search_lock = threading.Lock()
+        self._search_ready = threading.Event()
+        self._search_thread = None
+        for entry in entries:
+            self.add(entry)
+
+    @classmethod
+    def load(cls, path):
+        """Load a catalog from a JSONL file with one project per line."""
+        catalog = cls()
+        if not os.path.exists(path):
+            return catalog
+        with open(path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                missing = [field for field in CATALOG_FIELDS if not str(entry.get(field) or "").strip()]
+                if missing:
+                    raise ValueError(f"Catalog entry {line_number} in {path} is missing {', '.join(missing)}")
+                catalog.add(entry)
+        return catalog
+
+    @classmethod
+    def from_env(cls):
+        """Load the catalog named by the CATALOG_PATH environment variable and start indexing it for search."""
+        catalog = cls.load(os.getenv("CATALOG_PATH", DEFAULT_CATALOG_PATH))
+        catalog.build_search_index()
+        return catalog
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, entry):
+        """Append an entry to the catalog and its indexes; return its id."""
+        entry_id = len(self.entries)
+        entry = {field: str(entry[field]).strip() for field in CATALOG_FIELDS}
+        self.entries.append(entry)
+
+        role = _canonical_role(entry["role"])
+        industry = _canonical_industry(entry["industry"])
+        self._index(self.by_role, "role", role, entry["role"], entry_id)
+        self._index(self.by_industry, "industry", industry, entry["industry"], entry_id)
+        for tool in _canonical_tools(entry["tools"]):
+            self._index(self.by_tool, "tool", tool, TOOL_DISPLAY_NAMES.get(tool, tool), entry_id)
+        self._sets.clear()
+        with self._search_lock:
+            if self._search_index is not None:
+                self._search_index.add(entry_id, entry)
+        return entry_id
+
+    def _index(self, index, kind, key, label, entry_id):
+        """Add an entry id to the posting list of one indexed value."""
+        index.setdefault(key, []).append(entry_id)
+        self.labels[kind].setdefault(key, label)
+
+    def get(self, entry_id):
+        """Return the entry with the given id."""
+        return self.entries[entry_id]
+
+    def options(self, kind):
+        """Return the filter labels for role, industry or tool, most common first."""
+        index = self._indexes[kind]
+        keys = sorted(index, key=lambda key: (-len(index[key]), key))
+        return [self.labels[kind][key] for key in keys]
+
+    def _posting_set(self, kind, key):
+        """Return the posting list of a value as a set, built once per value."""
+        cache_key = (kind, key)
+        if cache_key not in self._sets:
+            self._sets[cache_key] = frozenset(self._indexes[kind].get(key, ()))
+        return self._sets[cache_key]
+
+    def filter(self, role=None, industry=None, tools=()):
+        """Return the ids of entries matching every given filter, in catalog order.
+
+        role and industry are single values; every tool in tools must match.
+        Empty filters match everything.
+        """
+        postings = []
+        if role:
+            postings.append(("role", canonical_role(role)))
+        if industry:
+            postings.append(("industry", canonical_industry(industry)))
+        for tool in canonical_tools(tools):
+            postings.append(("tool", tool))
+
+        if not postings:
+            return range(len(self.entries))
+
+        if len(postings) == 1:
+            kind, key = postings[0]
+            return self._indexes[kind].get(key, [])
+
+        # Intersect from the smallest set so the work is bounded by the rarest value
+        sets = sorted((self._posting_set(kind, key) for kind, key in postings), key=len)
+        return sorted(sets[0].intersection(*sets[1:]))
+
+    def build_search_index(self):
+        """Start building the full-text index in the background, if it is not built or building yet."""
+        with self._search_lock:
+            if self._search_thread is not None:
+                return
+            self._search_thread = threading.Thread(
+                target=self._build_search_index, name="catalog-search-index", daemon=True
+            )
+            self._search_thread.start()
+
+    def _build_search_index(self):
+        """Index every entry without holding the lock, then swap the index in."""
+        try:
+            index = SearchIndex()
+            count = len(self.entries)
+            for entry_id in range(count):
+                index.add(entry_id, self.entries[entry_id])
+            with self._search_lock:
+                # Entries added while the index was being built
+                for entry_id in range(count, len(self.entries)):
+                    index.add(entry_id, self.entries[entry_id])
+                self._search_index = index
+        except Exception as e:
+            print(f"Error building the catalog search index: {e}")
+        finally:
+            self._search_ready.set()
+
+    def search(self, query, k=DEFAULT_TOP_K, ids=None):
+        """Return the top k SearchResults for a query, optionally only among the given ids.
+
+        Waits for the search index if it is still being built.
+        """
+        self.build_search_index()
+        self._search_ready.wait()
+        if self._search_index is None:
+            return []
+        # Unfiltered ids cover the whole catalog and need no restriction
+        allowed = None if ids is None or len(ids) == len(self.entries) else set(ids)
+        return self._search_index.search(query, k, allowed)
+
+    def page(self, ids, page, page_size=DEFAULT_PAGE_SIZE):
+        """Return the entries on a zero-based page of ids and the number of pages."""
+        pages = max(1, -(-len(ids) // page_size))
+        page = min(max(page, 0), pages - 1)
+        start = page * page_size
+        return [(entry_id, self.entries[entry_id]) for entry_id in ids[start:start + page_size]], pages
@@ -0,0 +1,187 @@
+"""
+Bulk export of saved projects.
+This module streams saved projects into JSON, NDJSON, Markdown or a ZIP with one
+file per project, writing to a temporary file on a background thread so large
+libraries export in bounded memory.
+"""
+
+import json
+import os
+import re
+import tempfile
+import threading
+import weakref
+import zipfile
+
+# Markdown is written in chunks of about this many characters
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# Export format -> (file name, MIME type)
+EXPORT_FORMATS = {
+    "JSON": ("data_projects.json", "application/json"),
+    "NDJSON": ("data_projects.ndjson", "application/x-ndjson"),
+    "Markdown": ("data_projects.md", "text/markdown"),
+    "ZIP": ("data_projects.zip", "application/zip"),
+}
+
+# Fields written for every project, in order
+EXPORT_FIELDS = ("title", "job_title", "industry", "tools", "date_saved", "details")
+
+
+def project_markdown(project):
+    """Render one saved project as a Markdown section."""
+    return (
+        f"# {project['title']}\n\n"
+        f"**Job Role:** {project['job_title']}\n\n"
+        f"**Industry:** {project['industry']}\n\n"
+        f"**Tools:** {project['tools']}\n\n"
+        f"**Saved on:** {project['date_saved']}\n\n"
+        f"## Project Details\n\n{project['details']}\n\n"
+        "---\n\n"
+    )
+
+
+def iter_ndjson(projects):
+    """Yield one JSON line per project."""
+    for project in projects:
+        yield json.dumps({field: project.get(field, "") for field in EXPORT_FIELDS}, ensure_ascii=False) + "\n"
+
+
+def iter_json(projects):
+    """Yield a JSON array of the projects one element at a time."""
+    separator = "[\n"
+    for line in iter_ndjson(projects):
+        yield separator + line.rstrip("\n")
+        separator = ",\n"
+    yield "\n]\n" if separator != "[\n" else "[]\n"
+
+
+def iter_markdown(projects, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield the Markdown export in chunks of roughly chunk_size characters."""
+    parts = []
+    size = 0
+    for project in projects:
+        section = project_markdown(project)
+        parts.append(section)
+        size += len(section)
+        if size >= chunk_size:
+            yield "".join(parts)
+            parts = []
+            size = 0
+    if parts:
+        yield "".join(parts)
+
+
+def project_file_name(title, used):
+    """Return a unique, file-system safe Markdown file name for a project title."""
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", title).strip("-").lower()[:80] or "project"
+    name = f"{slug}.md"
+    counter = 2
+    while name in used:
+        name = f"{slug}-{counter}.md"
+        counter += 1
+    used.add(name)
+    return name
+
+
+def write_zip(projects, fileobj):
+    """Write a ZIP archive with one Markdown file per project to a binary file object."""
+    used = set()
+    with zipfile.ZipFile(fileobj, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for project in projects:
+            archive.writestr(project_file_name(project["title"], used), project_markdown(project))
+            yield project
+
+
+def _count(projects, progress):
+    """Pass projects through, counting them as they are written."""
+    for project in projects:
+        yield project
+        progress()
+
+
+class ExportJob:
+    """Export of a user's saved projects, built on a background thread.
+
+    The export is written to a temporary file; read progress with done and
+    total, and open the file with open() once finished is True.
+    """
+
+    def __init__(self, repository, user, export_format):
+        """Start exporting every project the user saved in the given format."""
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {export_format}")
+        self.export_format = export_format
+        self.file_name, self.mime = EXPORT_FORMATS[export_format]
+        self.total = repository.count(user)
+        self.done = 0
+        self.error = None
+        self._cancelled = threading.Event()
+
+        fd, self.path = tempfile.mkstemp(prefix="export-", suffix=os.path.splitext(self.file_name)[1])
+        os.close(fd)
+        # Remove the file when the job is dropped from the session
+        self._finalizer = weakref.finalize(self, _remove, self.path)
+
+        self._thread = threading.Thread(
+            target=self._run, args=(repository, user), name="project-export", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def finished(self):
+        """Whether the export has completed, failed or been cancelled."""
+        return not self._thread.is_alive()
+
+    @property
+    def progress(self):
+        """Fraction of projects written so far, between 0 and 1."""
+        return min(1.0, self.done / self.total) if self.total else 1.0
+
+    def _advance(self):
+        """Count one more written project, stopping the export if it was cancelled."""
+        if self._cancelled.is_set():
+            raise InterruptedError("Export cancelled")
+        self.done += 1
+
+    def _run(self, repository, user):
+        """Write the export; runs on the background thread."""
+        projects = _count(repository.iter_all(user), self._advance)
+        try:
+            if self.export_format == "ZIP":
+                with open(self.path, "wb") as f:
+                    for _ in write_zip(projects, f):
+                        pass
+            else:
+                writers = {"JSON": iter_json, "NDJSON": iter_ndjson, "Markdown": iter_markdown}
+                chunks = writers[self.export_format](projects)
+                with open(self.path, "w", encoding="utf-8") as f:
+                    for chunk in chunks:
+                        f.write(chunk)
+        except Exception as e:
+            self.error = e
+            if not isinstance(e, InterruptedError):
+                print(f"Error exporting saved projects: {e}")
+
+    def wait(self, timeout=None):
+        """Block until the export finishes or the timeout expires; return whether it finished."""
+        self._thread.join(timeout)
+        return self.finished
+
+    def open(self):
+        """Open the finished export for reading as bytes."""
+        return open(self.path, "rb")
+
+    def cancel(self):
+        """Stop the export and delete its file."""
+        self._cancelled.set()
+        self._thread.join()
+        self._finalizer()
+
+
+def _remove(path):
+    """Delete a file if it still exists."""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
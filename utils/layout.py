@@ -0,0 +1,309 @@
+"""
+Force-directed graph layout.
+This module lays out skills graphs with a vectorized NumPy Fruchterman-Reingold
+force layout. Layouts are cached by a canonical hash of the graph, and a graph
+that extends a cached one starts from the positions already computed.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+# Default settings, overridable through environment variables
+DEFAULT_ITERATIONS = 50
+DEFAULT_SEED = 42
+DEFAULT_LAYOUT_CACHE_ENTRIES = 128
+
+# Up to this many nodes every pair of nodes repels exactly; larger graphs use the grid approximation
+DENSE_LIMIT = 500
+
+# Average number of nodes per grid cell in the approximation
+NODES_PER_CELL = 1
+
+# Warm starts reuse a cached layout that has at least this share of the new graph's nodes
+# and shares at least this share of the edges of the larger of the two graphs
+WARM_START_OVERLAP = 0.5
+WARM_START_EDGE_OVERLAP = 0.5
+WARM_START_CANDIDATES = 16
+
+# Largest first step as a share of the layout's extent, from scratch and on warm starts
+DEFAULT_TEMPERATURE = 0.1
+WARM_START_TEMPERATURE = 0.02
+
+# Warm starts run this share of the iterations
+WARM_START_ITERATIONS = 0.5
+
+# Half of the neighbouring cells, whose nodes repel each other exactly; each pair of
+# cells is visited once and the force applied to both ends
+NEAR_OFFSETS = [(0, 0), (0, 1), (1, -1), (1, 0), (1, 1)]
+
+
+def graph_key(nodes, edges, **params):
+    """Return a canonical hash of a graph and its layout parameters, independent of node and edge order."""
+    names = {node: repr(node) for node in nodes}
+    canonical_edges = sorted(
+        (*sorted((names.get(u) or repr(u), names.get(v) or repr(v))), float(weight)) for u, v, weight in edges
+    )
+    payload = repr((sorted(names.values()), canonical_edges, sorted(params.items())))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _repulsion_dense(np, pos, k):
+    """Repulsion between every pair of nodes."""
+    dx = pos[:, 0, None] - pos[None, :, 0]
+    dy = pos[:, 1, None] - pos[None, :, 1]
+    distance2 = dx * dx + dy * dy
+    np.maximum(distance2, 0.0001, out=distance2)
+    np.fill_diagonal(distance2, np.inf)
+    scale = (k * k) / distance2
+    return np.column_stack([(dx * scale).sum(axis=1), (dy * scale).sum(axis=1)])
+
+
+def _fft_size(n):
+    """Return the smallest size of at least n with only 2, 3 and 5 as prime factors, which FFTs handle fastest."""
+    while True:
+        m = n
+        for factor in (2, 3, 5):
+            while m % factor == 0:
+                m //= factor
+        if m == 1:
+            return n
+        n += 1
+
+
+def _far_kernel(np, grid):
+    """FFT of the repulsion kernel between cell centres more than one cell apart, for unit cells."""
+    offsets = np.arange(-(grid - 1), grid)
+    dx, dy = np.meshgrid(offsets, offsets, indexing="ij")
+    distance2 = (dx ** 2 + dy ** 2).astype(float)
+    near = (np.abs(dx) <= 1) & (np.abs(dy) <= 1)
+    distance2[near] = np.inf
+    # Pad past the full linear convolution size so it does not wrap around
+    size = _fft_size(3 * grid - 2)
+    shape = (size, size)
+    return (np.fft.rfft2(dx / distance2, shape), np.fft.rfft2(dy / distance2, shape), shape)
+
+
+def _repulsion_grid(np, pos, k, grid, kernel):
+    """Approximate repulsion: exact between nodes in neighbouring cells, cell to cell beyond that."""
+    n = len(pos)
+    low = pos.min(axis=0)
+    extent = max(float((pos.max(axis=0) - low).max()), 1e-9)
+    cell = extent / grid
+    cells = np.minimum(((pos - low) / cell).astype(int), grid - 1)
+    cell_id = cells[:, 0] * grid + cells[:, 1]
+
+    # Nodes sorted by cell, with each cell's slice of the sorted order
+    order = np.argsort(cell_id, kind="stable")
+    counts = np.bincount(cell_id, minlength=grid * grid)
+    starts = np.cumsum(counts) - counts
+
+    # Exact repulsion between nodes in the 3x3 block of cells around each node
+    sources, targets = [], []
+    for dx, dy in NEAR_OFFSETS:
+        cx, cy = cells[:, 0] + dx, cells[:, 1] + dy
+        valid = (cx >= 0) & (cx < grid) & (cy >= 0) & (cy < grid)
+        node = np.nonzero(valid)[0]
+        neighbour_cell = cx[valid] * grid + cy[valid]
+        count = counts[neighbour_cell]
+        total = int(count.sum())
+        if not total:
+            continue
+        first = np.repeat(np.cumsum(count) - count, count)
+        sources.append(np.repeat(node, count))
+        targets.append(order[np.repeat(starts[neighbour_cell], count) + np.arange(total) - first])
+    source = np.concatenate(sources)
+    target = np.concatenate(targets)
+    # Within a cell keep each pair once
+    once = (source < target) | (cell_id[source] != cell_id[target])
+    source, target = source[once], target[once]
+    dx = pos[source, 0] - pos[target, 0]
+    dy = pos[source, 1] - pos[target, 1]
+    scale = (k * k) / np.maximum(dx * dx + dy * dy, 0.0001)
+    fx, fy = dx * scale, dy * scale
+    displacement = np.column_stack([
+        np.bincount(source, weights=fx, minlength=n) - np.bincount(target, weights=fx, minlength=n),
+        np.bincount(source, weights=fy, minlength=n) - np.bincount(target, weights=fy, minlength=n),
+    ])
+
+    # Cells further away act as one mass at their centre: convolve the node counts with the kernel
+    kernel_x, kernel_y, shape = kernel
+    mass = np.fft.rfft2(counts.reshape(grid, grid).astype(float), shape)
+    offset = grid - 1
+    field_x = np.fft.irfft2(mass * kernel_x, shape)[offset:offset + grid, offset:offset + grid]
+    field_y = np.fft.irfft2(mass * kernel_y, shape)[offset:offset + grid, offset:offset + grid]
+    scale = k * k / cell
+    displacement[:, 0] += field_x[cells[:, 0], cells[:, 1]] * scale
+    displacement[:, 1] += field_y[cells[:, 0], cells[:, 1]] * scale
+    return displacement
+
+
+def force_layout(n, edges, k=None, iterations=DEFAULT_ITERATIONS, seed=DEFAULT_SEED, initial=None,
+                 temperature=DEFAULT_TEMPERATURE):
+    """Lay out n nodes with Fruchterman-Reingold forces.
+
+    edges is a list of (source index, target index, weight). initial, if given,
+    is an (n, 2) array of starting positions in the unit square; otherwise nodes
+    start at seeded random positions. temperature is the largest first step as
+    a share of the layout's extent. Returns an (n, 2) array scaled to [-1, 1].
+    """
+    import numpy as np
+
+    if n == 0:
+        return np.zeros((0, 2))
+    if n == 1:
+        return np.zeros((1, 2))
+
+    pos = np.array(initial, dtype=float) if initial is not None else np.random.RandomState(seed).rand(n, 2)
+    if k is None:
+        k = (1.0 / n) ** 0.5
+
+    edge_array = np.array([(u, v) for u, v, _ in edges if u != v], dtype=int).reshape(-1, 2)
+    weights = np.array([w for u, v, w in edges if u != v], dtype=float)
+    source, target = edge_array[:, 0], edge_array[:, 1]
+
+    grid = max(4, int((n / NODES_PER_CELL) ** 0.5)) if n > DENSE_LIMIT else 0
+    kernel = _far_kernel(np, grid) if grid else None
+
+    # Linear cooling, as in networkx's spring_layout
+    t = float((pos.max(axis=0) - pos.min(axis=0)).max()) * temperature
+    dt = t / (iterations + 1)
+    for _ in range(iterations):
+        displacement = _repulsion_grid(np, pos, k, grid, kernel) if grid else _repulsion_dense(np, pos, k)
+
+        # Attraction along edges, proportional to the squared distance and the weight
+        if len(source):
+            delta = pos[source] - pos[target]
+            distance = np.sqrt((delta ** 2).sum(axis=1))
+            force = delta * (weights * distance / k)[:, None]
+            for axis in (0, 1):
+                displacement[:, axis] -= np.bincount(source, weights=force[:, axis], minlength=n)
+                displacement[:, axis] += np.bincount(target, weights=force[:, axis], minlength=n)
+
+        length = np.sqrt((displacement ** 2).sum(axis=1))
+        length = np.where(length < 0.01, 0.1, length)
+        pos += displacement * (t / length)[:, None]
+        t -= dt
+
+    # Centre on the origin and scale into [-1, 1]
+    pos -= pos.mean(axis=0)
+    limit = np.abs(pos).max()
+    if limit > 0:
+        pos /= limit
+    return pos
+
+
+class LayoutEngine:
+    """Thread-safe LRU cache of graph layouts with warm starts for extended graphs."""
+
+    def __init__(self, max_entries=DEFAULT_LAYOUT_CACHE_ENTRIES):
+        """Create an engine with an empty cache."""
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.warm_starts = 0
+        # key -> ({node: (x, y)}, set of undirected edges)
+        self._layouts = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._layouts)
+
+    def layout(self, nodes, edges, k=None, iterations=DEFAULT_ITERATIONS, seed=DEFAULT_SEED):
+        """Return {node: (x, y)} for a graph given as nodes and (source, target, weight) edges."""
+        nodes = list(dict.fromkeys(nodes))
+        key = graph_key(nodes, edges, k=k, iterations=iterations, seed=seed)
+        with self._lock:
+            cached = self._layouts.get(key)
+            if cached is not None:
+                self._layouts.move_to_end(key)
+                self.hits += 1
+                return dict(cached[0])
+            self.misses += 1
+
+        index = {node: i for i, node in enumerate(nodes)}
+        edge_set = frozenset(frozenset((u, v)) for u, v, _ in edges if u in index and v in index)
+        with self._lock:
+            previous = self._warm_start(nodes, edge_set)
+
+        indexed_edges = [(index[u], index[v], weight) for u, v, weight in edges if u in index and v in index]
+        if previous is None:
+            positions = force_layout(len(nodes), indexed_edges, k, iterations, seed)
+        else:
+            positions = force_layout(
+                len(nodes), indexed_edges, k,
+                max(1, int(iterations * WARM_START_ITERATIONS)), seed,
+                initial=self._initial_positions(nodes, indexed_edges, previous, seed),
+                temperature=WARM_START_TEMPERATURE,
+            )
+
+        result = {node: (float(x), float(y)) for node, (x, y) in zip(nodes, positions)}
+        with self._lock:
+            self._layouts[key] = (result, edge_set)
+            while len(self._layouts) > self.max_entries:
+                self._layouts.popitem(last=False)
+        return dict(result)
+
+    def _warm_start(self, nodes, edge_set):
+        """Find the recent cached layout of the most similar graph; the caller holds the lock.
+
+        Shared node names alone are not enough: generic skills recur across
+        unrelated projects, so the graphs must also share most of their edges.
+        """
+        best, best_overlap = None, 0
+        for layout, layout_edges in list(reversed(self._layouts.values()))[:WARM_START_CANDIDATES]:
+            shared_edges = len(edge_set & layout_edges)
+            if not shared_edges or shared_edges < WARM_START_EDGE_OVERLAP * max(len(edge_set), len(layout_edges)):
+                continue
+            overlap = sum(1 for node in nodes if node in layout)
+            if overlap > best_overlap:
+                best, best_overlap = layout, overlap
+        if best is None or best_overlap < 2 or best_overlap < WARM_START_OVERLAP * len(nodes):
+            return None
+        self.warm_starts += 1
+        return best
+
+    @staticmethod
+    def _initial_positions(nodes, edges, previous, seed):
+        """Start known nodes where they were and new nodes next to their known neighbours."""
+        import numpy as np
+
+        rng = np.random.RandomState(seed)
+        # Cached layouts are in [-1, 1]; the force layout works in the unit square
+        pos = np.array([previous.get(node, (np.nan, np.nan)) for node in nodes], dtype=float)
+        pos = (pos + 1) / 2
+        new = np.isnan(pos[:, 0])
+        if new.any():
+            known = pos[~new]
+            sums = np.zeros_like(pos)
+            counts = np.zeros(len(nodes))
+            for u, v, _ in edges:
+                if not new[v] and new[u]:
+                    sums[u] += pos[v]
+                    counts[u] += 1
+                if not new[u] and new[v]:
+                    sums[v] += pos[u]
+                    counts[v] += 1
+            centre = known.mean(axis=0)
+            jitter = rng.normal(scale=0.02, size=pos.shape)
+            anchored = counts > 0
+            pos[new & anchored] = sums[new & anchored] / counts[new & anchored][:, None]
+            pos[new & ~anchored] = centre
+            pos[new] += jitter[new]
+        return pos
+
+    def clear(self):
+        """Drop every cached layout."""
+        with self._lock:
+            self._layouts.clear()
+
+    def stats(self):
+        """Return the cache size and hit counts."""
+        with self._lock:
+            return {"entries": len(self._layouts), "hits": self.hits, "misses": self.misses,
+                    "warm_starts": self.warm_starts}
+
+
+# Layouts shared by every session
+layout_engine = LayoutEngine(int(os.getenv("LAYOUT_CACHE_ENTRIES", DEFAULT_LAYOUT_CACHE_ENTRIES)))
@@ -0,0 +1,222 @@
+"""
+Metrics for AI generations.
+This module records latency, token usage, cache results, retries and fallbacks
+for every model call, and exports them as JSON or Prometheus text.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from collections import defaultdict, deque
+
+# Default settings, overridable through environment variables
+DEFAULT_METRICS_DUMP_PATH = "metrics.prom"
+DEFAULT_MAX_SAMPLES = 5000
+
+PERCENTILES = (0.5, 0.95, 0.99)
+
+
+def percentile(sorted_values, fraction):
+    """Return the nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    # The smallest value with at least fraction of the samples at or below it; the
+    # tolerance keeps float products such as 0.07 * 100 from rounding up a rank
+    rank = math.ceil(fraction * len(sorted_values) - 1e-9)
+    return sorted_values[min(len(sorted_values) - 1, max(0, rank - 1))]
+
+
+def _labels(**labels):
+    """Format Prometheus labels."""
+    parts = []
+    for name, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+        parts.append(f'{name}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+class CallStats:
+    """Aggregated metrics for one method and model."""
+
+    def __init__(self, max_samples):
+        """Start with empty counters and a bounded window of latency samples."""
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.prompt_tokens = 0
+        self.response_tokens = 0
+        self.latency_sum = 0.0
+        self.latencies = deque(maxlen=max_samples)
+        self.first_chunk_latencies = deque(maxlen=max_samples)
+
+
+class MetricsRegistry:
+    """Thread-safe, in-process registry of model call metrics."""
+
+    def __init__(self, max_samples=DEFAULT_MAX_SAMPLES):
+        """Create an empty registry keeping up to max_samples latencies per method."""
+        self.max_samples = max_samples
+        self.started = time.time()
+        self._calls = {}
+        self._cache = defaultdict(int)
+        self._events = defaultdict(int)
+        self._gauges = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, method, model):
+        """Return the CallStats for a method and model, creating it if needed."""
+        key = (method, model)
+        if key not in self._calls:
+            self._calls[key] = CallStats(self.max_samples)
+        return self._calls[key]
+
+    def record_call(self, method, model, latency, usage=None, retries=0, error=None, first_chunk_latency=None):
+        """Record one model call with its latency, token usage and retries."""
+        with self._lock:
+            stats = self._stats(method, model)
+            stats.calls += 1
+            stats.retries += retries
+            stats.latency_sum += latency
+            stats.latencies.append(latency)
+            if first_chunk_latency is not None:
+                stats.first_chunk_latencies.append(first_chunk_latency)
+            if error is not None:
+                stats.errors += 1
+            if usage is not None:
+                stats.prompt_tokens += getattr(usage, "prompt_token_count", 0) or 0
+                stats.response_tokens += getattr(usage, "candidates_token_count", 0) or 0
+
+    def record_cache(self, method, result):
+        """Record a cache lookup result: hit, miss or shared (joined an in-flight call)."""
+        with self._lock:
+            self._cache[(method, result)] += 1
+
+    def record_event(self, method, event):
+        """Record a notable event such as a fallback, repair or re-ask."""
+        with self._lock:
+            self._events[(method, event)] += 1
+
+    def register_gauges(self, source, collect):
+        """Register a function returning a dict of numeric gauges to include in exports."""
+        with self._lock:
+            self._gauges[source] = collect
+
+    def summary(self):
+        """Return per-method metrics with latency percentiles."""
+        with self._lock:
+            items = [(key, stats, sorted(stats.latencies), sorted(stats.first_chunk_latencies))
+                     for key, stats in self._calls.items()]
+            cache = dict(self._cache)
+            events = dict(self._events)
+
+        # Methods served only from the cache still get a row
+        called = {method for (method, _), *_ in items}
+        for method in sorted(({method for method, _ in cache} | {method for method, _ in events}) - called):
+            items.append(((method, ""), CallStats(0), [], []))
+
+        rows = []
+        for (method, model), stats, latencies, first_chunks in sorted(items, key=lambda item: item[0]):
+            row = {
+                "method": method,
+                "model": model,
+                "calls": stats.calls,
+                "errors": stats.errors,
+                "retries": stats.retries,
+                "prompt_tokens": stats.prompt_tokens,
+                "response_tokens": stats.response_tokens,
+                "cache_hits": cache.get((method, "hit"), 0),
+                "cache_misses": cache.get((method, "miss"), 0),
+                "cache_shared": cache.get((method, "shared"), 0),
+            }
+            # Fallbacks, repairs and re-asks made for this method
+            row.update({event: count for (event_method, event), count in sorted(events.items())
+                        if event_method == method})
+            for fraction in PERCENTILES:
+                row[f"p{int(fraction * 100)}_s"] = round(percentile(latencies, fraction), 4)
+            if first_chunks:
+                row["p50_first_chunk_s"] = round(percentile(first_chunks, 0.5), 4)
+            rows.append(row)
+        return rows
+
+    def snapshot(self):
+        """Return every metric as a JSON-serializable dict."""
+        with self._lock:
+            cache = [{"method": m, "result": r, "count": c} for (m, r), c in sorted(self._cache.items())]
+            events = [{"method": m, "event": e, "count": c} for (m, e), c in sorted(self._events.items())]
+            gauges = dict(self._gauges)
+        return {
+            "generated_at": time.time(),
+            "uptime_s": round(time.time() - self.started, 1),
+            "calls": self.summary(),
+            "cache": cache,
+            "events": events,
+            "gauges": {source: collect() for source, collect in gauges.items()},
+        }
+
+    def to_json(self):
+        """Export every metric as JSON text."""
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self):
+        """Export every metric in the Prometheus text exposition format."""
+        with self._lock:
+            calls = [(key, stats, sorted(stats.latencies)) for key, stats in sorted(self._calls.items())]
+            cache = sorted(self._cache.items())
+            events = sorted(self._events.items())
+            gauges = dict(self._gauges)
+
+        lines = [
+            "# HELP ai_call_latency_seconds Latency of model calls.",
+            "# TYPE ai_call_latency_seconds summary",
+        ]
+        for (method, model), stats, latencies in calls:
+            for fraction in PERCENTILES:
+                labels = _labels(method=method, model=model, quantile=fraction)
+                lines.append(f"ai_call_latency_seconds{labels} {percentile(latencies, fraction):.6f}")
+            labels = _labels(method=method, model=model)
+            lines.append(f"ai_call_latency_seconds_sum{labels} {stats.latency_sum:.6f}")
+            lines.append(f"ai_call_latency_seconds_count{labels} {stats.calls}")
+
+        counters = (
+            ("ai_call_errors_total", "Model calls that raised an error.", "errors"),
+            ("ai_call_retries_total", "Retries of model calls.", "retries"),
+            ("ai_prompt_tokens_total", "Prompt tokens reported by the model.", "prompt_tokens"),
+            ("ai_response_tokens_total", "Response tokens reported by the model.", "response_tokens"),
+        )
+        for name, help_text, attribute in counters:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for (method, model), stats, _ in calls:
+                lines.append(f"{name}{_labels(method=method, model=model)} {getattr(stats, attribute)}")
+
+        lines.append("# HELP ai_cache_requests_total Response cache lookups by result.")
+        lines.append("# TYPE ai_cache_requests_total counter")
+        for (method, result), count in cache:
+            lines.append(f"ai_cache_requests_total{_labels(method=method, result=result)} {count}")
+
+        lines.append("# HELP ai_events_total Fallbacks, repairs and re-asks.")
+        lines.append("# TYPE ai_events_total counter")
+        for (method, event), count in events:
+            lines.append(f"ai_events_total{_labels(method=method, event=event)} {count}")
+
+        for source, collect in sorted(gauges.items()):
+            for name, value in sorted(collect().items()):
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    lines.append(f"ai_{source}_{name} {value}")
+
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path=None):
+        """Write the metrics to a file: JSON for .json paths, Prometheus text otherwise."""
+        path = path or os.getenv("METRICS_DUMP_PATH", DEFAULT_METRICS_DUMP_PATH)
+        text = self.to_json() if path.endswith(".json") else self.to_prometheus()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+        return path
@@ -0,0 +1,49 @@
+"""
+Speculative prefetch of project details.
+This module starts detail generation for the top ideas so selecting one of them is usually instant.
+"""
+
+import os
+
+# Default settings, overridable through environment variables
+DEFAULT_PREFETCH_TOP_N = 3
+DEFAULT_PREFETCH_BUDGET = 20
+
+
+class DetailPrefetcher:
+    """Per-session prefetcher that warms the response cache for the top project ideas."""
+
+    def __init__(self, ai_helper, budget=None, top_n=None):
+        """Create a prefetcher with a budget of prefetches for the whole session."""
+        self.ai_helper = ai_helper
+        self.budget = budget if budget is not None else int(os.getenv("PREFETCH_BUDGET", DEFAULT_PREFETCH_BUDGET))
+        self.top_n = top_n if top_n is not None else int(os.getenv("PREFETCH_TOP_N", DEFAULT_PREFETCH_TOP_N))
+        self.futures = {}
+
+    def start(self, ideas, job_title, tools, industry):
+        """Start generating details for the first top_n ideas in the background.
+
+        Returns the number of prefetches started.
+        """
+        started = 0
+        for title in ideas[:self.top_n]:
+            if self.budget <= 0:
+                break
+            if title in self.futures:
+                continue
+            self.futures[title] = self.ai_helper.prefetch_project_details(title, job_title, tools, industry)
+            self.budget -= 1
+            started += 1
+        return started
+
+    def is_ready(self, title):
+        """Check whether the details for a title have been prefetched successfully."""
+        future = self.futures.get(title)
+        return future is not None and future.done() and not future.cancelled() and future.exception() is None
+
+    def cancel(self):
+        """Cancel prefetches that have not started yet and refund their budget."""
+        for future in self.futures.values():
+            if future.cancel():
+                self.budget += 1
+        self.futures = {}
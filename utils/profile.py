@@ -0,0 +1,192 @@
+"""
+Job profile canonicalization.
+This module maps free-text job titles, tools and industries onto canonical forms
+so near-identical inputs share prompts and cached results.
+"""
+
+import hashlib
+import json
+import re
+
+# Common spellings of roles, mapped to one canonical role
+ROLE_SYNONYMS = {
+    "ds": "data scientist",
+    "data science": "data scientist",
+    "data scientists": "data scientist",
+    "da": "data analyst",
+    "data analysis": "data analyst",
+    "data analytics": "data analyst",
+    "data analysts": "data analyst",
+    "de": "data engineer",
+    "data engineering": "data engineer",
+    "data engineers": "data engineer",
+    "mle": "machine learning engineer",
+    "ml engineer": "machine learning engineer",
+    "ml eng": "machine learning engineer",
+    "machine learning eng": "machine learning engineer",
+    "ai engineer": "machine learning engineer",
+    "bi developer": "bi developer",
+    "bi dev": "bi developer",
+    "business intelligence developer": "bi developer",
+    "power bi developer": "bi developer",
+    "ba": "business analyst",
+    "business analysts": "business analyst",
+}
+
+# Common spellings of industries, mapped to one canonical industry
+INDUSTRY_SYNONYMS = {
+    "health care": "healthcare",
+    "health": "healthcare",
+    "medical": "healthcare",
+    "hospital": "healthcare",
+    "hospitals": "healthcare",
+    "pharma": "pharmaceuticals",
+    "fintech": "finance",
+    "financial": "finance",
+    "financial services": "finance",
+    "banking": "finance",
+    "tech": "technology",
+    "it": "technology",
+    "software": "technology",
+    "e-commerce": "retail",
+    "ecommerce": "retail",
+    "retail & e-commerce": "retail",
+    "manufacture": "manufacturing",
+    "supply chain": "logistics",
+}
+
+# Tool aliases, mapped to one canonical tool name
+TOOL_ALIASES = {
+    "py": "python",
+    "python3": "python",
+    "python 3": "python",
+    "power bi": "powerbi",
+    "power-bi": "powerbi",
+    "ms excel": "excel",
+    "microsoft excel": "excel",
+    "sklearn": "scikit-learn",
+    "scikit learn": "scikit-learn",
+    "scikitlearn": "scikit-learn",
+    "tf": "tensorflow",
+    "torch": "pytorch",
+    "postgres": "postgresql",
+    "ms sql": "sql server",
+    "mssql": "sql server",
+    "tableau desktop": "tableau",
+    "apache airflow": "airflow",
+    "apache spark": "spark",
+    "r language": "r",
+    "rstudio": "r",
+}
+
+# How canonical tools are written in prompts
+TOOL_DISPLAY_NAMES = {
+    "python": "Python",
+    "sql": "SQL",
+    "r": "R",
+    "excel": "Excel",
+    "powerbi": "PowerBI",
+    "tableau": "Tableau",
+    "scikit-learn": "scikit-learn",
+    "tensorflow": "TensorFlow",
+    "pytorch": "PyTorch",
+    "xgboost": "XGBoost",
+    "postgresql": "PostgreSQL",
+    "sql server": "SQL Server",
+    "airflow": "Airflow",
+    "spark": "Spark",
+    "pandas": "pandas",
+    "aws": "AWS",
+    "gcp": "GCP",
+    "dbt": "dbt",
+}
+
+# Words that stay upper case when a role or industry is written out
+UPPERCASE_WORDS = {"bi", "ai", "ml", "it", "hr", "iot"}
+
+# Separators between tools in a free-text tool list
+TOOL_SEPARATORS = re.compile(r"\s*(?:[,;|&\n]|\band\b)\s*")
+
+
+def normalize_text(value):
+    """Case-fold a value and collapse whitespace and surrounding punctuation."""
+    value = re.sub(r"\s+", " ", str(value or "")).strip(" .,;:-").casefold()
+    return value
+
+
+def canonical_role(job_title):
+    """Return the canonical role for a job title."""
+    role = normalize_text(job_title)
+    return ROLE_SYNONYMS.get(role, role)
+
+
+def canonical_industry(industry):
+    """Return the canonical industry name."""
+    industry = normalize_text(industry)
+    return INDUSTRY_SYNONYMS.get(industry, industry)
+
+
+def canonical_tools(tools):
+    """Parse a free-text tool list into a sorted tuple of unique canonical tools."""
+    names = tools if isinstance(tools, (list, tuple, set)) else TOOL_SEPARATORS.split(str(tools or ""))
+    canonical = set()
+    for name in names:
+        name = normalize_text(name)
+        if name:
+            canonical.add(TOOL_ALIASES.get(name, name))
+    return tuple(sorted(canonical))
+
+
+def canonical_title(title):
+    """Normalize a project title for use in cache keys."""
+    return normalize_text(title)
+
+
+def _display(value):
+    """Write a canonical role or industry the way it appears in prompts."""
+    return " ".join(word.upper() if word in UPPERCASE_WORDS else word.capitalize() for word in value.split(" "))
+
+
+class Profile:
+    """Canonical form of a job profile with a stable key."""
+
+    def __init__(self, role, tools, industry):
+        """Store the canonical role, tool tuple and industry."""
+        self.role = role
+        self.tools = tuple(tools)
+        self.industry = industry
+        payload = json.dumps([self.role, list(self.tools), self.industry], ensure_ascii=False)
+        self.key = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+    def __eq__(self, other):
+        return isinstance(other, Profile) and self.key == other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __repr__(self):
+        return f"Profile(role={self.role!r}, tools={self.tools!r}, industry={self.industry!r})"
+
+    @property
+    def job_title(self):
+        """Role as written in prompts, e.g. 'Data Scientist'."""
+        return _display(self.role)
+
+    @property
+    def tools_text(self):
+        """Tools as written in prompts, e.g. 'Python, SQL'."""
+        return ", ".join(TOOL_DISPLAY_NAMES.get(tool, tool) for tool in self.tools)
+
+    @property
+    def industry_name(self):
+        """Industry as written in prompts, e.g. 'Healthcare'."""
+        return _display(self.industry)
+
+    def prompt_fields(self):
+        """Return (job_title, tools, industry) as written in prompts."""
+        return self.job_title, self.tools_text, self.industry_name
+
+
+def canonicalize_profile(job_title, tools, industry):
+    """Build the canonical Profile for free-text profile inputs."""
+    return Profile(canonical_role(job_title), canonical_tools(tools), canonical_industry(industry))
@@ -0,0 +1,269 @@
+"""
+Rate limiting, client pooling and retries for model calls.
+This module keeps Gemini traffic at the quota ceiling instead of failing over to fallback data.
+"""
+
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+# Default quota settings, overridable through environment variables
+DEFAULT_REQUESTS_PER_MINUTE = 60
+DEFAULT_TOKENS_PER_MINUTE = 1_000_000
+DEFAULT_POOL_SIZE = 8
+DEFAULT_MAX_RETRIES = 4
+
+# Output budget assumed for a call until the real usage is known
+DEFAULT_OUTPUT_TOKENS = 1024
+
+# Errors worth retrying: quota, overload and transient server failures
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+RETRYABLE_ERROR_NAMES = {
+    "ResourceExhausted",
+    "TooManyRequests",
+    "ServiceUnavailable",
+    "DeadlineExceeded",
+    "InternalServerError",
+    "GatewayTimeout",
+    "Aborted",
+}
+
+
+def estimate_tokens(prompt, output_tokens=DEFAULT_OUTPUT_TOKENS):
+    """Roughly estimate the tokens a call will use (about four characters per token)."""
+    return len(prompt) // 4 + output_tokens
+
+
+def is_retryable(error):
+    """Check whether an error is a transient failure that should be retried."""
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    if type(error).__name__ in RETRYABLE_ERROR_NAMES:
+        return True
+    return getattr(error, "code", None) in RETRYABLE_STATUS_CODES
+
+
+def backoff_delay(attempt, base_delay=1.0, max_delay=30.0):
+    """Return a jittered exponential backoff delay for the given retry attempt."""
+    return random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at a per-minute rate."""
+
+    def __init__(self, rate_per_minute, capacity=None):
+        """Create a full bucket. A rate of 0 or less disables the limit."""
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+
+    def _refill(self):
+        """Add the tokens accrued since the last update."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, amount=1):
+        """Block until the amount can be taken from the bucket; return the seconds waited."""
+        if self.rate <= 0:
+            return 0.0
+
+        # Requests larger than the bucket would never fit, so cap them
+        amount = min(amount, self.capacity)
+        started = time.monotonic()
+        with self._cond:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return time.monotonic() - started
+                self._cond.wait((amount - self.tokens) / self.rate)
+
+    def consume(self, amount):
+        """Take tokens without waiting; the balance may go negative to record debt."""
+        if self.rate <= 0:
+            return
+        with self._cond:
+            self._refill()
+            self.tokens -= amount
+            if amount < 0:
+                self._cond.notify_all()
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute limits for model calls."""
+
+    def __init__(self, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE, tokens_per_minute=DEFAULT_TOKENS_PER_MINUTE):
+        """Create buckets for both quotas."""
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+
+    def acquire(self, tokens):
+        """Block until one request and the estimated tokens fit in the quota."""
+        return self.requests.acquire(1) + self.tokens.acquire(tokens)
+
+    def settle(self, estimated, actual):
+        """Correct the token bucket once the real token usage of a call is known."""
+        self.tokens.consume(actual - estimated)
+
+
+class ClientPool:
+    """Bounded pool of reusable model clients."""
+
+    def __init__(self, factory, size=DEFAULT_POOL_SIZE):
+        """Create a pool that builds up to size clients lazily with factory()."""
+        self.factory = factory
+        self.size = size
+        self.created = 0
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def client(self):
+        """Borrow a client for the duration of a with block."""
+        client = self.checkout()
+        try:
+            yield client
+        finally:
+            self.release(client)
+
+    def checkout(self):
+        """Take an idle client, create a new one, or wait for one to be returned."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            create = self.created < self.size
+            if create:
+                self.created += 1
+
+        if create:
+            try:
+                return self.factory()
+            except BaseException:
+                with self._lock:
+                    self.created -= 1
+                raise
+        return self._idle.get()
+
+    def release(self, client):
+        """Return a borrowed client to the pool."""
+        self._idle.put(client)
+
+
+class ModelGovernor:
+    """Run model calls through the rate limiter, the client pool and retries."""
+
+    def __init__(self, client_factory, pool_size=DEFAULT_POOL_SIZE,
+                 requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE,
+                 tokens_per_minute=DEFAULT_TOKENS_PER_MINUTE,
+                 max_retries=DEFAULT_MAX_RETRIES):
+        """Create the limiter and pool used for every call."""
+        self.limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+        self.pool = ClientPool(client_factory, pool_size)
+        self.max_retries = max_retries
+        self.queue_depth = 0
+        self.peak_queue_depth = 0
+        self.calls = 0
+        self.retries = 0
+        self.throttled_seconds = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, client_factory):
+        """Create a governor configured from environment variables."""
+        return cls(
+            client_factory,
+            pool_size=int(os.getenv("GEMINI_POOL_SIZE", DEFAULT_POOL_SIZE)),
+            requests_per_minute=float(os.getenv("GEMINI_REQUESTS_PER_MINUTE", DEFAULT_REQUESTS_PER_MINUTE)),
+            tokens_per_minute=float(os.getenv("GEMINI_TOKENS_PER_MINUTE", DEFAULT_TOKENS_PER_MINUTE)),
+            max_retries=int(os.getenv("GEMINI_MAX_RETRIES", DEFAULT_MAX_RETRIES)),
+        )
+
+    def _checkout(self, tokens):
+        """Wait for quota and a free client, counting the caller as queued meanwhile."""
+        with self._lock:
+            self.queue_depth += 1
+            self.peak_queue_depth = max(self.peak_queue_depth, self.queue_depth)
+        try:
+            waited = self.limiter.acquire(tokens)
+            client = self.pool.checkout()
+        finally:
+            with self._lock:
+                self.queue_depth -= 1
+
+        with self._lock:
+            self.calls += 1
+            self.throttled_seconds += waited
+        return client
+
+    def _with_retries(self, attempt, on_retry=None):
+        """Call attempt() until it succeeds, retrying transient errors with backoff.
+
+        on_retry, if given, is called with each error that is retried.
+        """
+        retry = 0
+        while True:
+            try:
+                return attempt()
+            except Exception as e:
+                if retry >= self.max_retries or not is_retryable(e):
+                    raise
+                with self._lock:
+                    self.retries += 1
+                if on_retry is not None:
+                    on_retry(e)
+                delay = backoff_delay(retry)
+                print(f"Retrying model call after error ({e}); waiting {delay:.1f}s")
+                time.sleep(delay)
+                retry += 1
+
+    def call(self, fn, tokens=0, on_retry=None):
+        """Run fn(client) under the quota and return its result."""
+        def attempt():
+            client = self._checkout(tokens)
+            try:
+                return fn(client)
+            finally:
+                self.pool.release(client)
+
+        return self._with_retries(attempt, on_retry)
+
+    def stream(self, fn, tokens=0, on_retry=None):
+        """Run fn(client) under the quota and yield from the iterable it returns.
+
+        The client stays checked out until the stream is exhausted; only
+        starting the stream is retried.
+        """
+        def start():
+            client = self._checkout(tokens)
+            try:
+                return client, fn(client)
+            except BaseException:
+                self.pool.release(client)
+                raise
+
+        client, response = self._with_retries(start, on_retry)
+        try:
+            yield from response
+        finally:
+            self.pool.release(client)
+
+    def stats(self):
+        """Return queue-depth, retry and throttling counters."""
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "retries": self.retries,
+                "queue_depth": self.queue_depth,
+                "peak_queue_depth": self.peak_queue_depth,
+                "throttled_seconds": round(self.throttled_seconds, 3),
+                "clients": self.pool.created,
+            }
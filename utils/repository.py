@@ -0,0 +1,325 @@
+"""
+Saved-projects repository.
+This module stores the projects users save, in MongoDB when MONGODB_URI is set
+and in a local SQLite database otherwise, with one record per user and title.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+
+# Default settings, overridable through environment variables
+DEFAULT_SQLITE_PATH = os.path.join("data", "saved_projects.sqlite3")
+DEFAULT_MONGODB_DATABASE = "project_generator"
+DEFAULT_MONGODB_COLLECTION = "saved_projects"
+DEFAULT_PAGE_SIZE = 10
+DEFAULT_BATCH_SIZE = 500
+
+# Fields stored for every saved project, besides the owning user
+PROJECT_FIELDS = ("title", "job_title", "tools", "industry", "details", "date_saved")
+
+# Fields of the lightweight records used to list projects
+SUMMARY_FIELDS = ("title", "job_title", "tools", "industry", "date_saved")
+
+
+def _chunks(items, size):
+    """Split an iterable into lists of at most size items."""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class ProjectRepository:
+    """Interface of the saved-projects stores.
+
+    Projects are dicts with the PROJECT_FIELDS and are unique per user and title.
+    Pages are read with opaque cursors: pass the cursor returned with one page
+    to get the next.
+    """
+
+    def save(self, user, project):
+        """Store a project; return False if the user already saved one with this title."""
+        return self.save_many(user, [project]) == 1
+
+    def save_many(self, user, projects, batch_size=DEFAULT_BATCH_SIZE):
+        """Store projects in batches, skipping titles already saved; return how many were added."""
+        raise NotImplementedError
+
+    def exists(self, user, title):
+        """Check whether the user saved a project with this title."""
+        raise NotImplementedError
+
+    def get(self, user, title):
+        """Return the full saved project, or None."""
+        raise NotImplementedError
+
+    def delete(self, user, title):
+        """Delete a saved project; return whether it existed."""
+        raise NotImplementedError
+
+    def count(self, user):
+        """Return the number of projects the user saved."""
+        raise NotImplementedError
+
+    def page(self, user, cursor=None, limit=DEFAULT_PAGE_SIZE, details=False):
+        """Return (projects, next_cursor) for the page after cursor, oldest first.
+
+        Projects are summary records unless details is True; next_cursor is
+        None on the last page.
+        """
+        raise NotImplementedError
+
+    def touch(self, user, now=None):
+        """Record that the user was active now."""
+        raise NotImplementedError
+
+    def delete_inactive(self, prefix, before):
+        """Delete every project of users whose id starts with prefix and who were not active since before.
+
+        before is a Unix timestamp; users never recorded by touch() count as
+        inactive. Returns the number of projects deleted.
+        """
+        raise NotImplementedError
+
+    def iter_all(self, user, details=True, batch_size=DEFAULT_BATCH_SIZE):
+        """Yield every project the user saved, reading one page at a time."""
+        cursor = None
+        while True:
+            projects, cursor = self.page(user, cursor, batch_size, details)
+            yield from projects
+            if cursor is None:
+                return
+
+
+class SQLiteProjectRepository(ProjectRepository):
+    """Saved projects in a local SQLite database."""
+
+    name = "sqlite"
+
+    def __init__(self, path=DEFAULT_SQLITE_PATH):
+        """Open (or create) the database at the given path."""
+        self.path = path
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+        # One connection shared by all Streamlit script threads
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS saved_projects (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    job_title TEXT NOT NULL DEFAULT '',
+                    tools TEXT NOT NULL DEFAULT '',
+                    industry TEXT NOT NULL DEFAULT '',
+                    details TEXT NOT NULL DEFAULT '',
+                    date_saved TEXT NOT NULL DEFAULT ''
+                )"""
+            )
+            self._conn.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_saved_projects_user_title ON saved_projects (user, title)"
+            )
+            # When each user was last active, so abandoned anonymous libraries can expire
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS owners (user TEXT PRIMARY KEY, last_seen REAL NOT NULL)"
+            )
+            self._conn.commit()
+
+    def save_many(self, user, projects, batch_size=DEFAULT_BATCH_SIZE):
+        added = 0
+        for chunk in _chunks(projects, batch_size):
+            rows = [(user, *(str(project.get(field) or "") for field in PROJECT_FIELDS)) for project in chunk]
+            with self._lock:
+                before = self._conn.total_changes
+                self._conn.executemany(
+                    f"""INSERT OR IGNORE INTO saved_projects (user, {", ".join(PROJECT_FIELDS)})
+                    VALUES (?, {", ".join("?" for _ in PROJECT_FIELDS)})""",
+                    rows,
+                )
+                self._conn.commit()
+                added += self._conn.total_changes - before
+        return added
+
+    def exists(self, user, title):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM saved_projects WHERE user = ? AND title = ?", (user, title)
+            ).fetchone()
+        return row is not None
+
+    def get(self, user, title):
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(PROJECT_FIELDS)} FROM saved_projects WHERE user = ? AND title = ?",
+                (user, title),
+            ).fetchone()
+        return dict(row) if row else None
+
+    def delete(self, user, title):
+        with self._lock:
+            deleted = self._conn.execute(
+                "DELETE FROM saved_projects WHERE user = ? AND title = ?", (user, title)
+            ).rowcount
+            self._conn.commit()
+        return deleted > 0
+
+    def count(self, user):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM saved_projects WHERE user = ?", (user,)).fetchone()[0]
+
+    def page(self, user, cursor=None, limit=DEFAULT_PAGE_SIZE, details=False):
+        fields = PROJECT_FIELDS if details else SUMMARY_FIELDS
+        after = int(cursor) if cursor else 0
+        with self._lock:
+            # Fetch one extra row to know whether another page follows
+            rows = self._conn.execute(
+                f"""SELECT id, {", ".join(fields)} FROM saved_projects
+                WHERE user = ? AND id > ? ORDER BY id LIMIT ?""",
+                (user, after, limit + 1),
+            ).fetchall()
+        next_cursor = str(rows[limit - 1]["id"]) if len(rows) > limit else None
+        return [{field: row[field] for field in fields} for row in rows[:limit]], next_cursor
+
+    def touch(self, user, now=None):
+        with self._lock:
+            self._conn.execute(
+                """INSERT INTO owners (user, last_seen) VALUES (?, ?)
+                ON CONFLICT (user) DO UPDATE SET last_seen = excluded.last_seen""",
+                (user, time.time() if now is None else now),
+            )
+            self._conn.commit()
+
+    def delete_inactive(self, prefix, before):
+        pattern = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        with self._lock:
+            deleted = self._conn.execute(
+                """DELETE FROM saved_projects WHERE user LIKE ? ESCAPE '\\'
+                AND user NOT IN (SELECT user FROM owners WHERE last_seen >= ?)""",
+                (pattern, before),
+            ).rowcount
+            self._conn.execute(
+                "DELETE FROM owners WHERE user LIKE ? ESCAPE '\\' AND last_seen < ?", (pattern, before)
+            )
+            self._conn.commit()
+        return deleted
+
+
+class MongoProjectRepository(ProjectRepository):
+    """Saved projects in a MongoDB collection."""
+
+    name = "mongodb"
+
+    def __init__(self, collection, owners=None):
+        """Use the given pymongo (or mongomock) collections and make sure their indexes exist.
+
+        owners records when each user was last active; it defaults to the
+        "<collection>_owners" collection next to the projects.
+        """
+        self.collection = collection
+        self.owners = owners if owners is not None else collection.database[f"{collection.name}_owners"]
+        collection.create_index([("user", 1), ("title", 1)], unique=True, name="user_title")
+        collection.create_index([("user", 1), ("_id", 1)], name="user_id")
+
+    @classmethod
+    def from_uri(cls, uri, database=DEFAULT_MONGODB_DATABASE, collection=DEFAULT_MONGODB_COLLECTION):
+        """Connect to MongoDB; a mongomock:// URI uses an in-process mongomock server."""
+        if uri.startswith("mongomock://"):
+            import mongomock
+            client = mongomock.MongoClient()
+        else:
+            import pymongo
+            client = pymongo.MongoClient(uri, serverSelectionTimeoutMS=3000)
+            # Fail now rather than on the first save if the server is unreachable
+            client.admin.command("ping")
+        return cls(client[database][collection])
+
+    def save_many(self, user, projects, batch_size=DEFAULT_BATCH_SIZE):
+        from pymongo.errors import BulkWriteError
+
+        added = 0
+        for chunk in _chunks(projects, batch_size):
+            documents = [{"user": user, **{field: str(project.get(field) or "") for field in PROJECT_FIELDS}}
+                         for project in chunk]
+            try:
+                # Unordered so one duplicate title does not stop the rest of the batch
+                added += len(self.collection.insert_many(documents, ordered=False).inserted_ids)
+            except BulkWriteError as e:
+                added += e.details.get("nInserted", 0)
+                if any(error.get("code") != 11000 for error in e.details.get("writeErrors", [])):
+                    raise
+        return added
+
+    def exists(self, user, title):
+        return self.collection.count_documents({"user": user, "title": title}, limit=1) > 0
+
+    def get(self, user, title):
+        projection = {field: 1 for field in PROJECT_FIELDS}
+        projection["_id"] = 0
+        return self.collection.find_one({"user": user, "title": title}, projection)
+
+    def delete(self, user, title):
+        return self.collection.delete_one({"user": user, "title": title}).deleted_count > 0
+
+    def count(self, user):
+        return self.collection.count_documents({"user": user})
+
+    def page(self, user, cursor=None, limit=DEFAULT_PAGE_SIZE, details=False):
+        from bson import ObjectId
+
+        fields = PROJECT_FIELDS if details else SUMMARY_FIELDS
+        query = {"user": user}
+        if cursor:
+            query["_id"] = {"$gt": ObjectId(cursor)}
+        # Fetch one extra document to know whether another page follows
+        documents = list(
+            self.collection.find(query, {field: 1 for field in fields}).sort("_id", 1).limit(limit + 1)
+        )
+        next_cursor = str(documents[limit - 1]["_id"]) if len(documents) > limit else None
+        return [{field: document.get(field, "") for field in fields} for document in documents[:limit]], next_cursor
+
+    def touch(self, user, now=None):
+        self.owners.update_one({"_id": user}, {"$set": {"last_seen": time.time() if now is None else now}},
+                               upsert=True)
+
+    def delete_inactive(self, prefix, before):
+        pattern = {"$regex": f"^{re.escape(prefix)}"}
+        active = {document["_id"] for document in
+                  self.owners.find({"_id": pattern, "last_seen": {"$gte": before}}, {"_id": 1})}
+        stale = [user for user in self.collection.distinct("user", {"user": pattern}) if user not in active]
+        deleted = 0
+        for chunk in _chunks(stale, DEFAULT_BATCH_SIZE):
+            deleted += self.collection.delete_many({"user": {"$in": chunk}}).deleted_count
+        self.owners.delete_many({"_id": pattern, "last_seen": {"$lt": before}})
+        return deleted
+
+
+def create_repository():
+    """Create the saved-projects repository configured by environment variables.
+
+    Uses MongoDB when MONGODB_URI is set and reachable, and the SQLite
+    database at SAVED_PROJECTS_PATH otherwise.
+    """
+    uri = os.getenv("MONGODB_URI")
+    if uri:
+        try:
+            return MongoProjectRepository.from_uri(
+                uri,
+                database=os.getenv("MONGODB_DATABASE", DEFAULT_MONGODB_DATABASE),
+                collection=os.getenv("MONGODB_COLLECTION", DEFAULT_MONGODB_COLLECTION),
+            )
+        except Exception as e:
+            print(f"Could not connect to MongoDB ({e}); saving projects to SQLite instead")
+    return SQLiteProjectRepository(os.getenv("SAVED_PROJECTS_PATH", DEFAULT_SQLITE_PATH))
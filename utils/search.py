@@ -0,0 +1,184 @@
+"""
+Full-text search over project ideas.
+This module keeps an incrementally updated inverted index and ranks matches with
+BM25, returning the top results with highlighted snippets.
+"""
+
+import heapq
+import math
+import re
+import threading
+
+# Default settings
+DEFAULT_TOP_K = 10
+DEFAULT_SNIPPET_WORDS = 30
+
+# How much a match in each field counts, relative to the body text
+DEFAULT_FIELD_WEIGHTS = {"title": 3.0, "tools": 2.0, "description": 1.5, "details": 1.0}
+
+# Fields searched for a snippet, in order of preference
+SNIPPET_FIELDS = ("details", "description", "title", "tools")
+
+# Suffixes removed so "detect", "detection" and "detecting" match each other
+SUFFIXES = ("ations", "ation", "ings", "ing", "ions", "ion", "ers", "er", "ies", "ied", "ed", "es", "s")
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[+#]+|(?:[-.][a-z0-9]+)+)?")
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from how in into is it of on or that the this to with your you".split()
+)
+
+
+def stem(token):
+    """Strip a common English suffix from a term, keeping at least three letters."""
+    if not token.isalpha():
+        return token
+    for suffix in SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            return token[:-len(suffix)]
+    return token
+
+
+def tokenize(text):
+    """Split text into lower-case, stemmed search terms, without stopwords."""
+    return [stem(token) for token in TOKEN_PATTERN.findall(str(text or "").lower()) if token not in STOPWORDS]
+
+
+class SearchResult:
+    """One ranked search match."""
+
+    def __init__(self, doc_id, score, snippet):
+        """Store the document id, its BM25 score and a highlighted snippet."""
+        self.doc_id = doc_id
+        self.score = score
+        self.snippet = snippet
+
+    def __repr__(self):
+        return f"SearchResult(doc_id={self.doc_id!r}, score={self.score:.3f})"
+
+
+class SearchIndex:
+    """Thread-safe inverted index with BM25 ranking over weighted fields."""
+
+    def __init__(self, field_weights=None, k1=1.2, b=0.75):
+        """Create an empty index."""
+        self.field_weights = dict(field_weights or DEFAULT_FIELD_WEIGHTS)
+        self.k1 = k1
+        self.b = b
+        # term -> {doc_id: weighted term frequency}
+        self.postings = {}
+        # doc_id -> (weighted term frequencies, weighted length, fields)
+        self.documents = {}
+        self.total_length = 0.0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.documents)
+
+    def __contains__(self, doc_id):
+        return doc_id in self.documents
+
+    def add(self, doc_id, fields):
+        """Index a document's fields, replacing any earlier version of it."""
+        frequencies = {}
+        length = 0.0
+        for field, weight in self.field_weights.items():
+            terms = tokenize(fields.get(field))
+            length += weight * len(terms)
+            for term in terms:
+                frequencies[term] = frequencies.get(term, 0.0) + weight
+
+        stored = {field: str(fields.get(field) or "") for field in self.field_weights}
+        with self._lock:
+            self._remove(doc_id)
+            self.documents[doc_id] = (frequencies, length, stored)
+            self.total_length += length
+            for term, frequency in frequencies.items():
+                self.postings.setdefault(term, {})[doc_id] = frequency
+
+    def remove(self, doc_id):
+        """Drop a document from the index; unknown ids are ignored."""
+        with self._lock:
+            self._remove(doc_id)
+
+    def _remove(self, doc_id):
+        """Drop a document; the caller holds the lock."""
+        document = self.documents.pop(doc_id, None)
+        if document is None:
+            return
+        frequencies, length, _ = document
+        self.total_length -= length
+        for term in frequencies:
+            postings = self.postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self.postings[term]
+
+    def search(self, query, k=DEFAULT_TOP_K, allowed=None):
+        """Return the top k SearchResults for a query.
+
+        allowed, if given, is a set of doc ids the results are restricted to.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+
+        with self._lock:
+            count = len(self.documents)
+            if not count:
+                return []
+            average_length = self.total_length / count or 1.0
+            scores = {}
+            for term in terms:
+                postings = self.postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, frequency in postings.items():
+                    if allowed is not None and doc_id not in allowed:
+                        continue
+                    length = self.documents[doc_id][1]
+                    norm = self.k1 * (1 - self.b + self.b * length / average_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+
+            top = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+            fields = {doc_id: self.documents[doc_id][2] for doc_id, _ in top}
+
+        return [SearchResult(doc_id, score, snippet(fields[doc_id], terms)) for doc_id, score in top]
+
+
+def snippet(fields, terms, words=DEFAULT_SNIPPET_WORDS):
+    """Return the window of a document's text with the most query terms, with matches in bold."""
+    wanted = set(terms)
+    for field in SNIPPET_FIELDS:
+        text = fields.get(field) or ""
+        # Keep words and their positions so the snippet preserves the original spelling
+        spans = [match for match in re.finditer(r"\S+", text)]
+        hits = [i for i, match in enumerate(spans) if set(tokenize(match.group())) & wanted]
+        if not hits:
+            continue
+
+        # Slide a window over the hits and keep the one covering the most of them
+        best_start, best_count = hits[0], 0
+        right = 0
+        for left in range(len(hits)):
+            while right < len(hits) and hits[right] < hits[left] + words:
+                right += 1
+            if right - left > best_count:
+                best_start, best_count = hits[left], right - left
+        start = max(0, best_start - words // 4)
+        end = min(len(spans), start + words)
+
+        hit_set = set(hits)
+        parts = []
+        for i in range(start, end):
+            word = spans[i].group().strip("*#_`")
+            parts.append(f"**{word}**" if i in hit_set and word else word)
+        prefix = "… " if start > 0 else ""
+        suffix = " …" if end < len(spans) else ""
+        return prefix + " ".join(part for part in parts if part) + suffix
+
+    # Nothing to highlight, so start from the beginning of the description
+    text = fields.get("description") or fields.get("details") or ""
+    spans = text.split()
+    return " ".join(spans[:words]) + (" …" if len(spans) > words else "")
@@ -0,0 +1,98 @@
+"""
+Request coalescing for AI generations.
+This module lets concurrent identical requests share a single call to the model.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+
+
+class Abandoned(Exception):
+    """The leader of a call gave up before finishing; callers that joined it should try again."""
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key so only one of them does the work."""
+
+    def __init__(self):
+        """Initialize an empty table of in-flight calls."""
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.leaders = 0
+        self.shared = 0
+
+    def begin(self, key):
+        """Join the call in flight for a key, or start a new one.
+
+        Returns a (future, leader) tuple. The leader must call finish() once
+        the work is done; everyone else waits on the future.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.shared += 1
+                return future, False
+
+            future = Future()
+            self._calls[key] = future
+            self.leaders += 1
+            return future, True
+
+    def finish(self, key, future, result=None, error=None):
+        """Publish the leader's result (or error) to every waiting caller."""
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key, fn):
+        """Run fn once for all concurrent callers with the same key and return its result."""
+        future, leader = self.begin(key)
+        while not leader:
+            try:
+                return future.result()
+            except Abandoned:
+                # Take over as the leader, or join whoever did
+                future, leader = self.begin(key)
+
+        try:
+            result = fn()
+        except BaseException as e:
+            self.finish(key, future, error=e)
+            raise
+        self.finish(key, future, result=result)
+        return result
+
+    async def do_async(self, key, fn, executor=None):
+        """Async counterpart of do() that never blocks the event loop.
+
+        fn may be a coroutine function or a plain callable, which then runs
+        in the given executor.
+        """
+        future, leader = self.begin(key)
+        while not leader:
+            try:
+                return await asyncio.wrap_future(future)
+            except Abandoned:
+                future, leader = self.begin(key)
+
+        try:
+            if asyncio.iscoroutinefunction(fn):
+                result = await fn()
+            else:
+                result = await asyncio.get_running_loop().run_in_executor(executor, fn)
+        except BaseException as e:
+            self.finish(key, future, error=e)
+            raise
+        self.finish(key, future, result=result)
+        return result
+
+    def stats(self):
+        """Return how many calls ran and how many callers shared another call."""
+        with self._lock:
+            in_flight = len(self._calls)
+        return {"leaders": self.leaders, "shared": self.shared, "in_flight": in_flight}
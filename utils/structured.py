@@ -0,0 +1,336 @@
+"""
+Structured JSON output for AI generations.
+This module holds the response schemas for timelines, skills graphs and mind maps,
+and validates and repairs the JSON the model returns for them.
+"""
+
+import ast
+import datetime
+import json
+import re
+
+# Generation options asking the model for JSON that follows a schema
+JSON_MIME_TYPE = "application/json"
+
+# Date formats accepted when repairing timeline dates
+DATE_FORMATS = ("%Y-%m-%d", "%Y/%m/%d", "%Y.%m.%d", "%d-%m-%Y", "%m/%d/%Y", "%B %d, %Y", "%b %d, %Y", "%Y-%m")
+
+_STRING = {"type": "STRING"}
+_STRING_LIST = {"type": "ARRAY", "items": _STRING}
+
+TIMELINE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "phases": _STRING_LIST,
+        "start_dates": _STRING_LIST,
+        "end_dates": _STRING_LIST,
+        "descriptions": _STRING_LIST,
+        "milestones": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {"name": _STRING, "date": _STRING},
+                "required": ["name", "date"],
+            },
+        },
+        "dependencies": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {"from": _STRING, "to": _STRING},
+                "required": ["from", "to"],
+            },
+        },
+    },
+    "required": ["phases", "start_dates", "end_dates", "descriptions"],
+}
+
+SKILLS_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "nodes": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {"id": _STRING, "group": {"type": "INTEGER"}},
+                "required": ["id", "group"],
+            },
+        },
+        "links": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {"source": _STRING, "target": _STRING, "value": {"type": "INTEGER"}},
+                "required": ["source", "target", "value"],
+            },
+        },
+    },
+    "required": ["nodes", "links"],
+}
+
+MIND_MAP_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "center": _STRING,
+        "main_branches": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {"name": _STRING, "sub_branches": _STRING_LIST},
+                "required": ["name", "sub_branches"],
+            },
+        },
+    },
+    "required": ["center", "main_branches"],
+}
+
+BUNDLE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "details": _STRING,
+        "timeline": TIMELINE_SCHEMA,
+        "skills": SKILLS_SCHEMA,
+        "mind_map": MIND_MAP_SCHEMA,
+    },
+    "required": ["details", "timeline", "skills", "mind_map"],
+}
+
+
+class StructuredOutputError(ValueError):
+    """Raised when a model response cannot be turned into valid structured data."""
+
+    def __init__(self, kind, broken, message=None):
+        """Record which kind of output failed and which fields were broken."""
+        self.kind = kind
+        self.broken = list(broken)
+        super().__init__(message or f"Invalid {kind} output: broken fields {', '.join(self.broken)}")
+
+
+def repair_json_text(text):
+    """Parse JSON from a model response, fixing common defects locally.
+
+    Handles code fences, text around the object, smart quotes, trailing commas,
+    raw newlines inside strings and Python-style literals. Returns the parsed
+    object or raises ValueError.
+    """
+    text = text.strip()
+    # Remove any markdown code block indicators
+    text = re.sub(r"^```[a-zA-Z]*\s*", "", text)
+    text = re.sub(r"\s*```$", "", text)
+
+    # Keep only the outermost JSON object
+    start, end = text.find("{"), text.rfind("}")
+    if start != -1 and end > start:
+        text = text[start:end + 1]
+
+    candidates = [text]
+    fixed = text.replace("“", '"').replace("”", '"').replace("‘", "'").replace("’", "'")
+    fixed = re.sub(r",\s*([}\]])", r"\1", fixed)
+    candidates.append(fixed)
+
+    for candidate in candidates:
+        try:
+            return json.loads(candidate, strict=False)
+        except json.JSONDecodeError:
+            pass
+
+    # Single-quoted keys and values are valid Python literals
+    try:
+        literal = re.sub(r"\btrue\b", "True", fixed)
+        literal = re.sub(r"\bfalse\b", "False", literal)
+        literal = re.sub(r"\bnull\b", "None", literal)
+        return ast.literal_eval(literal)
+    except (ValueError, SyntaxError) as e:
+        raise ValueError(f"Could not repair JSON: {e}") from None
+
+
+def _string_list(value):
+    """Coerce a value into a list of stripped strings, or None if it is not a list."""
+    if not isinstance(value, list):
+        return None
+    return [str(item).strip() for item in value if item is not None and str(item).strip()]
+
+
+def _parse_date(value):
+    """Parse a date written in any of the accepted formats."""
+    value = str(value).strip()
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(value, date_format).date()
+        except ValueError:
+            pass
+    return None
+
+
+def validate_timeline(data, context=None):
+    """Validate and repair timeline data; return (data, broken_fields)."""
+    broken = []
+    phases = _string_list(data.get("phases"))
+    if not phases:
+        return data, ["phases", "start_dates", "end_dates", "descriptions"]
+
+    starts = [_parse_date(value) for value in data.get("start_dates") or []]
+    ends = [_parse_date(value) for value in data.get("end_dates") or []]
+    if len(starts) < len(phases) or None in starts[:len(phases)]:
+        broken.append("start_dates")
+    if len(ends) < len(phases) or None in ends[:len(phases)]:
+        broken.append("end_dates")
+
+    # Pad or trim descriptions rather than asking again for them
+    descriptions = _string_list(data.get("descriptions")) or []
+    descriptions = (descriptions + [""] * len(phases))[:len(phases)]
+
+    if broken:
+        return {
+            "phases": phases,
+            "start_dates": data.get("start_dates"),
+            "end_dates": data.get("end_dates"),
+            "descriptions": descriptions,
+        }, broken
+
+    # Normalize the dates and swap any phase that ends before it starts
+    start_dates, end_dates = [], []
+    for start, end in zip(starts[:len(phases)], ends[:len(phases)]):
+        start, end = min(start, end), max(start, end)
+        start_dates.append(start.isoformat())
+        end_dates.append(end.isoformat())
+    timeline = {
+        "phases": phases,
+        "start_dates": start_dates,
+        "end_dates": end_dates,
+        "descriptions": descriptions,
+    }
+
+    # Milestones and dependencies are optional; keep only the usable ones
+    milestones = []
+    for milestone in data.get("milestones") or []:
+        if isinstance(milestone, dict) and str(milestone.get("name", "")).strip():
+            date = _parse_date(milestone.get("date", ""))
+            if date is not None:
+                milestones.append({"name": str(milestone["name"]).strip(), "date": date.isoformat()})
+    if milestones:
+        timeline["milestones"] = milestones
+
+    known = set(phases)
+    dependencies = [
+        {"from": str(dependency["from"]).strip(), "to": str(dependency["to"]).strip()}
+        for dependency in data.get("dependencies") or []
+        if isinstance(dependency, dict)
+        and str(dependency.get("from", "")).strip() in known and str(dependency.get("to", "")).strip() in known
+    ]
+    if dependencies:
+        timeline["dependencies"] = dependencies
+    return timeline, []
+
+
+def validate_skills(data, context=None):
+    """Validate and repair skills graph data; return (data, broken_fields)."""
+    nodes = []
+    seen = set()
+    for node in data.get("nodes") or []:
+        if isinstance(node, str):
+            node = {"id": node}
+        if not isinstance(node, dict) or not str(node.get("id", "")).strip():
+            continue
+        node_id = str(node["id"]).strip()
+        if node_id in seen:
+            continue
+        seen.add(node_id)
+        try:
+            group = int(node.get("group", 1))
+        except (TypeError, ValueError):
+            group = 1
+        nodes.append({"id": node_id, "group": group})
+
+    if not nodes:
+        return data, ["nodes", "links"]
+
+    links = []
+    for link in data.get("links") or []:
+        if not isinstance(link, dict):
+            continue
+        source, target = str(link.get("source", "")).strip(), str(link.get("target", "")).strip()
+        # Links must join two known, different skills
+        if source not in seen or target not in seen or source == target:
+            continue
+        try:
+            value = int(link.get("value", 1))
+        except (TypeError, ValueError):
+            value = 1
+        links.append({"source": source, "target": target, "value": max(1, value)})
+
+    repaired = {"nodes": nodes, "links": links}
+    if not links and len(nodes) > 1:
+        return repaired, ["links"]
+    return repaired, []
+
+
+def validate_mind_map(data, context=None):
+    """Validate and repair mind map data; return (data, broken_fields)."""
+    center = str(data.get("center") or "").strip() or (context or {}).get("project_title", "")
+    branches = []
+    for branch in data.get("main_branches") or []:
+        if not isinstance(branch, dict) or not str(branch.get("name", "")).strip():
+            continue
+        sub_branches = _string_list(branch.get("sub_branches")) or []
+        branches.append({"name": str(branch["name"]).strip(), "sub_branches": sub_branches})
+
+    repaired = {"center": center, "main_branches": branches}
+    broken = []
+    if not center:
+        broken.append("center")
+    if not branches:
+        broken.append("main_branches")
+    return repaired, broken
+
+
+class StructuredSpec:
+    """Schema, validator and description for one kind of structured output."""
+
+    def __init__(self, kind, schema, validator, description):
+        """Bundle everything needed to request and check one kind of output."""
+        self.kind = kind
+        self.schema = schema
+        self.validator = validator
+        self.description = description
+
+    def generation_config(self, fields=None):
+        """Return generation options that ask for JSON, optionally only for some fields."""
+        schema = self.schema
+        if fields:
+            schema = {
+                "type": "OBJECT",
+                "properties": {field: self.schema["properties"][field] for field in fields},
+                "required": list(fields),
+            }
+        return {"response_mime_type": JSON_MIME_TYPE, "response_schema": schema}
+
+    def parse(self, text, context=None):
+        """Parse, repair and validate a response; return (data, broken_fields)."""
+        try:
+            data = repair_json_text(text)
+        except ValueError:
+            return {}, list(self.schema["required"])
+        if not isinstance(data, dict):
+            return {}, list(self.schema["required"])
+        return self.validator(data, context)
+
+    def repair_prompt(self, data, broken):
+        """Build a prompt that asks the model again for only the broken fields."""
+        return f"""The following JSON describes {self.description}, but these fields are
+        missing or invalid: {", ".join(broken)}.
+
+        {json.dumps(data, ensure_ascii=False)}
+
+        Return ONLY a JSON object with corrected values for {", ".join(broken)},
+        consistent with the rest of the data above.
+        List fields must have one entry per phase, skill or branch they describe.
+        Dates must be in YYYY-MM-DD format.
+        """
+
+
+STRUCTURED_SPECS = {
+    "timeline": StructuredSpec("timeline", TIMELINE_SCHEMA, validate_timeline, "a project timeline"),
+    "skills": StructuredSpec("skills", SKILLS_SCHEMA, validate_skills, "a network of project skills"),
+    "mind_map": StructuredSpec("mind_map", MIND_MAP_SCHEMA, validate_mind_map, "a project mind map"),
+}
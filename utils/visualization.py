@@ -1,20 +1,37 @@
 """
 Visualization utilities for generating charts, graphs and mind maps.
+
+The plotting libraries are imported inside the functions that use them, so
+importing this module stays cheap until a chart is actually drawn.
 """
 
+import hashlib
+import io
 import json
-import pandas as pd
-import networkx as nx
-import matplotlib.pyplot as plt
-import plotly.express as px
-import plotly.graph_objects as go
-import plotly.figure_factory as ff
+import os
+import threading
+from collections import OrderedDict
+
 import streamlit as st
-import numpy as np
-from PIL import Image
-import base64
-import io
-from datetime import datetime
+
+from utils.layout import layout_engine
+
+# Default settings, overridable through environment variables
+DEFAULT_SKILLS_GRAPH_SIZE = (10, 8)
+DEFAULT_SKILLS_GRAPH_DPI = 200
+DEFAULT_RENDER_CACHE_ENTRIES = 64
+DEFAULT_RENDER_CACHE_BYTES = 32 * 1024 * 1024
+DEFAULT_INTERACTIVE_GRAPH_NODES = 150
+DEFAULT_TIMELINE_CACHE_ENTRIES = 64
+
+# Timeline settings
+TIMELINE_COLORSCALE = "Viridis"
+MAX_TIMELINE_HEIGHT = 6000
+
+# Interactive skills graph settings
+EDGE_WEIGHT_BUCKETS = 5
+MAX_EDGE_WIDTH = 8
+NODE_LABEL_LIMIT = 100
 
 def create_mind_map(mind_map_data):
     """Create a text-based mind map representation instead of visual blocks."""
@@ -55,8 +72,20 @@ def display_mind_map(mind_map_data):
         return True
     return None
 
-def create_skills_graph(skills_data):
-    """Create a force-directed graph for skills visualization."""
+def graph_layout(G, k=None):
+    """Return {node: (x, y)} for a networkx graph from the shared layout engine."""
+    return layout_engine.layout(list(G.nodes), [(u, v, d.get("weight", 1)) for u, v, d in G.edges(data=True)], k=k)
+
+def create_skills_graph(skills_data, width=DEFAULT_SKILLS_GRAPH_SIZE[0], height=DEFAULT_SKILLS_GRAPH_SIZE[1]):
+    """Create a force-directed graph for skills visualization.
+
+    Returns a matplotlib Figure that is not registered with pyplot, so sessions
+    never share drawing state; close it with close_figure once it is rendered.
+    """
+    from matplotlib import colormaps
+    from matplotlib.figure import Figure
+    import networkx as nx
+    
     try:
         # Parse the skills data
         data = json.loads(skills_data)
@@ -86,123 +115,211 @@ def create_skills_graph(skills_data):
             raise ValueError("No valid nodes found in the skills data")
             
         # Create a figure
-        plt.figure(figsize=(10, 8), facecolor='#f5f5f5')
+        fig = Figure(figsize=(width, height), facecolor='#f5f5f5')
+        ax = fig.add_subplot()
         
         # Define node colors based on group
+        set3 = colormaps["Set3"]
         node_colors = []
         for node in G.nodes:
             # Ensure the group attribute exists with default value 1
             if "group" not in G.nodes[node]:
                 G.nodes[node]["group"] = 1
-            node_colors.append(plt.cm.Set3(G.nodes[node]["group"] % 10 / 10))
+            node_colors.append(set3(G.nodes[node]["group"] % 10 / 10))
         
-        # Define layout
-        pos = nx.spring_layout(G, k=0.3, iterations=50, seed=42)
+        # Define layout, reusing the cached one for an unchanged graph
+        pos = graph_layout(G, k=0.3)
         
         # Draw the network
-        nx.draw_networkx_nodes(G, pos, node_color=node_colors, node_size=700, alpha=0.8)
-        nx.draw_networkx_labels(G, pos, font_size=10, font_weight="bold")
+        nx.draw_networkx_nodes(G, pos, node_color=node_colors, node_size=700, alpha=0.8, ax=ax)
+        nx.draw_networkx_labels(G, pos, font_size=10, font_weight="bold", ax=ax)
         
-        # Draw edges with varying width based on weight
-        for (u, v, d) in G.edges(data=True):
-            width = d.get('weight', 1) * 1.5
-            nx.draw_networkx_edges(G, pos, edgelist=[(u, v)], width=width, alpha=0.6)
+        # Draw all edges at once, with widths based on weight
+        edges = list(G.edges(data=True))
+        nx.draw_networkx_edges(G, pos, edgelist=[(u, v) for u, v, _ in edges],
+                               width=[d.get('weight', 1) * 1.5 for _, _, d in edges], alpha=0.6, ax=ax)
         
-        plt.axis('off')
-        plt.tight_layout()
+        ax.axis('off')
+        fig.tight_layout()
         
-        return plt
+        return fig
     except Exception as e:
         print(f"Error creating skills graph: {e}")
         
         # Create a simple error visualization
-        plt.figure(figsize=(8, 6))
-        plt.text(0.5, 0.5, f"Error creating skills graph:\n{e}", ha='center', va='center',
-                 fontsize=12, color='red')
-        plt.axis('off')
-        return plt
+        fig = Figure(figsize=(8, 6))
+        ax = fig.add_subplot()
+        ax.text(0.5, 0.5, f"Error creating skills graph:\n{e}", ha='center', va='center',
+                fontsize=12, color='red')
+        ax.axis('off')
+        return fig
+
+def close_figure(fig):
+    """Release a figure's artists and canvas once it has been rendered."""
+    fig.clear()
+
+class RenderCache:
+    """Thread-safe LRU cache of rendered images or figures, bounded by entry count and total bytes."""
+
+    def __init__(self, max_entries=DEFAULT_RENDER_CACHE_ENTRIES, max_bytes=DEFAULT_RENDER_CACHE_BYTES, sizeof=len):
+        """Create an empty cache; sizeof gives the size of a value in bytes."""
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.hits = 0
+        self.misses = 0
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Return the cached value for a key, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        """Store a value under a key, evicting the least recently used entries over the bounds."""
+        size = self.sizeof(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= old[1]
+            self._entries[key] = (value, size)
+            self.size += size
+            while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.size -= evicted_size
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self):
+        """Return entry count, size and hit counts."""
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self.size, "hits": self.hits, "misses": self.misses}
+
+# Rendered skills graphs shared by every session
+skills_graph_cache = RenderCache(
+    max_entries=int(os.getenv("RENDER_CACHE_ENTRIES", DEFAULT_RENDER_CACHE_ENTRIES)),
+    max_bytes=int(os.getenv("RENDER_CACHE_BYTES", DEFAULT_RENDER_CACHE_BYTES)),
+)
+
+def render_skills_graph(skills_data, image_format="png", width=DEFAULT_SKILLS_GRAPH_SIZE[0],
+                        height=DEFAULT_SKILLS_GRAPH_SIZE[1], dpi=DEFAULT_SKILLS_GRAPH_DPI):
+    """Render the skills graph to PNG or SVG bytes, reusing earlier renders of the same data and size."""
+    key = hashlib.sha256(json.dumps([skills_data, image_format, width, height, dpi]).encode("utf-8")).hexdigest()
+    image = skills_graph_cache.get(key)
+    if image is not None:
+        return image
+    
+    fig = create_skills_graph(skills_data, width, height)
+    try:
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format=image_format, dpi=dpi, bbox_inches="tight")
+        image = buffer.getvalue()
+    finally:
+        close_figure(fig)
+    skills_graph_cache.put(key, image)
+    return image
+
+def _skills_graph_elements(data):
+    """Return the node ids, groups and valid (source, target, weight) links of parsed skills data."""
+    nodes = {}
+    for node in data.get("nodes", []):
+        if "id" in node:
+            nodes.setdefault(node["id"], node.get("group", 1))
+    links = [(link["source"], link["target"], link.get("value", 1))
+             for link in data.get("links", [])
+             if link.get("source") in nodes and link.get("target") in nodes]
+    return list(nodes), list(nodes.values()), links
+
+def _edge_buckets(np, weights, buckets=EDGE_WEIGHT_BUCKETS):
+    """Group edges into at most a few weight buckets; return (bucket index per edge, width per bucket)."""
+    values = np.unique(weights)
+    if len(values) <= buckets:
+        return np.searchsorted(values, weights), values
+    # Too many distinct weights: split at quantiles and draw each bucket at its mean weight
+    edges = np.quantile(weights, np.linspace(0, 1, buckets + 1)[1:-1])
+    index = np.searchsorted(edges, weights, side="right")
+    return index, np.array([weights[index == i].mean() if (index == i).any() else 0.0 for i in range(buckets)])
 
 def create_interactive_skills_graph(skills_data):
-    """Create an interactive skills graph using Plotly."""
+    """Create an interactive WebGL skills graph using Plotly.
+
+    Edges are drawn as one trace per weight bucket, with coordinates built as
+    NumPy arrays, so large graphs stay smooth in the browser.
+    """
+    import numpy as np
+    import plotly.graph_objects as go
+    
     try:
         # Parse the skills data
         data = json.loads(skills_data)
+        node_ids, groups, links = _skills_graph_elements(data)
+        if not node_ids:
+            raise ValueError("No valid nodes found in the skills data")
         
-        # Extract nodes and links
-        nodes = data.get("nodes", [])
-        links = data.get("links", [])
-        
-        # Create node and link data for Plotly
-        node_x = []
-        node_y = []
-        node_text = []
-        node_color = []
-        
-        # Create a temporary networkx graph for layout calculation
-        G = nx.Graph()
-        
-        # Add nodes and edges to the graph
-        for node in nodes:
-            G.add_node(node["id"], group=node.get("group", 1))
-        
-        for link in links:
-            G.add_edge(link["source"], link["target"], weight=link.get("value", 1))
-        
-        # Get node positions using a force-directed layout
-        pos = nx.spring_layout(G, seed=42)
-        
-        # Extract positions for Plotly
-        for node in nodes:
-            node_id = node["id"]
-            node_x.append(pos[node_id][0])
-            node_y.append(pos[node_id][1])
-            node_text.append(node_id)
-            node_color.append(node.get("group", 1))
-        
-        # Create edges for Plotly
-        edge_x = []
-        edge_y = []
-        edge_width = []
-        
-        for link in links:
-            source = link["source"]
-            target = link["target"]
-            x0, y0 = pos[source]
-            x1, y1 = pos[target]
-            
-            # Add each edge as a line
-            edge_x.extend([x0, x1, None])
-            edge_y.extend([y0, y1, None])
-            edge_width.append(link.get("value", 1) * 2)
-        
-        # Create edge trace
-        edge_trace = go.Scatter(
-            x=edge_x, y=edge_y,
-            line=dict(width=0.5, color='#888'),
-            hoverinfo='none',
-            mode='lines')
-        
-        # Create node trace
-        node_trace = go.Scatter(
-            x=node_x, y=node_y,
-            mode='markers+text',
-            text=node_text,
+        # Get node positions from the shared layout engine
+        pos = layout_engine.layout(node_ids, links)
+        coords = np.array([pos[node_id] for node_id in node_ids])
+        index = {node_id: i for i, node_id in enumerate(node_ids)}
+        
+        # One WebGL line trace per weight bucket, with NaN gaps between edges
+        traces = []
+        if links:
+            source = np.array([index[u] for u, _, _ in links])
+            target = np.array([index[v] for _, v, _ in links])
+            weights = np.array([w for _, _, w in links], dtype=float)
+            bucket, bucket_weights = _edge_buckets(np, weights)
+            for i, weight in enumerate(bucket_weights):
+                members = bucket == i
+                if not members.any():
+                    continue
+                gap = np.full(members.sum(), np.nan)
+                edge_x = np.column_stack([coords[source[members], 0], coords[target[members], 0], gap]).ravel()
+                edge_y = np.column_stack([coords[source[members], 1], coords[target[members], 1], gap]).ravel()
+                traces.append(go.Scattergl(
+                    x=edge_x, y=edge_y,
+                    line=dict(width=min(weight * 2, MAX_EDGE_WIDTH), color='#888'),
+                    opacity=0.6,
+                    hoverinfo='none',
+                    mode='lines'))
+        
+        # Create node trace, labelled only while the labels stay readable
+        labelled = len(node_ids) <= NODE_LABEL_LIMIT
+        traces.append(go.Scattergl(
+            x=coords[:, 0], y=coords[:, 1],
+            mode='markers+text' if labelled else 'markers',
+            text=np.array(node_ids, dtype=object),
             textposition="top center",
             hoverinfo='text',
             marker=dict(
                 showscale=True,
                 colorscale='Viridis',
-                color=node_color,
-                size=15,
-                line=dict(width=2, color='#FFFFFF')
+                color=np.array(groups, dtype=float),
+                size=15 if labelled else 8,
+                line=dict(width=2 if labelled else 0.5, color='#FFFFFF')
             )
-        )
+        ))
         
         # Create figure
-        fig = go.Figure(data=[edge_trace, node_trace],
+        fig = go.Figure(data=traces,
                      layout=go.Layout(
-                        title='Skills Network Graph',
-                        titlefont=dict(size=16),
+                        title=dict(text='Skills Network Graph', font=dict(size=16)),
                         showlegend=False,
                         hovermode='closest',
                         margin=dict(b=20,l=5,r=5,t=40),
@@ -235,58 +352,189 @@ def create_interactive_skills_graph(skills_data):
         fig.update_layout(height=500)
         return fig
 
+def skills_graph_size(skills_data):
+    """Return the number of nodes in skills data, or 0 if it cannot be parsed."""
+    try:
+        return len(json.loads(skills_data).get("nodes", []))
+    except Exception:
+        return 0
+
+def display_skills_graph(skills_data, mode="Auto"):
+    """Utility function to display the skills graph in Streamlit.
+
+    mode is "Static" for the cached image, "Interactive" for the WebGL chart,
+    or "Auto" to switch to the interactive chart for large graphs.
+    """
+    if mode == "Auto":
+        threshold = int(os.getenv("INTERACTIVE_GRAPH_NODES", DEFAULT_INTERACTIVE_GRAPH_NODES))
+        mode = "Interactive" if skills_graph_size(skills_data) > threshold else "Static"
+    
+    if mode == "Interactive":
+        st.plotly_chart(create_interactive_skills_graph(skills_data), use_container_width=True)
+        return True
+    
+    # Rendered once per graph and size, then served from the shared image cache
+    skills_image = render_skills_graph(skills_data)
+    if skills_image:
+        st.image(skills_image, use_column_width=True)
+        return True
+    return None
+
+def timeline_frame(data):
+    """Turn timeline data into a DataFrame of phases with parsed dates.
+
+    All dates are parsed in one vectorized pass, trying ISO dates first and
+    any other spelling only for the rest. Phases without valid dates are
+    dropped, and phases that end before they start are swapped.
+    """
+    import pandas as pd
+    
+    phases = data.get("phases", [])
+    count = len(phases)
+    
+    def column(key, fill=None):
+        # One value per phase, padded when the model returned too few
+        return (list(data.get(key) or []) + [fill] * count)[:count]
+    
+    frame = pd.DataFrame({
+        "Task": pd.Series(phases, dtype=object),
+        "Start": pd.Series(column("start_dates"), dtype=object),
+        "Finish": pd.Series(column("end_dates"), dtype=object),
+        "Description": pd.Series(column("descriptions", ""), dtype=object),
+    })
+    
+    for column in ("Start", "Finish"):
+        values = frame[column].astype("string")
+        parsed = pd.to_datetime(values, format="%Y-%m-%d", errors="coerce")
+        retry = parsed.isna() & values.notna()
+        if retry.any():
+            parsed[retry] = pd.to_datetime(values[retry], format="mixed", errors="coerce")
+        frame[column] = parsed
+    
+    invalid = frame["Start"].isna() | frame["Finish"].isna()
+    if invalid.any():
+        print(f"Skipping {int(invalid.sum())} timeline phases without valid dates")
+        frame = frame[~invalid].reset_index(drop=True)
+    
+    swapped = frame["Finish"] < frame["Start"]
+    frame.loc[swapped, ["Start", "Finish"]] = frame.loc[swapped, ["Finish", "Start"]].to_numpy()
+    return frame
+
+def build_project_timeline(timeline_data):
+    """Build the project timeline figure: one bar per phase, with milestones and dependencies."""
+    import numpy as np
+    import pandas as pd
+    import plotly.graph_objects as go
+    
+    data = json.loads(timeline_data)
+    frame = timeline_frame(data)
+    if frame.empty:
+        raise ValueError("No timeline phases with valid dates")
+    
+    # Horizontal bars measured in milliseconds from each start date, as px.timeline draws them
+    tasks = frame["Task"].to_numpy(dtype=object)
+    starts = frame["Start"]
+    durations = ((frame["Finish"] - starts).dt.total_seconds() * 1000).to_numpy()
+    # Keep one-day phases visible
+    durations = np.maximum(durations, 24 * 60 * 60 * 1000)
+    hover = np.column_stack([
+        starts.dt.strftime("%Y-%m-%d").to_numpy(dtype=object),
+        frame["Finish"].dt.strftime("%Y-%m-%d").to_numpy(dtype=object),
+        frame["Description"].to_numpy(dtype=object),
+    ])
+    traces = [go.Bar(
+        base=starts.dt.strftime("%Y-%m-%d").to_numpy(dtype=object),
+        x=durations,
+        y=tasks,
+        orientation="h",
+        marker=dict(color=np.arange(len(frame), dtype=float), colorscale=TIMELINE_COLORSCALE),
+        customdata=hover,
+        hovertemplate="<b>%{y}</b><br>%{customdata[0]} to %{customdata[1]}<br>%{customdata[2]}<extra></extra>",
+        name="Phases",
+    )]
+    
+    # Dependencies: one line trace from the end of each phase to the start of the phase waiting for it
+    dependencies = pd.DataFrame(data.get("dependencies") or [], columns=["from", "to"])
+    if not dependencies.empty:
+        rows = pd.Index(frame["Task"]).drop_duplicates()
+        source = rows.get_indexer(dependencies["from"])
+        target = rows.get_indexer(dependencies["to"])
+        known = (source >= 0) & (target >= 0)
+        source, target = source[known], target[known]
+        if len(source):
+            finish = frame["Finish"].dt.strftime("%Y-%m-%d").to_numpy(dtype=object)
+            start = starts.dt.strftime("%Y-%m-%d").to_numpy(dtype=object)
+            gap = np.full(len(source), None, dtype=object)
+            traces.append(go.Scatter(
+                x=np.column_stack([finish[source], start[target], gap]).ravel(),
+                y=np.column_stack([tasks[source], tasks[target], gap]).ravel(),
+                mode="lines",
+                line=dict(color="#888", width=1, dash="dot"),
+                hoverinfo="skip",
+                name="Dependencies",
+            ))
+    
+    # Milestones: diamonds on the phase running at their date
+    milestones = pd.DataFrame(data.get("milestones") or [], columns=["name", "date"])
+    if not milestones.empty:
+        milestones["date"] = pd.to_datetime(milestones["date"].astype("string"), format="mixed", errors="coerce")
+        milestones = milestones.dropna(subset=["date"])
+    if not milestones.empty:
+        order = np.argsort(frame["Start"].to_numpy())
+        sorted_starts = frame["Start"].to_numpy()[order]
+        row = order[np.clip(np.searchsorted(sorted_starts, milestones["date"].to_numpy(), side="right") - 1,
+                            0, len(frame) - 1)]
+        traces.append(go.Scatter(
+            x=milestones["date"].dt.strftime("%Y-%m-%d").to_numpy(dtype=object),
+            y=tasks[row],
+            mode="markers",
+            marker=dict(symbol="diamond", size=12, color="#e45756", line=dict(width=1, color="#FFFFFF")),
+            text=milestones["name"].to_numpy(dtype=object),
+            hovertemplate="<b>%{text}</b><br>%{x|%Y-%m-%d}<extra></extra>",
+            name="Milestones",
+        ))
+    
+    fig = go.Figure(data=traces)
+    
+    # Update layout; the chart grows with the number of phases
+    fig.update_layout(
+        title="Project Timeline",
+        autosize=True,
+        height=min(max(400, 28 * len(frame) + 150), MAX_TIMELINE_HEIGHT),
+        showlegend=False,
+        bargap=0.3,
+        xaxis=dict(type="date", showgrid=True),
+        yaxis=dict(autorange="reversed", showgrid=True, type="category"),
+        margin=dict(l=50, r=50, b=100, t=50, pad=4)
+    )
+    
+    return fig
+
+# Finished timeline figures shared by every session, keyed by a hash of the timeline data
+timeline_figure_cache = RenderCache(
+    max_entries=int(os.getenv("TIMELINE_CACHE_ENTRIES", DEFAULT_TIMELINE_CACHE_ENTRIES)),
+    sizeof=lambda fig: 0,
+)
+
 def create_project_timeline(timeline_data):
-    """Create a Gantt chart for the project timeline."""
+    """Create a Gantt chart for the project timeline.
+
+    The finished figure is memoized per timeline, so reruns and tab switches
+    only serialize it again; treat the returned figure as read-only.
+    """
+    import plotly.graph_objects as go
+    
+    key = hashlib.sha256(str(timeline_data).encode("utf-8")).hexdigest()
+    fig = timeline_figure_cache.get(key)
+    if fig is not None:
+        return fig
+    
     try:
-        # Parse timeline data
-        data = json.loads(timeline_data)
-        
-        # Extract the data
-        phases = data.get("phases", [])
-        start_dates = data.get("start_dates", [])
-        end_dates = data.get("end_dates", [])
-        descriptions = data.get("descriptions", [""] * len(phases))
-        
-        # Create DataFrame for Gantt chart
-        df = []
-        for i in range(len(phases)):
-            if i < len(start_dates) and i < len(end_dates):
-                df.append(dict(
-                    Task=phases[i],
-                    Start=start_dates[i],
-                    Finish=end_dates[i],
-                    Description=descriptions[i] if i < len(descriptions) else ""
-                ))
-        
-        # Colors for phases
-        colors = {
-            phase: f'rgb({50+i*40}, {100+i*20}, {200-i*20})' 
-            for i, phase in enumerate(phases)
-        }
-        
-        # Create Gantt chart
-        fig = ff.create_gantt(
-            df, 
-            colors=colors, 
-            index_col='Task', 
-            show_colorbar=True,
-            group_tasks=True,
-            showgrid_x=True,
-            showgrid_y=True,
-            title='Project Timeline'
-        )
-        
-        # Update layout
-        fig.update_layout(
-            autosize=True,
-            height=400,
-            margin=dict(l=50, r=50, b=100, t=50, pad=4)
-        )
-        
+        fig = build_project_timeline(timeline_data)
+        timeline_figure_cache.put(key, fig)
         return fig
     except Exception as e:
         print(f"Error creating timeline: {e}")
-        import plotly.graph_objects as go
         
         # Create error figure
         fig = go.Figure()